@@ -0,0 +1,48 @@
+import os
+import time
+import argparse
+import tempfile
+
+from nba_api.stats.library.http import NBAStatsHTTP
+
+from cache_helper import BoxScoreCache
+from nba_helper import StatsFetcher, BoxScoreFetcher
+from rate_limiter import TokenBucket, rate_limits
+from benchmarks.stand_in_servers import NBAStatsStandIn
+
+"""
+Benchmark of the box score enrichment against a local stand-in of the NBA stats API.
+Every game takes five requests, the run is repeated per worker count with a cold and a warm cache.
+Run from the local_data directory: PYTHONPATH=. python benchmarks/box_score_benchmark.py --games 82 --latency 0.05
+"""
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure box score enrichment per number of workers.")
+    parser.add_argument('--games', type=int, default=82, help="games in the enriched season")
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds every stand-in response is delayed")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    args = parser.parse_args()
+
+    os.environ.pop('NBA_CACHE_DIR', None)
+    os.environ.pop('NBA_BOX_SCORES', None)
+    server = NBAStatsStandIn(games_per_season=args.games, latency=args.latency)
+    NBAStatsHTTP.base_url = f"{server.url}/stats/{{endpoint}}"
+    try:
+        stats_fetcher = StatsFetcher(cache=None)
+        game_stats = stats_fetcher.fetch_season_game_stats('2023-24')
+        for workers in args.workers:
+            rate_limits.reset()
+            with tempfile.TemporaryDirectory() as cache_dir:
+                fetcher = BoxScoreFetcher(
+                    cache=BoxScoreCache(cache_dir), max_workers=workers, rate_limiter=TokenBucket(rate=10000, capacity=workers)
+                )
+                for cache_state in ('cold', 'warm'):
+                    server.reset()
+                    start = time.perf_counter()
+                    enriched = fetcher.enrich(game_stats, stats_fetcher.player_id)
+                    seconds = time.perf_counter() - start
+                    print(f"workers={workers:<3} {cache_state} cache {seconds * 1000:10.1f} ms  "
+                          f"requests={server.requests_served:>5}  enriched={enriched['pie'].notna().sum()}/{len(enriched)}")
+    finally:
+        server.close()
@@ -0,0 +1,170 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List
+
+from nba_api.stats.library.http import NBAStatsHTTP
+
+from databox_connector import DataboxFeed
+from nba_helper import StatsFetcher
+from github_helper import GitHubFetcher
+from rate_limiter import TokenBucket, rate_limits
+from instrumentation import instrumentation
+from benchmarks.stand_in_servers import NBAStatsStandIn, GitHubStandIn, DataboxStandIn
+
+"""
+End-to-end benchmark of the fetch, transform and push stages against local stand-ins of the NBA stats API,
+the GitHub commits API and the Databox push API. Nothing leaves the machine.
+Run from the local_data directory: PYTHONPATH=. python benchmarks/end_to_end_benchmark.py --sizes 82 820 8200
+A size is the number of games per season (seven seasons are fetched) and the number of commits in the repository.
+Save a run with --json and pass it as --baseline to a later run to fail on runtime regressions.
+"""
+
+# absolute slowdown ignored by the baseline comparison, shorter stages are dominated by noise
+MIN_REGRESSION_SECONDS = 0.05
+# settings of the real environment that would make runs touch local state or caches
+ISOLATED_ENV_VARS = ['NBA_CACHE_DIR', 'GITHUB_STATE_PATH', 'DATABOX_LEDGER_PATH', 'DATABOX_SPOOL_PATH', 'PROFILE_DIR']
+
+
+class StageTimer:
+    """
+    Measures wall time, requests served by a stand-in and peak traced memory of consecutive stages.
+    """
+
+    def __init__(self):
+        self.results: Dict[str, dict] = {}
+
+    @contextmanager
+    def stage(self, name: str, server):
+        server.reset()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        self.results[name] = {
+            'seconds': round(seconds, 4),
+            'requests': server.requests_served,
+            'requests_per_second': round(server.requests_served / seconds, 1) if seconds else None,
+            'peak_mb': round(peak / 2 ** 20, 2)
+        }
+
+
+def run_size(size: int, args: argparse.Namespace) -> Dict[str, dict]:
+    """
+    Runs all stages against freshly started stand-ins holding `size` games per season and `size` commits.
+
+    Parameters
+    ----------
+    size : int
+        Data size of the run.
+    args : argparse.Namespace
+        Parsed command line arguments.
+
+    Returns
+    -------
+    Dict[str, dict]
+        Wall time, requests, requests per second and peak memory per stage.
+    """
+    nba = NBAStatsStandIn(games_per_season=size, fixtures_dir=args.nba_fixtures, latency=args.latency)
+    github = GitHubStandIn(commits=size, latency=args.latency)
+    databox = DataboxStandIn(latency=args.latency)
+    NBAStatsHTTP.base_url = f"{nba.url}/stats/{{endpoint}}"
+    GitHubFetcher.API_URL = github.url
+    os.environ['DATABOX_HOST'] = databox.url
+
+    timer = StageTimer()
+    instrumentation.reset()
+    rate_limits.reset()
+    tracemalloc.start()
+    try:
+        stats_fetcher = StatsFetcher(
+            cache=None, max_workers=args.nba_workers, rate_limiter=TokenBucket(rate=1000, capacity=args.nba_workers)
+        )
+        commit_fetcher = GitHubFetcher(page_workers=args.page_workers)
+        databox_feed = DataboxFeed(max_workers=args.databox_workers, backoff_base=0.01, transport=args.databox_transport)
+
+        with timer.stage('nba.fetch', nba):
+            game_stats = stats_fetcher.fetch_all_game_stats()
+        # the transform runs inside the fetch stage, its share is taken from the instrumentation
+        timer.results['nba.transform'] = {
+            'seconds': instrumentation.report()['stages'].get('nba.transform', {}).get('seconds', 0.0),
+            'requests': 0, 'requests_per_second': None, 'peak_mb': None
+        }
+        with timer.stage('github.fetch', github):
+            commits = commit_fetcher.fetch_all_commits()
+        with timer.stage('databox.push', databox):
+            databox_feed.send_data_nba(game_stats)
+            databox_feed.send_data_github(commits)
+        timer.results['databox.push']['datapoints'] = databox.datapoints
+        timer.results['databox.push']['bytes_sent'] = databox.bytes_received
+    finally:
+        tracemalloc.stop()
+        for server in (nba, github, databox):
+            server.close()
+    return timer.results
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, dict]], baseline_path: str, tolerance: float) -> List[str]:
+    """
+    Returns a message for every stage that got slower than the baseline by more than the tolerance.
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = []
+    for size, stages in results.items():
+        for name, stage in stages.items():
+            previous = baseline.get(size, {}).get(name)
+            if not previous or not previous['seconds']:
+                continue
+            slowdown = stage['seconds'] - previous['seconds']
+            if slowdown > MIN_REGRESSION_SECONDS and stage['seconds'] > previous['seconds'] * (1 + tolerance):
+                regressions.append(f"size={size} {name}: {stage['seconds']:.3f}s vs. {previous['seconds']:.3f}s baseline")
+    return regressions
+
+
+def print_results(size: int, stages: Dict[str, dict]) -> None:
+    print(f"size={size}")
+    for name, stage in stages.items():
+        rate = f"{stage['requests_per_second']:8.1f}" if stage['requests_per_second'] is not None else f"{'-':>8}"
+        peak = f"{stage['peak_mb']:8.2f}" if stage['peak_mb'] is not None else f"{'-':>8}"
+        sent = f"  sent={stage['bytes_sent'] / 1024:8.1f} KB" if 'bytes_sent' in stage else ''
+        print(f"  {name:<15} {stage['seconds'] * 1000:10.1f} ms  requests={stage['requests']:>5}  req/s={rate}  peak={peak} MB{sent}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark fetch, transform and push against local stand-in servers.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[82, 820, 8200])
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds every stand-in response is delayed")
+    parser.add_argument('--nba-workers', type=int, default=1)
+    parser.add_argument('--page-workers', type=int, default=4)
+    parser.add_argument('--databox-workers', type=int, default=1)
+    parser.add_argument('--databox-transport', choices=['sdk', 'json'], default='sdk', help="DataboxFeed transport")
+    parser.add_argument('--nba-fixtures', help="directory with recorded PlayerGameLog payloads named <season>.json")
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('--baseline', help="results of an earlier run to compare stage runtimes against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    for name in ISOLATED_ENV_VARS:
+        os.environ.pop(name, None)
+    os.environ.setdefault('DATABOX_API', 'benchmark')
+    os.environ.setdefault('GITHUB_TOKEN', 'benchmark')
+
+    results = {}
+    for size in args.sizes:
+        results[str(size)] = run_size(size, args)
+        print_results(size, results[str(size)])
+
+    if args.json:
+        with open(args.json, 'w') as results_file:
+            json.dump(results, results_file, indent=2)
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,106 @@
+import os
+import re
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+"""
+Start-up benchmark of the container entry point based on python -X importtime.
+Every scenario runs in a fresh interpreter, the report lists the total import time and the slowest packages, however deeply they are imported.
+Run from the local_data directory: PYTHONPATH=. python benchmarks/import_benchmark.py --budget-ms 1200
+With --budget-ms the script exits non-zero when a scenario is slower than the budget or loads a module it must not,
+so it can gate start-up regressions in CI.
+"""
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<indent>\s+)(?P<module>\S+)$')
+
+# code run in a fresh interpreter and modules that must not be loaded by it
+SCENARIOS: Dict[str, Tuple[str, List[str]]] = {
+    'import main': ("import main", ['nba_api', 'databox']),
+    'github-only cycle': (
+        "import main; main.create_commit_fetcher(); main.DataboxFeed()",
+        ['nba_api']
+    ),
+    'nba cycle': ("import main; main.StatsFetcher(); main.DataboxFeed()", []),
+    'github-only cycle, json transport': (
+        "import main; main.create_commit_fetcher(); main.DataboxFeed(transport='json')",
+        ['nba_api', 'databox']
+    ),
+}
+
+
+def measure(code: str, env: dict) -> Tuple[float, List[Tuple[str, float]], List[str]]:
+    """
+    Runs code with -X importtime in a fresh interpreter.
+
+    Every package is charged the cumulative time of the imports that enter it from another package
+    (or from the top level), wherever in the import tree that happens. Imports nested in a package that
+    another package already pays for are counted for both, e.g. numpy shows up on its own and inside pandas.
+
+    Parameters
+    ----------
+    code : str
+        Python code to run.
+    env : dict
+        Environment of the interpreter.
+
+    Returns
+    -------
+    Tuple[float, List[Tuple[str, float]], List[str]]
+        Total import time in ms, cumulative ms of every imported package sorted descending, and all imported modules.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        env=env, capture_output=True, text=True, check=True
+    )
+    total, modules = 0.0, []
+    packages: Dict[str, float] = {}
+    # importtime lists a module after its imports, pending holds (depth, package, ms) of imports whose parent is not read yet
+    pending: List[Tuple[int, str, float]] = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        module, ms = match['module'], int(match['cumulative']) / 1000
+        modules.append(module)
+        # top-level imports are indented by a single space, nested ones by two more per level
+        depth = (len(match['indent']) - 1) // 2
+        package = module.split('.')[0]
+        while pending and pending[-1][0] > depth:
+            _, child_package, child_ms = pending.pop()
+            if child_package != package:
+                packages[child_package] = packages.get(child_package, 0.0) + child_ms
+        pending.append((depth, package, ms))
+        if depth == 0:
+            total += ms
+    for _, package, ms in pending:
+        packages[package] = packages.get(package, 0.0) + ms
+    return total, sorted(packages.items(), key=lambda item: item[1], reverse=True), modules
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure the start-up import time of the entry point.")
+    parser.add_argument('--top', type=int, default=12, help="number of slowest packages listed per scenario")
+    parser.add_argument('--budget-ms', type=float, help="fail when a scenario's total import time exceeds this budget")
+    args = parser.parse_args()
+
+    env = {**os.environ, 'DATABOX_API': os.getenv('DATABOX_API', 'benchmark')}
+    env.pop('DATABOX_LEDGER_PATH', None)
+    env.pop('DATABOX_SPOOL_PATH', None)
+    failures = []
+    for name, (code, forbidden) in SCENARIOS.items():
+        total, packages, modules = measure(code, env)
+        print(f"{name}: {total:.1f} ms")
+        for package, ms in packages[:args.top]:
+            print(f"  {package:<40} {ms:8.1f} ms")
+        loaded = sorted({forbidden_module for forbidden_module in forbidden
+                         if any(module == forbidden_module or module.startswith(f"{forbidden_module}.") for module in modules)})
+        if loaded:
+            failures.append(f"{name} loads {', '.join(loaded)}")
+        if args.budget_ms is not None and total > args.budget_ms:
+            failures.append(f"{name} takes {total:.1f} ms, the budget is {args.budget_ms:.1f} ms")
+
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,55 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.payload_benchmark import make_game_log_frame
+from schema_helper import compact_game_stats, compact_commit_counts, memory_report
+
+"""
+Memory-footprint report of the compact game-log and commit schemas against the previous object/int64/float64 frames.
+Run from the local_data directory: PYTHONPATH=. python benchmarks/memory_benchmark.py --players 500 --games 574
+"""
+
+
+def make_league_frame(players: int, games: int) -> pd.DataFrame:
+    """
+    Creates a synthetic league-wide game-log frame in the previous schema: string dates, teams and seasons,
+    int64 counts and float64 percentages.
+    """
+    rng = np.random.default_rng(7)
+    df = pd.concat([make_game_log_frame(games)] * players, ignore_index=True)
+    df[['points', 'rebounds', 'assists']] = df[['points', 'rebounds', 'assists']].astype('int64')
+    df.insert(0, 'player_name', np.repeat([f"Player {i}" for i in range(players)], games))
+    df.insert(0, 'player_id', np.repeat(rng.integers(1_600_000, 1_700_000, players), games))
+    return df
+
+
+def make_commit_frame(repositories: int, days: int) -> pd.DataFrame:
+    """
+    Creates a synthetic multi-repository daily commit frame in the previous schema.
+    """
+    dates = pd.date_range('2015-01-01', periods=days, freq='D').strftime('%Y-%m-%d')
+    return pd.DataFrame({
+        'date': np.tile(dates, repositories),
+        'count': np.random.default_rng(7).integers(1, 30, repositories * days),
+        'repository': np.repeat([f"org/repo-{i}" for i in range(repositories)], days)
+    })
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Report the memory footprint of the compact frame schemas.")
+    parser.add_argument('--players', type=int, default=500)
+    parser.add_argument('--games', type=int, default=574, help="games per player, 574 are seven 82-game seasons")
+    parser.add_argument('--repositories', type=int, default=50)
+    parser.add_argument('--days', type=int, default=3650)
+    args = parser.parse_args()
+
+    pd.set_option('display.width', 120)
+    pd.set_option('display.max_columns', None)
+    game_stats = make_league_frame(args.players, args.games)
+    print(f"Game logs: {len(game_stats)} rows")
+    print(memory_report(compact_game_stats(game_stats), game_stats))
+    commits = make_commit_frame(args.repositories, args.days)
+    print(f"\nDaily commit counts: {len(commits)} rows")
+    print(memory_report(compact_commit_counts(commits), commits))
@@ -0,0 +1,96 @@
+import timeit
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from databox_connector import build_push_data, build_rollup_push_data, NBA_METRIC_COLUMNS, NBA_DIMENSION_COLUMNS
+
+"""
+Micro-benchmark comparing the vectorized push payload builder with the previous iterrows/to_dict loop,
+and the payload size of the raw per-game datapoints with the size of the rollups.
+Run from the local_data directory: python benchmarks/payload_benchmark.py --rows 10000
+"""
+
+
+def make_game_log_frame(rows: int) -> pd.DataFrame:
+    """
+    Creates a synthetic game-log DataFrame with the columns DataboxFeed.send_data_nba expects.
+
+    Parameters
+    ----------
+    rows : int
+        Number of game rows.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: date, points, rebounds, assists, minutes, fg_pct, ts_pct, opposing_team, season.
+    """
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        'date': pd.date_range('2018-10-17', periods=rows, freq='D').strftime('%Y-%m-%d'),
+        'points': rng.integers(0, 60, rows).astype(float),
+        'rebounds': rng.integers(0, 20, rows).astype(float),
+        'assists': rng.integers(0, 20, rows).astype(float),
+        'minutes': rng.integers(10, 48, rows).astype(float),
+        'fg_pct': rng.random(rows).round(3),
+        'ts_pct': rng.random(rows).round(3),
+        'opposing_team': rng.choice(['LAC', 'PHX', 'DEN', 'BOS', 'MIA'], rows),
+        'season': rng.choice(['2022-23', '2023-24', '2024-25'], rows)
+    })
+
+
+def legacy_push_data(df: pd.DataFrame) -> list:
+    """
+    Builds push records the way DataboxFeed did before the vectorized builder: one iterrows/to_dict per row.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Game-log DataFrame.
+
+    Returns
+    -------
+    list
+        Datapoints in Databox push format.
+    """
+    push_data = []
+    for _, row in df.iterrows():
+        data_dict = row.to_dict()
+        attributes = [
+            {"key": "opposing_team", "value": data_dict['opposing_team']},
+            {"key": "season", "value": data_dict['season']}
+        ]
+        push_data.extend(
+            {"key": key, "value": data_dict[key], "date": data_dict['date'], "attributes": attributes}
+            for key in NBA_METRIC_COLUMNS
+        )
+        push_data.extend(
+            {"key": key, "value": data_dict[key], "date": data_dict['date']}
+            for key in NBA_METRIC_COLUMNS
+        )
+    return push_data
+
+
+def vectorized_push_data(df: pd.DataFrame) -> list:
+    return build_push_data(df, metric_columns=NBA_METRIC_COLUMNS, dimension_columns=NBA_DIMENSION_COLUMNS)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare push payload builders.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        df = make_game_log_frame(rows)
+        assert legacy_push_data(df) == vectorized_push_data(df)
+        legacy = min(timeit.repeat(lambda: legacy_push_data(df), number=1, repeat=args.repeat))
+        vectorized = min(timeit.repeat(lambda: vectorized_push_data(df), number=1, repeat=args.repeat))
+        print(f"rows={rows:>7}  iterrows={legacy * 1000:9.2f} ms  vectorized={vectorized * 1000:9.2f} ms  "
+              f"speedup={legacy / vectorized:6.1f}x")
+        raw_datapoints = len(vectorized_push_data(df))
+        rollup_datapoints = len(build_rollup_push_data(df))
+        print(f"{'':>12}raw datapoints={raw_datapoints}  rollup datapoints={rollup_datapoints}  "
+              f"reduction={raw_datapoints / rollup_datapoints:6.1f}x")
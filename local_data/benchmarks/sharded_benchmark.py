@@ -0,0 +1,55 @@
+import os
+import time
+import argparse
+
+from nba_api.stats.library.http import NBAStatsHTTP
+
+import sharded_ingestion
+from sharded_ingestion import ShardedGameStatsFetcher
+from benchmarks.stand_in_servers import NBAStatsStandIn
+
+"""
+Scaling benchmark of the sharded ingestion against a local stand-in of the NBA stats API.
+Every worker process fetches, parses and transforms its (player, season) units, the stand-in serves cached payloads.
+Run from the local_data directory: PYTHONPATH=. python benchmarks/sharded_benchmark.py --players 20 --processes 1 2 4
+"""
+
+STAND_IN_URL_VAR = 'BENCHMARK_NBA_STATS_URL'
+ISOLATED_ENV_VARS = ['NBA_CACHE_DIR', 'PROFILE_DIR']
+
+
+def stand_in_shard(player_id: int, season: str):
+    """
+    Work unit of the benchmark, points the worker's nba_api at the stand-in before fetching.
+    """
+    NBAStatsHTTP.base_url = f"{os.environ[STAND_IN_URL_VAR]}/stats/{{endpoint}}"
+    return sharded_ingestion.fetch_shard(player_id, season)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure sharded ingestion throughput per number of processes.")
+    parser.add_argument('--players', type=int, default=20, help="number of players, each fetched for seven seasons")
+    parser.add_argument('--games', type=int, default=820, help="games per season in the stand-in payloads")
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--rate', type=float, default=10000.0, help="requests per second of the whole pool")
+    args = parser.parse_args()
+
+    for name in ISOLATED_ENV_VARS:
+        os.environ.pop(name, None)
+    seasons = ['2018-19', '2019-20', '2020-21', '2021-22', '2022-23', '2023-24', '2024-25']
+    server = NBAStatsStandIn(games_per_season=args.games)
+    os.environ[STAND_IN_URL_VAR] = server.url
+    try:
+        baseline = None
+        for processes in args.processes:
+            fetcher = ShardedGameStatsFetcher(
+                list(range(1, args.players + 1)), seasons, processes=processes, fetch=stand_in_shard, rate=args.rate
+            )
+            start = time.perf_counter()
+            rows = len(fetcher.fetch_all_game_stats())
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(f"processes={processes:<3} {seconds:8.2f} s  units={args.players * len(seasons):>5}  "
+                  f"rows/s={rows / seconds:10.0f}  speedup={baseline / seconds:5.2f}x")
+    finally:
+        server.close()
@@ -0,0 +1,339 @@
+import os
+import gzip
+import json
+import time
+import threading
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+"""
+Local HTTP stand-ins for the NBA stats API, the GitHub commits API and the Databox push API.
+Used by the end-to-end benchmark, they never touch the network and count every request they serve.
+"""
+
+PLAYER_GAME_LOG_HEADERS = [
+    'SEASON_ID', 'Player_ID', 'Game_ID', 'GAME_DATE', 'MATCHUP', 'WL', 'MIN', 'FGM', 'FGA', 'FG_PCT',
+    'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK',
+    'TOV', 'PF', 'PTS', 'PLUS_MINUS', 'VIDEO_AVAILABLE'
+]
+TEAMS = ['DAL', 'LAC', 'PHX', 'DEN', 'BOS', 'MIA', 'GSW', 'LAL', 'MIL', 'NYK']
+
+
+def make_player_game_log_payload(season: str, games: int, player_id: int = 1629029) -> dict:
+    """
+    Creates a PlayerGameLog response in the format the NBA stats API returns.
+
+    Parameters
+    ----------
+    season : str
+        Season in the format 2023-24.
+    games : int
+        Number of game rows.
+    player_id : int
+        Value of the Player_ID column.
+
+    Returns
+    -------
+    dict
+        Response body with a PlayerGameLog result set.
+    """
+    rng = np.random.default_rng(int(season[:4]))
+    start = date(int(season[:4]), 10, 20)
+    rows = []
+    for game in range(games):
+        fga, fg3a, fta = (int(x) for x in rng.integers([10, 3, 2], [30, 15, 16]))
+        fgm, fg3m, ftm = int(rng.integers(3, fga + 1)), int(rng.integers(0, fg3a + 1)), int(rng.integers(0, fta + 1))
+        opponent = TEAMS[1 + game % (len(TEAMS) - 1)]
+        matchup = f"DAL vs. {opponent}" if game % 2 else f"DAL @ {opponent}"
+        game_date = (start + timedelta(days=game)).strftime('%b %d, %Y').upper()
+        reb, ast, tov = (int(x) for x in rng.integers([2, 2, 0], [18, 16, 8]))
+        rows.append([
+            f"2{season[:4]}", player_id, f"00{season[2:4]}{game:05d}", game_date, matchup, 'W' if game % 3 else 'L',
+            int(rng.integers(20, 44)), fgm, fga, round(fgm / fga, 3), fg3m, fg3a, round(fg3m / fg3a, 3),
+            ftm, fta, round(ftm / fta, 3), 1, reb - 1, reb, ast, 1, 0, tov, 2, 2 * fgm + fg3m + ftm, 5, 1
+        ])
+    return {
+        'resource': 'playergamelog',
+        'parameters': {'PlayerID': player_id, 'Season': season, 'SeasonType': 'Regular Season'},
+        'resultSets': [{'name': 'PlayerGameLog', 'headers': PLAYER_GAME_LOG_HEADERS, 'rowSet': rows}]
+    }
+
+
+def make_box_score_payload(endpoint: str, game_id: str, players: int = 10) -> dict:
+    """
+    Creates a BoxScoreAdvancedV2 or BoxScoreTraditionalV2 response with the columns read by BoxScoreFetcher.
+
+    Parameters
+    ----------
+    endpoint : str
+        boxscoreadvancedv2 or boxscoretraditionalv2.
+    game_id : str
+        Value of the GAME_ID column.
+    players : int
+        Number of player rows, the first one is the player of the synthetic game logs.
+
+    Returns
+    -------
+    dict
+        Response body with PlayerStats, TeamStats and (for the traditional box score) TeamStarterBenchStats.
+    """
+    rng = np.random.default_rng(int(game_id))
+    player_ids = [1629029] + list(range(1, players))
+    if endpoint == 'boxscoreadvancedv2':
+        headers = ['GAME_ID', 'PLAYER_ID', 'OFF_RATING', 'DEF_RATING', 'NET_RATING', 'USG_PCT', 'PACE', 'PIE']
+        rows = [
+            [game_id, player_id, *(round(float(x), 1) for x in rng.uniform(95, 125, 2)), 0.0,
+             round(float(rng.uniform(0.1, 0.4)), 3), round(float(rng.uniform(95, 105)), 2), round(float(rng.uniform(0, 0.25)), 3)]
+            for player_id in player_ids
+        ]
+        for row in rows:
+            row[4] = round(row[2] - row[3], 1)
+        result_sets = ['PlayerStats', 'TeamStats']
+    else:
+        headers = ['GAME_ID', 'PLAYER_ID', 'PLUS_MINUS']
+        rows = [[game_id, player_id, float(rng.integers(-12, 13))] for player_id in player_ids]
+        result_sets = ['PlayerStats', 'TeamStarterBenchStats', 'TeamStats']
+    return {
+        'resource': endpoint,
+        'parameters': {'GameID': game_id},
+        'resultSets': [
+            {'name': name, 'headers': headers, 'rowSet': rows if name == 'PlayerStats' else []}
+            for name in result_sets
+        ]
+    }
+
+
+def make_commits(count: int, authors: int = 5, end: Optional[datetime] = None) -> List[dict]:
+    """
+    Creates commits in the format of the GitHub commits API, newest first, a few commits per day.
+
+    Parameters
+    ----------
+    count : int
+        Number of commits.
+    authors : int
+        Number of distinct authors.
+    end : Optional[datetime]
+        Timestamp of the newest commit, defaults to a fixed date so runs are comparable.
+
+    Returns
+    -------
+    List[dict]
+        Commits with sha, commit author/committer dates and the author login.
+    """
+    end = end or datetime(2024, 12, 31, 12)
+    commits = []
+    for index in range(count):
+        timestamp = (end - timedelta(hours=5 * index)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        login = f"dev{index % authors}"
+        commits.append({
+            'sha': f"{index:040x}",
+            'commit': {
+                'author': {'name': login, 'date': timestamp},
+                'committer': {'name': login, 'date': timestamp}
+            },
+            'author': {'login': login}
+        })
+    return commits
+
+
+class StandInServer:
+    """
+    Threaded HTTP server running a stand-in API in a background thread.
+
+    Attributes
+    ----------
+    latency : float
+        Seconds every response is delayed, simulating the network round trip.
+    requests_served : int
+        Number of requests handled since the last reset.
+    bytes_received : int
+        Number of request body bytes received since the last reset, as sent over the wire.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Starts the server on a free local port.
+
+        Parameters
+        ----------
+        latency : float
+            Seconds every response is delayed.
+        """
+        self.latency = latency
+        self.requests_served = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # headers and body are written separately, without this every response waits for a delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                stand_in._serve(self, 'GET')
+
+            def do_POST(self):
+                stand_in._serve(self, 'POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests_served = 0
+            self.bytes_received = 0
+
+    def _serve(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        with self._lock:
+            self.requests_served += 1
+        body = b''
+        if method == 'POST':
+            body = handler.rfile.read(int(handler.headers.get('Content-Length', 0)))
+            with self._lock:
+                self.bytes_received += len(body)
+            if handler.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+        if self.latency:
+            time.sleep(self.latency)
+        status, headers, payload = self.handle(method, urlparse(handler.path), body)
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def handle(self, method: str, url, body: bytes) -> tuple:
+        """
+        Returns status code, extra headers and body (JSON-serializable or bytes) of a response.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class NBAStatsStandIn(StandInServer):
+    """
+    Replays PlayerGameLog payloads per season. Recorded payloads (JSON files named after the season, e.g.
+    2023-24.json, as returned by the real API) are served as they are, other seasons get synthetic payloads.
+    Box scores (BoxScoreAdvancedV2, BoxScoreTraditionalV2) of any game ID are synthetic.
+    """
+
+    def __init__(self, games_per_season: int = 82, fixtures_dir: Optional[str] = None, latency: float = 0.0):
+        """
+        Parameters
+        ----------
+        games_per_season : int
+            Number of games in synthetic payloads.
+        fixtures_dir : Optional[str]
+            Directory with recorded payloads.
+        latency : float
+            Seconds every response is delayed.
+        """
+        self.games_per_season = games_per_season
+        self.fixtures_dir = fixtures_dir
+        self._payloads: Dict[str, bytes] = {}
+        super().__init__(latency)
+
+    def _payload(self, season: str) -> bytes:
+        if season not in self._payloads:
+            fixture = os.path.join(self.fixtures_dir or '', f"{season}.json")
+            if self.fixtures_dir and os.path.exists(fixture):
+                with open(fixture, 'rb') as fixture_file:
+                    self._payloads[season] = fixture_file.read()
+            else:
+                self._payloads[season] = json.dumps(make_player_game_log_payload(season, self.games_per_season)).encode()
+        return self._payloads[season]
+
+    def handle(self, method, url, body):
+        endpoint = url.path.lower().rsplit('/', 1)[-1]
+        if endpoint in ('boxscoreadvancedv2', 'boxscoretraditionalv2'):
+            game_id = parse_qs(url.query).get('GameID', ['0'])[0]
+            return 200, {}, make_box_score_payload(endpoint, game_id)
+        if endpoint != 'playergamelog':
+            return 404, {}, {'message': f"No stand-in for {url.path}."}
+        season = parse_qs(url.query).get('Season', ['2023-24'])[0]
+        return 200, {}, self._payload(season)
+
+
+class GitHubStandIn(StandInServer):
+    """
+    Serves a paginated commits listing with Link headers, like GET /repos/{owner}/{repo}/commits.
+    """
+
+    def __init__(self, commits: int = 1000, authors: int = 5, latency: float = 0.0):
+        """
+        Parameters
+        ----------
+        commits : int
+            Number of commits in every repository.
+        authors : int
+            Number of distinct commit authors.
+        latency : float
+            Seconds every response is delayed.
+        """
+        self.commits = make_commits(commits, authors)
+        super().__init__(latency)
+
+    def handle(self, method, url, body):
+        query = parse_qs(url.query)
+        per_page = int(query.get('per_page', ['30'])[0])
+        page = int(query.get('page', ['1'])[0])
+        commits = self.commits
+        if 'since' in query:
+            commits = [commit for commit in commits if commit['commit']['committer']['date'] >= query['since'][0]]
+        last_page = max(1, -(-len(commits) // per_page))
+        links = []
+        if page < last_page:
+            links.append(f'<{self.url}{url.path}?per_page={per_page}&page={page + 1}>; rel="next"')
+            links.append(f'<{self.url}{url.path}?per_page={per_page}&page={last_page}>; rel="last"')
+        headers = {'Link': ', '.join(links)} if links else {}
+        return 200, headers, commits[(page - 1) * per_page:page * per_page]
+
+
+class DataboxStandIn(StandInServer):
+    """
+    Accepts Databox push requests and counts the pushed datapoints.
+
+    Attributes
+    ----------
+    datapoints : int
+        Number of datapoints received since the last reset.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.datapoints = 0
+        super().__init__(latency)
+
+    def reset(self) -> None:
+        super().reset()
+        with self._lock:
+            self.datapoints = 0
+
+    def handle(self, method, url, body):
+        if method != 'POST':
+            return 405, {}, {'message': "Only push requests are supported."}
+        received = len(json.loads(body or b'[]'))
+        with self._lock:
+            self.datapoints += received
+        return 200, {}, {'status': 'OK', 'requestId': str(self.requests_served)}
@@ -0,0 +1,172 @@
+import os
+import time
+import logging
+from datetime import datetime, date
+from typing import Optional, Union
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def season_end_date(season: str) -> date:
+    """
+    Returns the first day after the given NBA season, playoffs included.
+
+    Parameters
+    ----------
+    season : str
+        Season in NBA API format, e.g. 2023-24.
+
+    Returns
+    -------
+    date
+        July 1st of the year in which the season ends.
+    """
+    return date(int(season[:4]) + 1, 7, 1)
+
+
+class GameLogCache:
+    """
+    On-disk cache of per-(key, season) game log DataFrames stored as pickled frames.
+
+    Game logs of completed seasons are kept permanently, game logs of a season that is still running
+    are only served while they are younger than the configured TTL.
+
+    Attributes
+    ----------
+    cache_dir : str
+        Directory holding the cached frames.
+    current_season_ttl : float
+        Maximum age in seconds of a cached game log for a season that is not finished yet.
+    """
+
+    def __init__(self, cache_dir: str, current_season_ttl: float = 3600):
+        """
+        Initializes the cache and creates the cache directory if needed.
+
+        Parameters
+        ----------
+        cache_dir : str
+            Directory holding the cached frames.
+        current_season_ttl : float
+            Maximum age in seconds of a cached game log for a season that is not finished yet.
+        """
+        self.cache_dir = cache_dir
+        self.current_season_ttl = current_season_ttl
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: Union[int, str], season: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}_{season}.pkl")
+
+    def get(self, key: Union[int, str], season: str) -> Optional[pd.DataFrame]:
+        """
+        Returns a cached game log if it is still valid.
+
+        Parameters
+        ----------
+        key : Union[int, str]
+            Identifier of the cached entity, e.g. a player ID.
+        season : str
+            Season in NBA API format, e.g. 2023-24.
+
+        Returns
+        -------
+        Optional[pd.DataFrame]
+            The cached game log or None on a cache miss.
+        """
+        path = self._path(key, season)
+        if not os.path.exists(path):
+            return None
+
+        modified = os.path.getmtime(path)
+        # a file written before the season ended may miss the last games, so it is only permanent after that
+        written_after_season = datetime.fromtimestamp(modified).date() >= season_end_date(season)
+        if not written_after_season and time.time() - modified > self.current_season_ttl:
+            logging.info(f"Cached game log for {key} in season {season} expired.")
+            return None
+
+        logging.info(f"Using cached game log for {key} in season {season}.")
+        return pd.read_pickle(path)
+
+    def put(self, key: Union[int, str], season: str, df: pd.DataFrame) -> None:
+        """
+        Stores a game log in the cache.
+
+        Parameters
+        ----------
+        key : Union[int, str]
+            Identifier of the cached entity, e.g. a player ID.
+        season : str
+            Season in NBA API format, e.g. 2023-24.
+        df : pd.DataFrame
+            Game log to store.
+        """
+        path = self._path(key, season)
+        tmp_path = f"{path}.tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+
+class BoxScoreCache:
+    """
+    On-disk cache of per-game box score DataFrames stored as pickled frames.
+
+    Box scores are only fetched for games listed in a game log, i.e. finished games, which never change,
+    so cached box scores do not expire.
+
+    Attributes
+    ----------
+    cache_dir : str
+        Directory holding the cached frames.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initializes the cache and creates the cache directory if needed.
+
+        Parameters
+        ----------
+        cache_dir : str
+            Directory holding the cached frames.
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, game_id: str) -> str:
+        return os.path.join(self.cache_dir, f"box_score_{game_id}.pkl")
+
+    def get(self, game_id: str) -> Optional[pd.DataFrame]:
+        """
+        Returns the cached box score of a game.
+
+        Parameters
+        ----------
+        game_id : str
+            NBA game ID, e.g. 0022300001.
+
+        Returns
+        -------
+        Optional[pd.DataFrame]
+            The cached box score or None on a cache miss.
+        """
+        path = self._path(game_id)
+        if not os.path.exists(path):
+            return None
+        return pd.read_pickle(path)
+
+    def put(self, game_id: str, df: pd.DataFrame) -> None:
+        """
+        Stores the box score of a game.
+
+        Parameters
+        ----------
+        game_id : str
+            NBA game ID, e.g. 0022300001.
+        df : pd.DataFrame
+            Box score to store.
+        """
+        path = self._path(game_id)
+        tmp_path = f"{path}.tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
@@ -1,11 +1,21 @@
 import os
+import gzip
+import time
+import requests
 import pandas as pd
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
+import orjson
 from dotenv import load_dotenv
 
-import databox
-from databox.rest import ApiException
+from push_ledger import PushLedger
+from push_spool import PushSpool
+from instrumentation import instrumentation
+from rate_limiter import rate_limits
+from schema_helper import BOX_SCORE_COLUMNS, iso_dates
+from rollup_helper import rolling_averages, season_totals, opponent_splits
 
 
 
@@ -13,56 +23,386 @@ load_dotenv()  # Load environment variables from a .env file
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+NBA_METRIC_COLUMNS = ['points', 'rebounds', 'assists', 'minutes', 'fg_pct', 'ts_pct']
+NBA_DIMENSION_COLUMNS = ['opposing_team', 'season']
+NBA_PUSH_MODES = ('raw', 'rollups', 'both')
+# sdk pushes through the generated Databox SDK, json writes the push API's JSON directly (see JsonPushClient)
+DATABOX_TRANSPORTS = ('sdk', 'json')
+
+
+def _dumps(push_data: List[dict]) -> bytes:
+    """
+    Serializes datapoints to compact JSON with orjson, NumPy scalars included.
+    """
+    return orjson.dumps(push_data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class PushApiError(Exception):
+    """
+    Rejected push of the JSON transport, with the same status, reason, body and headers attributes as the
+    SDK's ApiException so retries and spooling treat both alike.
+    """
+
+    def __init__(self, status: Optional[int], reason: Optional[str], body: Optional[str] = None, headers=None):
+        super().__init__(f"({status})\nReason: {reason}\nHTTP response body: {body}")
+        self.status = status
+        self.reason = reason
+        self.body = body
+        self.headers = headers
+
+
+class JsonPushClient:
+    """
+    Client of the Databox push API that writes the request body directly instead of going through the SDK's
+    model layer. Requests share a keep-alive connection pool and bodies of at least GZIP_MIN_BYTES are gzipped.
+    Its data_post has the signature of databox.DefaultApi.data_post and raises PushApiError on rejected pushes.
+
+    Attributes
+    ----------
+    url : str
+        Push endpoint.
+    session : requests.Session
+        Pooled session with the API token and the push API headers.
+    compress : bool
+        Whether large bodies are sent gzip-compressed.
+    timeout : float
+        Timeout in seconds of a single push.
+    """
+
+    GZIP_MIN_BYTES = 1024
+
+    def __init__(self, host: str, api_token: str, pool_maxsize: int = 10, compress: bool = True, timeout: float = 30.0):
+        """
+        Parameters
+        ----------
+        host : str
+            Push API host, e.g. https://push.databox.com.
+        api_token : str
+            Databox API token, sent as the basic auth user name.
+        pool_maxsize : int
+            Number of pooled keep-alive connections, at least the number of concurrent pushes.
+        compress : bool
+            Whether bodies of at least GZIP_MIN_BYTES are sent gzip-compressed.
+        timeout : float
+            Timeout in seconds of a single push.
+        """
+        self.url = f"{host.rstrip('/')}/data"
+        self.compress = compress
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.auth = (api_token, '')
+        self.session.headers.update({
+            'Accept': 'application/vnd.databox.v2+json',
+            'Content-Type': 'application/json'
+        })
+
+    def data_post(self, push_data: List[dict]) -> int:
+        """
+        Pushes datapoints in a single request.
+
+        Parameters
+        ----------
+        push_data : List[dict]
+            Datapoints in the push API format.
+
+        Returns
+        -------
+        int
+            Size of the sent request body in bytes, after compression.
+
+        Raises
+        ------
+        PushApiError
+            If the push is rejected.
+        """
+        body = _dumps(push_data)
+        headers = {}
+        if self.compress and len(body) >= self.GZIP_MIN_BYTES:
+            # level 1 already shrinks the repetitive datapoint JSON by most of its size at a fraction of the CPU
+            body = gzip.compress(body, compresslevel=1)
+            headers['Content-Encoding'] = 'gzip'
+        response = self.session.post(self.url, data=body, headers=headers, timeout=self.timeout)
+        if not response.ok:
+            raise PushApiError(response.status_code, response.reason, response.text, response.headers)
+        return len(body)
+
+
+def build_push_data(
+    df: pd.DataFrame,
+    metric_columns: List[str],
+    dimension_columns: Optional[List[str]] = None,
+    key_map: Optional[Dict[str, str]] = None,
+    date_column: str = 'date',
+    dimensional: bool = True,
+    non_dimensional: bool = True
+) -> List[dict]:
+    """
+    Turns a whole DataFrame into Databox push records in one column-oriented pass.
+    Every column is converted to a Python list once, so no per-row pandas objects are created.
+    Records keep the row order of the DataFrame: for every row the dimensional records come first,
+    followed by the non-dimensional ones, each in the order of metric_columns.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame with a date column, the metric columns and the dimension columns.
+    metric_columns : List[str]
+        Columns pushed as metric values.
+    dimension_columns : Optional[List[str]]
+        Columns pushed as attributes of the dimensional records.
+    key_map : Optional[Dict[str, str]]
+        Maps metric columns to Databox metric keys, columns not in the map are pushed under their own name.
+    date_column : str
+        Column holding the date of every row.
+    dimensional : bool
+        Whether records with attributes are produced.
+    non_dimensional : bool
+        Whether records without attributes are produced.
+
+    Returns
+    -------
+    List[dict]
+        Datapoints in Databox push format.
+    """
+    dimension_columns = dimension_columns or []
+    key_map = key_map or {}
+    dates = df[date_column].tolist()
+    values = [df[column].tolist() for column in metric_columns]
+    keys = [key_map.get(column, column) for column in metric_columns]
+
+    variants = []
+    if dimensional and dimension_columns:
+        # one attribute list per row, shared by all metrics of that row
+        attributes = [
+            [{"key": column, "value": value} for column, value in zip(dimension_columns, row)]
+            for row in zip(*(df[column].tolist() for column in dimension_columns))
+        ]
+        variants.extend(
+            [{"key": key, "value": value, "date": date, "attributes": attrs}
+             for value, date, attrs in zip(column_values, dates, attributes)]
+            for key, column_values in zip(keys, values)
+        )
+    if non_dimensional or not dimension_columns:
+        variants.extend(
+            [{"key": key, "value": value, "date": date} for value, date in zip(column_values, dates)]
+            for key, column_values in zip(keys, values)
+        )
+
+    return [record for row_records in zip(*variants) for record in row_records]
+
+
+def build_rollup_push_data(df: pd.DataFrame, window: int = 10, stride: Optional[int] = None) -> List[dict]:
+    """
+    Turns a game-log DataFrame into Databox push records of its rollups, see rollup_helper.
+    Rolling averages are pushed without dimensions, season totals with the season and opponent splits
+    with the opposing team and season as attributes.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Game-log DataFrame with columns: date, points, rebounds, assists, minutes, fg_pct, ts_pct, opposing_team, season.
+    window : int
+        Number of games in the rolling averages.
+    stride : Optional[int]
+        Every how many games a rolling average is pushed, defaults to window.
+
+    Returns
+    -------
+    List[dict]
+        Datapoints in Databox push format.
+    """
+    rolling = rolling_averages(df, window=window, stride=stride)
+    totals = season_totals(df)
+    splits = opponent_splits(df)
+    return (
+        build_push_data(rolling, metric_columns=list(rolling.columns[2:]), dimensional=False)
+        + build_push_data(totals, metric_columns=list(totals.columns[2:]), dimension_columns=['season'], non_dimensional=False)
+        + build_push_data(
+            splits, metric_columns=list(splits.columns[3:]), dimension_columns=['opposing_team', 'season'], non_dimensional=False
+        )
+    )
+
+
 class DataboxFeed:
     """
     A class to feed data from a Pandas DataFrame to Databox using their API.
 
     Attributes
     ----------
-    api_client : databox.ApiClient
-        The API client for interacting with Databox.
-    api_instance : databox.DefaultApi
+    api_client : Optional[databox.ApiClient]
+        The API client for interacting with Databox, None with the json transport.
+    api_instance : Union[databox.DefaultApi, JsonPushClient]
         The default API instance for making requests to Databox.
+    chunk_size : int
+        Maximum number of datapoints sent in a single data_post call.
+    max_workers : int
+        Maximum number of data_post requests in flight, 1 pushes serially.
+    max_retries : int
+        Number of retries for chunks rejected with 429 or 5xx responses.
+    backoff_base : float
+        Delay in seconds before the first retry, doubled on every following retry.
+    ledger : Optional[PushLedger]
+        Record of pushed datapoints, used to skip datapoints that did not change since their last push.
+    force_full_resync : bool
+        Whether every datapoint is pushed regardless of the ledger.
+    spool : Optional[PushSpool]
+        Durable store of chunks that failed to push, replayed by replay_spool.
+    nba_push_mode : str
+        Whether send_data_nba pushes the raw per-game values, only their rollups, or both.
+    rollup_window : int
+        Number of games in the rolling averages of the rollups.
+    per_player_keys : bool
+        Whether send_data_nba pushes frames of several players under one metric key per player.
+    rate_limiter : AdaptiveRateLimiter
+        Limiter of the Databox host, shared with all other clients of the host.
+    transport : str
+        Whether pushes go through the Databox SDK ('sdk') or JsonPushClient ('json').
 
     Methods
     -------
-    send_data(df: pd.DataFrame) -> None:
-        Sends data from a DataFrame to Databox.
+    send_data_nba(df: pd.DataFrame) -> List[dict]:
+        Sends NBA game stats from a DataFrame to Databox.
+    send_data_github(df: pd.DataFrame) -> List[dict]:
+        Sends daily commit counts from a DataFrame to Databox.
+    push_in_chunks(push_data: List[dict]) -> List[dict]:
+        Sends datapoints to Databox in chunks and reports the outcome of every chunk.
+    replay_spool() -> dict:
+        Pushes the chunks that failed in earlier runs.
     """
 
-    def __init__(self):
+    DEFAULT_CHUNK_SIZE = 100
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_workers: int = 1,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        ledger: Optional[PushLedger] = None,
+        force_full_resync: bool = False,
+        spool: Optional[PushSpool] = None,
+        nba_push_mode: str = 'raw',
+        rollup_window: int = 10,
+        transport: str = 'sdk',
+        per_player_keys: bool = False
+    ):
         """
         Initializes the DataboxFeed class by setting up the API client with the token from environment variables.
+
+        Parameters
+        ----------
+        chunk_size : int
+            Maximum number of datapoints sent in a single data_post call.
+        max_workers : int
+            Maximum number of data_post requests in flight. The default of 1 pushes serially.
+        max_retries : int
+            Number of retries for chunks rejected with 429 or 5xx responses.
+        backoff_base : float
+            Delay in seconds before the first retry, doubled on every following retry.
+        ledger : Optional[PushLedger]
+            Record of pushed datapoints. If not given, a ledger is opened when DATABOX_LEDGER_PATH is set.
+        force_full_resync : bool
+            Push every datapoint even if the ledger shows it unchanged, the ledger is still updated.
+        spool : Optional[PushSpool]
+            Store for chunks that failed to push. If not given, a spool is opened when DATABOX_SPOOL_PATH is set
+            (DATABOX_SPOOL_MAX_ATTEMPTS sets the failed attempts after which a chunk is parked).
+        nba_push_mode : str
+            'raw' pushes every game, 'rollups' only rolling averages, season totals and opponent splits, 'both' both.
+        rollup_window : int
+            Number of games in the rolling averages of the rollups.
+        transport : str
+            'sdk' pushes through the Databox SDK, 'json' through JsonPushClient without loading the SDK at all
+            (gzip can be turned off with DATABOX_GZIP=0).
+        per_player_keys : bool
+            Push the games of every player of a frame with a player_id column under their own metric keys,
+            e.g. points_1629029, so the players of a league-wide fetch do not overwrite each other.
         """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be a positive integer.")
+        if max_workers < 1:
+            raise ValueError("Max workers must be a positive integer.")
+        if nba_push_mode not in NBA_PUSH_MODES:
+            raise ValueError(f"NBA push mode must be one of {', '.join(NBA_PUSH_MODES)}.")
+        if transport not in DATABOX_TRANSPORTS:
+            raise ValueError(f"Databox transport must be one of {', '.join(DATABOX_TRANSPORTS)}.")
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        if ledger is None and os.getenv('DATABOX_LEDGER_PATH'):
+            ledger = PushLedger(os.getenv('DATABOX_LEDGER_PATH'))
+        self.ledger = ledger
+        self.force_full_resync = force_full_resync
+        if spool is None and os.getenv('DATABOX_SPOOL_PATH'):
+            spool = PushSpool(os.getenv('DATABOX_SPOOL_PATH'), int(os.getenv('DATABOX_SPOOL_MAX_ATTEMPTS', '5')))
+        self.spool = spool
+        self.nba_push_mode = nba_push_mode
+        self.rollup_window = rollup_window
+        self.per_player_keys = per_player_keys
+
         api_token = os.getenv('DATABOX_API')
         if not api_token:
             raise ValueError("Databox API token is not set in the environment variables.")
 
+        host = os.getenv('DATABOX_HOST', "https://push.databox.com")
+        # shared with every other feed pushing to the same host, follows Retry-After of throttled pushes
+        self.rate_limiter = rate_limits.for_url(host)
+        self.transport = transport
+        if transport == 'json':
+            self.api_client = None
+            self.api_instance = JsonPushClient(
+                host,
+                api_token,
+                pool_maxsize=max(10, max_workers),
+                compress=os.getenv('DATABOX_GZIP', '1') != '0'
+            )
+            self.api_errors = (PushApiError,)
+            return
+
+        # the SDK (and its pydantic models) is the slowest import of the connector, so only the SDK transport loads it
+        import databox
+        from databox.rest import ApiException
+
         configuration = databox.Configuration(
-            host="https://push.databox.com",
+            host=host,
             username=api_token,
             password=""
         )
+        # keep a pooled connection for every concurrent worker
+        configuration.connection_pool_maxsize = max(configuration.connection_pool_maxsize, max_workers)
 
         # Initialize the API client with the correct headers
         self.api_client = databox.ApiClient(configuration, "Accept", "application/vnd.databox.v2+json")
         self.api_instance = databox.DefaultApi(self.api_client)
+        self.api_errors = (ApiException,)
 
-    def send_data_nba(self, df: pd.DataFrame) -> None:
+    def send_data_nba(self, df: pd.DataFrame) -> List[dict]:
         """
         Sends data from a DataFrame to Databox.
+        Depending on nba_push_mode every game is pushed with and without dimensions, the rollups of the games are
+        pushed, or both. Box score columns of enriched frames are pushed with the raw values. With per_player_keys
+        every player's games and rollups are pushed under keys suffixed with the player ID. All datapoints are
+        batched into chunks.
 
         Parameters
         ----------
         df : pd.DataFrame
-            A DataFrame containing the data with columns: date, points, rebounds, assists, minutes, fg_pct, ts_pct, opposing_team, season.
+            A DataFrame containing the data with columns: date, points, rebounds, assists, minutes, fg_pct, ts_pct, opposing_team, season,
+            and player_id with per_player_keys.
+
+        Returns
+        -------
+        List[dict]
+            Per-chunk push report, see push_in_chunks. Failed chunks are reported there instead of raised
+            and, with a spool, kept for replay_spool.
 
         Raises
         ------
-        ApiException
-            If there is an error in sending data to Databox.
-        Exception
-            For any unexpected errors.
+        ValueError
+            If per_player_keys is set and the frame has no player_id column.
         """
         df = df.astype({
             'points': float,
@@ -72,152 +412,274 @@ class DataboxFeed:
             'fg_pct': float,
             'ts_pct': float
         })
-        for _, row in df.iterrows():
-            data_dict = row.to_dict()
-            push_data = [
-                {
-                    "key": "points",
-                    "value": data_dict['points'],
-                    "date": data_dict['date'],
-                    "attributes": [
-                        {"key": "opposing_team", "value": data_dict['opposing_team']},
-                        {"key": "season", "value": data_dict['season']}
-                    ]
-                },
-                {
-                    "key": "rebounds",
-                    "value": data_dict['rebounds'],
-                    "date": data_dict['date'],
-                    "attributes": [
-                        {"key": "opposing_team", "value": data_dict['opposing_team']},
-                        {"key": "season", "value": data_dict['season']}
-                    ]
-                },
-                {
-                    "key": "assists",
-                    "value": data_dict['assists'],
-                    "date": data_dict['date'],
-                    "attributes": [
-                        {"key": "opposing_team", "value": data_dict['opposing_team']},
-                        {"key": "season", "value": data_dict['season']}
-                    ]
-                },
-                {
-                    "key": "minutes",
-                    "value": data_dict['minutes'],
-                    "date": data_dict['date'],
-                    "attributes": [
-                        {"key": "opposing_team", "value": data_dict['opposing_team']},
-                        {"key": "season", "value": data_dict['season']}
-                    ]
-                },
-                {
-                    "key": "fg_pct",
-                    "value": data_dict['fg_pct'],
-                    "date": data_dict['date'],
-                    "attributes": [
-                        {"key": "opposing_team", "value": data_dict['opposing_team']},
-                        {"key": "season", "value": data_dict['season']}
-                    ]
-                },
-                {
-                    "key": "ts_pct",
-                    "value": data_dict['ts_pct'],
-                    "date": data_dict['date'],
-                    "attributes": [
-                        {"key": "opposing_team", "value": data_dict['opposing_team']},
-                        {"key": "season", "value": data_dict['season']}
-                    ]
-                }
-            ]
+        # float32 percentages widen to values like 0.47800001502, Databox keeps 6 decimal places anyway
+        df[NBA_METRIC_COLUMNS] = df[NBA_METRIC_COLUMNS].round(6)
+        df['date'] = iso_dates(df['date'])
+        if not self.per_player_keys:
+            return self.push_in_chunks(self._build_nba_push_data(df))
+        if 'player_id' not in df.columns:
+            raise ValueError("Per-player keys require a player_id column.")
+
+        push_data = []
+        for player_id, player_df in df.groupby('player_id', sort=False):
+            player_push_data = self._build_nba_push_data(player_df.reset_index(drop=True))
+            for record in player_push_data:
+                record['key'] = f"{record['key']}_{player_id}"
+            push_data += player_push_data
+        return self.push_in_chunks(push_data)
+
+    def _build_nba_push_data(self, df: pd.DataFrame) -> List[dict]:
+        """
+        Builds the datapoints of one or more players' games according to nba_push_mode.
+        """
+        push_data = []
+        if self.nba_push_mode in ('raw', 'both'):
+            push_data = build_push_data(
+                df,
+                metric_columns=NBA_METRIC_COLUMNS,
+                dimension_columns=NBA_DIMENSION_COLUMNS
+            )
+            # box score details of enriched frames, games without a box score have nothing to push
+            for column in (column for column in BOX_SCORE_COLUMNS if column in df.columns):
+                values = df[df[column].notna()].astype({column: float})
+                values[column] = values[column].round(6)
+                push_data += build_push_data(values, metric_columns=[column], dimension_columns=NBA_DIMENSION_COLUMNS)
+        if self.nba_push_mode in ('rollups', 'both'):
+            push_data += build_rollup_push_data(df, window=self.rollup_window)
+        return push_data
+
+    def send_data_github(self, df: pd.DataFrame) -> List[dict]:
+        """
+        Sends data from a DataFrame to Databox.
+        All datapoints are batched into chunks.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            A DataFrame containing the data with columns: date, count, repository and optionally author.
+
+        Returns
+        -------
+        List[dict]
+            Per-chunk push report, see push_in_chunks. Failed chunks are reported there instead of raised
+            and, with a spool, kept for replay_spool.
+        """
+        df = df.astype({
+            'count': float,
+            'repository': str
+        })
+        df['date'] = iso_dates(df['date'])
+        dimension_columns = ['repository'] + (['author'] if 'author' in df.columns else [])
+        push_data = build_push_data(
+            df,
+            metric_columns=['count'],
+            dimension_columns=dimension_columns,
+            key_map={'count': 'commits'},
+            non_dimensional=False
+        )
+
+        return self.push_in_chunks(push_data)
+
+    def push_in_chunks(self, push_data: List[dict]) -> List[dict]:
+        """
+        Sends a list of datapoints to Databox in as few requests as possible.
+        Datapoints are split into chunks of at most `chunk_size` items and each chunk is sent with a single data_post call.
+        With a ledger only new or changed datapoints are sent, unless force_full_resync is set.
+        With max_workers > 1 independent chunks are pushed concurrently, datapoints sharing a date are always
+        pushed by the same worker in their original order, so the last value pushed for a date stays the last one.
+
+        Parameters
+        ----------
+        push_data : List[dict]
+            Datapoints in Databox push format (key, value, date and optional attributes).
+
+        Returns
+        -------
+        List[dict]
+            One report per chunk with keys: chunk, size, success, error.
+        """
+        if self.ledger is not None and not self.force_full_resync:
+            push_data = self.ledger.filter_changed(push_data)
+        instrumentation.record_rows('databox.datapoints', len(push_data))
+        lanes = self._plan_lanes(push_data)
+        total = sum(len(lane) for lane in lanes)
+        first_indexes = []
+        next_index = 1
+        for lane in lanes:
+            first_indexes.append(next_index)
+            next_index += len(lane)
 
+        report = []
+        if self.max_workers > 1 and len(lanes) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(self._push_lane, lane, first_index, total)
+                    for lane, first_index in zip(lanes, first_indexes)
+                ]
+                for future in futures:
+                    report.extend(future.result())
+        else:
+            for lane, first_index in zip(lanes, first_indexes):
+                report.extend(self._push_lane(lane, first_index, total))
+
+        failed = sum(1 for chunk_report in report if not chunk_report["success"])
+        logging.info(f"Pushed {len(push_data)} datapoints in {total} requests ({failed} failed).")
+        return report
+
+    def _plan_lanes(self, push_data: List[dict]) -> List[List[List[dict]]]:
+        """
+        Groups datapoints by date and packs whole dates into chunks of at most `chunk_size` datapoints.
+        A lane is a list of chunks that must be pushed sequentially, it only holds more than one chunk
+        when a single date has more datapoints than fit in one chunk.
+
+        Parameters
+        ----------
+        push_data : List[dict]
+            Datapoints in Databox push format.
+
+        Returns
+        -------
+        List[List[List[dict]]]
+            Lanes of chunks, lanes are independent of each other.
+        """
+        dates: Dict[str, List[dict]] = {}
+        for record in push_data:
+            dates.setdefault(record["date"], []).append(record)
+
+        lanes = []
+        current: List[dict] = []
+        for records in dates.values():
+            if len(records) > self.chunk_size:
+                lanes.append([records[i:i + self.chunk_size] for i in range(0, len(records), self.chunk_size)])
+            elif len(current) + len(records) > self.chunk_size:
+                lanes.append([current])
+                current = list(records)
+            else:
+                current.extend(records)
+        if current:
+            lanes.append([current])
+        return lanes
+
+    def _push_lane(self, lane: List[List[dict]], first_index: int, total: int) -> List[dict]:
+        """
+        Pushes the chunks of a lane one after another.
+
+        Parameters
+        ----------
+        lane : List[List[dict]]
+            Chunks to push in order.
+        first_index : int
+            Number of the first chunk of the lane, used for reporting.
+        total : int
+            Total number of chunks of the push, used for reporting.
+
+        Returns
+        -------
+        List[dict]
+            One report per chunk with keys: chunk, size, success, error.
+        """
+        report = []
+        for index, chunk in enumerate(lane, start=first_index):
+            error = None
             try:
-                self.api_instance.data_post(push_data=push_data)
-                logging.info(f"Successfully pushed data for date: {data_dict['date']}")
-            except ApiException as e:
-                logging.error(f"API Exception occurred: {e}")
+                self._post_with_retry(chunk)
+                if self.ledger is not None:
+                    self.ledger.record(chunk)
+                logging.info(f"Successfully pushed chunk {index}/{total} with {len(chunk)} datapoints.")
+            except self.api_errors as e:
+                error = str(e)
+                logging.error(f"API Exception occurred while pushing chunk {index}/{total}: {e}")
+                # client errors other than throttling would be rejected again, so they are not spooled
+                if self.spool is not None and (e.status is None or e.status == 429 or e.status >= 500):
+                    self.spool.add(chunk, error)
             except Exception as e:
-                logging.error(f"An unexpected error occurred: {e}")
-            # non dimensional data
-            push_data = [
-                {
-                    "key": "points",
-                    "value": data_dict['points'],
-                    "date": data_dict['date']
-                },
-                {
-                    "key": "rebounds",
-                    "value": data_dict['rebounds'],
-                    "date": data_dict['date']
-                },
-                {
-                    "key": "assists",
-                    "value": data_dict['assists'],
-                    "date": data_dict['date']
-                },
-                {
-                    "key": "minutes",
-                    "value": data_dict['minutes'],
-                    "date": data_dict['date']
-                },
-                {
-                    "key": "fg_pct",
-                    "value": data_dict['fg_pct'],
-                    "date": data_dict['date']
-                },
-                {
-                    "key": "ts_pct",
-                    "value": data_dict['ts_pct'],
-                    "date": data_dict['date'],
-                }
-            ]
+                error = str(e)
+                logging.error(f"An unexpected error occurred while pushing chunk {index}/{total}: {e}")
+                if self.spool is not None:
+                    self.spool.add(chunk, error)
+            report.append({"chunk": index, "size": len(chunk), "success": error is None, "error": error})
+        return report
+
+    def replay_spool(self) -> dict:
+        """
+        Pushes the spooled chunks of earlier runs, oldest first, each with the usual retry and backoff.
+        Draining stops at the first chunk that still fails, so an unavailable Databox is not hammered;
+        that chunk and all later ones stay spooled for the next run. A chunk Databox rejects as invalid (4xx other
+        than 429) is parked right away and draining goes on, a chunk that failed the spool's max_attempts times
+        is parked as well, so no chunk holds back the spool forever.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            Summary with keys: replayed, parked, remaining.
+        """
+        if self.spool is None:
+            return {"replayed": 0, "parked": 0, "remaining": 0}
 
+        replayed, parked = 0, 0
+        for spool_id, chunk, attempts in self.spool.pending():
             try:
-                self.api_instance.data_post(push_data=push_data)
-                logging.info(f"Successfully pushed data for date: {data_dict['date']}")
-            except ApiException as e:
-                logging.error(f"API Exception occurred: {e}")
+                self._post_with_retry(chunk)
             except Exception as e:
-                logging.error(f"An unexpected error occurred: {e}")
+                status = getattr(e, 'status', None)
+                permanent = isinstance(status, int) and 400 <= status < 500 and status != 429
+                logging.error(f"Replaying spooled chunk {spool_id} failed (attempt {attempts + 1}): {e}")
+                parked += self.spool.mark_failed(spool_id, str(e), permanent)
+                if permanent:
+                    continue
+                break
+            self.spool.remove(spool_id)
+            if self.ledger is not None:
+                self.ledger.record(chunk)
+            replayed += 1
 
-    def send_data_github(self, df: pd.DataFrame) -> None:
+        remaining = len(self.spool)
+        logging.info(f"Replayed {replayed} spooled chunks, parked {parked}, {remaining} remain spooled.")
+        return {"replayed": replayed, "parked": parked, "remaining": remaining}
+
+    def _post_with_retry(self, chunk: List[dict]) -> None:
         """
-        Sends data from a DataFrame to Databox.
+        Sends one chunk with data_post, retrying with exponential backoff on throttling (429) and server (5xx) errors.
+        A Retry-After header replaces the backoff, the rate limiter holds the retry back until then.
 
         Parameters
         ----------
-        df : pd.DataFrame
-            A DataFrame containing the data with columns: date, commits, additions, deletions, changed_files, repository.
+        chunk : List[dict]
+            Datapoints sent in a single request.
 
         Raises
         ------
         ApiException
-            If there is an error in sending data to Databox.
-        Exception
-            For any unexpected errors.
+            If the request fails with a non-retryable status or the retries are exhausted,
+            PushApiError instead with the json transport.
         """
-        df = df.astype({
-            'count': float,
-            'repository': str,
-            'date': str
-        })
-        for _, row in df.iterrows():
-            data_dict = row.to_dict()
-            push_data = [
-                {
-                    "key": "commits",
-                    "value": data_dict['count'],
-                    "date": data_dict['date'],
-                    "attributes": [
-                        {"key": "repository", "value": data_dict['repository']}
-                    ]
-                }
-            ]
-        
+        for attempt in range(self.max_retries + 1):
             try:
-                self.api_instance.data_post(push_data=push_data)
-                logging.info(f"Successfully pushed data for date: {data_dict['date']}")
-            except ApiException as e:
-                logging.error(f"API Exception occurred: {e}")
-            except Exception as e:
-                logging.error(f"An unexpected error occurred: {e}")
\ No newline at end of file
+                with self.rate_limiter.request() as feedback, instrumentation.request('databox') as details:
+                    try:
+                        sent = self.api_instance.data_post(push_data=chunk)
+                    except self.api_errors as e:
+                        feedback['status'] = e.status
+                        feedback['headers'] = e.headers
+                        raise
+                    if self.transport == 'json':
+                        details['request_bytes'] = sent
+                    elif instrumentation.enabled:
+                        # the SDK does not expose its request body, the chunk is serialized again to record its size
+                        details['request_bytes'] = len(_dumps(chunk))
+                return
+            except self.api_errors as e:
+                retryable = e.status == 429 or (e.status is not None and 500 <= e.status < 600)
+                if not retryable or attempt == self.max_retries:
+                    raise
+                # a Retry-After of the response already holds the next request back in the rate limiter
+                wait = self.rate_limiter.wait_time()
+                delay = 0.0 if wait > 0 else self.backoff_base * 2 ** attempt
+                logging.warning(f"Databox responded with {e.status}, retrying in {max(wait, delay):.1f}s "
+                                f"(attempt {attempt + 1}/{self.max_retries}).")
+                instrumentation.record_retry('databox')
+                time.sleep(delay)
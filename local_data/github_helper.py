@@ -1,28 +1,164 @@
 import os
+import json
+import time
 import requests
 import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Optional
+from urllib.parse import urlencode, urlparse, parse_qs
 
 import pandas as pd
-from dotenv import load_dotenv
+
+from instrumentation import instrumentation
+from rate_limiter import rate_limits
+from schema_helper import compact_commit_counts
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
+def limited_get(session: requests.Session, url: str, **kwargs) -> requests.Response:
+    """
+    Sends a GET request through the rate limiter of the URL's host, which follows GitHub's
+    X-RateLimit-Remaining/X-RateLimit-Reset and Retry-After headers, and records it in the run instrumentation.
+    """
+    with rate_limits.for_url(url).request() as feedback, instrumentation.request('github') as details:
+        response = session.get(url, **kwargs)
+        feedback['status'] = response.status_code
+        feedback['headers'] = response.headers
+        details['response_bytes'] = len(response.content)
+        details['error'] = not response.ok
+    return response
+
+
+class DailyCommitCounter:
+    """
+    Running per-day commit counter that listing pages are folded into as they arrive.
+    Only one integer per day (or per day and author) is kept, no matter how many commits are counted.
+
+    Attributes
+    ----------
+    by_author : bool
+        Whether commits are counted per day and author instead of per day.
+    counts : Counter
+        Commit counts keyed by date or by (date, author).
+    """
+
+    def __init__(self, by_author: bool = False):
+        self.by_author = by_author
+        self.counts: Counter = Counter()
+
+    def add_page(self, commits: list) -> None:
+        """
+        Folds one page of commits from the GitHub API into the counters.
+
+        Parameters
+        ----------
+        commits : list
+            Commits as returned by the GitHub commits API.
+        """
+        if self.by_author:
+            self.counts.update(
+                (commit['commit']['author']['date'][:10], self._author(commit)) for commit in commits
+            )
+        else:
+            self.counts.update(commit['commit']['author']['date'][:10] for commit in commits)
+
+    def _author(self, commit: dict) -> str:
+        # prefer the GitHub login, commits of unknown users only carry the git author name
+        return (commit.get('author') or {}).get('login') or commit['commit']['author'].get('name', 'unknown')
+
+    def to_dataframe(self, repository: str) -> pd.DataFrame:
+        """
+        Creates the final daily table.
+
+        Parameters
+        ----------
+        repository : str
+            Value of the repository column.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with columns: date, count, repository, or date, author, count, repository when counting by author.
+        """
+        if self.by_author:
+            rows = [(date, author, count) for (date, author), count in sorted(self.counts.items())]
+            df = pd.DataFrame(rows, columns=['date', 'author', 'count'])
+        else:
+            df = pd.DataFrame(sorted(self.counts.items()), columns=['date', 'count'])
+        df['repository'] = repository
+        return compact_commit_counts(df)
+
+
 class GitHubFetcher:
     """
     Class that handles github data fetching and processing.
     """
-    def __init__(self):
+    PER_PAGE = 100
+    API_URL = 'https://api.github.com'
+
+    def __init__(
+        self,
+        repo_owner: str = 'grapergrape',
+        repo_name: str = 'Databox-nba',
+        state_path: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        page_workers: int = 4,
+        repository: Optional[str] = None,
+        request_slots: Optional[threading.Semaphore] = None
+    ):
         """
         Method to initialize the GitHubFetcher class with the necessary credentials and github repo attributes.
+
+        Parameters
+        ----------
+        repo_owner : str
+            Owner of the repository.
+        repo_name : str
+            Name of the repository.
+        state_path : Optional[str]
+            JSON file holding the incremental sync state, defaults to the GITHUB_STATE_PATH environment variable.
+        session : Optional[requests.Session]
+            Pooled session used for all requests, a new one is created if not given.
+        page_workers : int
+            Number of listing pages fetched concurrently once the last page is known, 1 follows next links one by one.
+        repository : Optional[str]
+            Value of the repository column in the created DataFrames, defaults to the repository name.
+        request_slots : Optional[threading.Semaphore]
+            Semaphore limiting the number of requests in flight, shared between fetchers for a global cap.
         """
+        if page_workers < 1:
+            raise ValueError("Page workers must be a positive integer.")
         self.github_token = os.getenv('GITHUB_TOKEN')
-        self.repo_owner = 'grapergrape' 
-        self.repo_name = 'Databox-nba'
-        self.api_url = f'https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/commits'
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        self.repository = repository or repo_name
+        self.api_url = f'{self.API_URL}/repos/{self.repo_owner}/{self.repo_name}/commits'
         self.headers = {
             'Authorization': f'token {self.github_token}'
         }
+        self.state_path = state_path or os.getenv('GITHUB_STATE_PATH')
+        self.page_workers = page_workers
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(10, page_workers))
+            session.mount('https://', adapter)
+        self.session = session
+        self.request_slots = request_slots
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a GET request on the pooled session, waiting for a free request slot when a global cap is set.
+        """
+        if self.request_slots is None:
+            return self._timed_get(url, **kwargs)
+        with self.request_slots:
+            return self._timed_get(url, **kwargs)
+
+    def _timed_get(self, url: str, **kwargs) -> requests.Response:
+        return limited_get(self.session, url, **kwargs)
 
     def fetch_data(self) -> list:
         """
@@ -39,20 +175,170 @@ class GitHubFetcher:
         """
         logging.info(f"Fetching all commits for {self.repo_name} repository.")
         commit_dates = []
-        response = requests.get(self.api_url, headers=self.headers)
-        commits = response.json()
-        logging.info(f"Received {len(commits)} commits.")
-        while commits:
+        response = self._get(self.api_url, headers=self.headers, params={'per_page': self.PER_PAGE})
+        for commits in self._iter_commit_pages(response):
             for commit in commits:
                 commit_date = commit['commit']['author']['date']
                 commit_dates.append(commit_date[:10])
+        return commit_dates
+
+    def _iter_commit_pages(self, response: requests.Response) -> Iterator[list]:
+        """
+        Generator that yields the commits of the given response and of all following pages.
+        When the response carries a last link and page_workers > 1, the remaining pages are fetched concurrently,
+        otherwise next links are followed one page at a time. Pages are always yielded in order.
+
+        Parameters
+        ----------
+        response : requests.Response
+            Response of the first listing page.
+
+        Returns
+        -------
+        Iterator[list]
+            One list of commits per page.
+        """
+        commits = response.json()
+        logging.info(f"Received {len(commits)} commits.")
+        if not commits:
+            return
+        instrumentation.record_rows('github.commits', len(commits))
+        yield commits
 
-            if 'next' in response.links:
-                response = requests.get(response.links['next']['url'], headers=self.headers)
-                commits = response.json()
-            else:
+        if self.page_workers > 1 and 'last' in response.links:
+            yield from self._fetch_remaining_pages(response.links['last']['url'])
+            return
+
+        while 'next' in response.links:
+            response = self._get(response.links['next']['url'], headers=self.headers)
+            commits = response.json()
+            if not commits:
                 break
-        return commit_dates
+            instrumentation.record_rows('github.commits', len(commits))
+            yield commits
+
+    def _fetch_remaining_pages(self, last_url: str) -> Iterator[list]:
+        """
+        Fetches pages 2 up to the page of the last link concurrently on the pooled session.
+
+        Parameters
+        ----------
+        last_url : str
+            URL of the last listing page as given in the Link header.
+
+        Returns
+        -------
+        Iterator[list]
+            One list of commits per page, in page order.
+        """
+        parsed = urlparse(last_url)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        last_page = int(query.get('page', 1))
+        page_urls = [
+            parsed._replace(query=urlencode({**query, 'page': page})).geturl()
+            for page in range(2, last_page + 1)
+        ]
+        logging.info(f"Fetching {len(page_urls)} remaining pages with {self.page_workers} workers.")
+
+        def fetch_page(url: str) -> list:
+            page_response = self._get(url, headers=self.headers)
+            page_response.raise_for_status()
+            commits = page_response.json()
+            instrumentation.record_rows('github.commits', len(commits))
+            return commits
+
+        with ThreadPoolExecutor(max_workers=self.page_workers) as executor:
+            yield from executor.map(fetch_page, page_urls)
+
+    def fetch_incremental(self) -> pd.DataFrame:
+        """
+        Fetches only commits newer than the stored watermark and merges their daily counts into the stored history.
+        The first listing page is requested with If-None-Match, so a run without new commits is answered
+        with 304 Not Modified, which does not count against the GitHub rate limit.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with columns: date, count, repository, covering the whole stored history.
+        """
+        if not self.state_path:
+            raise ValueError("Incremental sync needs a state path, set GITHUB_STATE_PATH.")
+        state = self._load_state()
+        params = {'per_page': self.PER_PAGE}
+        headers = dict(self.headers)
+        if state['watermark']:
+            params['since'] = state['watermark']
+            if state['etag'] and state['etag_since'] == state['watermark']:
+                headers['If-None-Match'] = state['etag']
+
+        logging.info(f"Fetching commits for {self.repo_name} repository since {state['watermark'] or 'the beginning'}.")
+        response = self._get(self.api_url, headers=headers, params=params)
+        if response.status_code == 304:
+            logging.info("No new commits since the last sync.")
+            return self._history_frame(state)
+        response.raise_for_status()
+
+        etag = response.headers.get('ETag')
+        seen_shas = set(state['watermark_shas'])
+        watermark = state['watermark']
+        watermark_shas = set(seen_shas)
+        new_commits = 0
+        for commits in self._iter_commit_pages(response):
+            for commit in commits:
+                if commit['sha'] in seen_shas:
+                    continue
+                new_commits += 1
+                commit_date = commit['commit']['author']['date'][:10]
+                state['daily_counts'][commit_date] = state['daily_counts'].get(commit_date, 0) + 1
+
+                committed_at = commit['commit']['committer']['date']
+                if watermark is None or committed_at > watermark:
+                    watermark = committed_at
+                    watermark_shas = {commit['sha']}
+                elif committed_at == watermark:
+                    watermark_shas.add(commit['sha'])
+
+        logging.info(f"Merged {new_commits} new commits into the stored history.")
+        state['etag'] = etag
+        state['etag_since'] = params.get('since')
+        if watermark != state['watermark']:
+            # the since filter changes, so the stored ETag no longer matches the next request
+            state['etag'] = None
+        state['watermark'] = watermark
+        state['watermark_shas'] = sorted(watermark_shas)
+        self._save_state(state)
+        return self._history_frame(state)
+
+    def _load_state(self) -> dict:
+        """
+        Loads the incremental sync state, returns an empty state if there is none yet.
+        """
+        state = {'watermark': None, 'watermark_shas': [], 'etag': None, 'etag_since': None, 'daily_counts': {}}
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as state_file:
+                state.update(json.load(state_file))
+        return state
+
+    def _save_state(self, state: dict) -> None:
+        """
+        Atomically writes the incremental sync state.
+        """
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as state_file:
+            json.dump(state, state_file)
+        os.replace(tmp_path, self.state_path)
+
+    def _history_frame(self, state: dict) -> pd.DataFrame:
+        """
+        Creates the daily commit DataFrame from the stored history.
+        """
+        df = pd.DataFrame(sorted(state['daily_counts'].items()), columns=['date', 'count'])
+        df['repository'] = self.repository
+        return compact_commit_counts(df)
 
     def create_dataframe(self, commit_dates: list) -> pd.DataFrame:
         """
@@ -72,27 +358,244 @@ class GitHubFetcher:
         df = pd.DataFrame(commit_dates, columns=['date'])
         df['count'] = 1
         df = df.groupby('date').count().reset_index()
-        df['repository'] = self.repo_name
-        return df
+        df['repository'] = self.repository
+        return compact_commit_counts(df)
     
-    def fetch_all_commits(self) -> pd.DataFrame:
+    def fetch_daily_counts(self, by_author: bool = False) -> pd.DataFrame:
+        """
+        Fetches all commits and folds every page into running daily counters while the pages arrive,
+        so memory stays flat no matter how many commits the repository has.
+
+        Parameters
+        ----------
+        by_author : bool
+            Whether commits are counted per day and author.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with columns: date, count, repository (date, author, count, repository when by_author is set).
+        """
+        logging.info(f"Counting daily commits for {self.repo_name} repository.")
+        counter = DailyCommitCounter(by_author=by_author)
+        response = self._get(self.api_url, headers=self.headers, params={'per_page': self.PER_PAGE})
+        for commits in self._iter_commit_pages(response):
+            counter.add_page(commits)
+        return counter.to_dataframe(self.repository)
+
+    def iter_daily_count_chunks(self, by_author: bool = False) -> Iterator[pd.DataFrame]:
+        """
+        Yields daily commit counts page by page while the listing pages arrive.
+        Commits are listed newest first, so the oldest day of a page may continue on the next page and is held back
+        until the following page is counted. Counts are cumulative: a day that shows up again later is yielded again
+        with its new total, so pushing the chunks in order always leaves the correct total as the last value.
+
+        Parameters
+        ----------
+        by_author : bool
+            Whether commits are counted per day and author.
+
+        Returns
+        -------
+        Iterator[pd.DataFrame]
+            DataFrames with the columns of fetch_daily_counts holding the days that changed since the previous chunk.
+        """
+        counter = DailyCommitCounter(by_author=by_author)
+        emitted: Counter = Counter()
+        response = self._get(self.api_url, headers=self.headers, params={'per_page': self.PER_PAGE})
+        for commits in self._iter_commit_pages(response):
+            counter.add_page(commits)
+            oldest_date = min(commit['commit']['author']['date'][:10] for commit in commits)
+            chunk = self._changed_counts(counter, emitted, held_back_date=oldest_date)
+            if len(chunk):
+                yield chunk
+
+        chunk = self._changed_counts(counter, emitted)
+        if len(chunk):
+            yield chunk
+
+    def _changed_counts(self, counter: DailyCommitCounter, emitted: Counter, held_back_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Returns the counts that differ from the already emitted ones and marks them as emitted.
+        """
+        changed = DailyCommitCounter(by_author=counter.by_author)
+        for key, count in counter.counts.items():
+            date = key[0] if counter.by_author else key
+            if date != held_back_date and emitted[key] != count:
+                changed.counts[key] = count
+                emitted[key] = count
+        return changed.to_dataframe(self.repository)
+
+    def fetch_all_commits(self, by_author: bool = False) -> pd.DataFrame:
         """
         Main run method for this class.
 
         Parameters
         ----------
-        None
+        by_author : bool
+            Whether commits are counted per day and author.
 
         Returns
         -------
         pd.DataFrame
-            DataFrame with columns: date, count, repository.
+            DataFrame with columns: date, count, repository (date, author, count, repository when by_author is set).
+
+        """
+        return self.fetch_daily_counts(by_author=by_author)
+
+class MultiRepoFetcher:
+    """
+    Class that fetches daily commit counts of many repositories concurrently.
+
+    All repositories share one pooled session and one global cap on requests in flight. Every repository is
+    fetched in isolation: a failing repository is logged and reported without affecting the others.
 
+    Attributes
+    ----------
+    repositories : List[str]
+        Repositories in owner/name format.
+    report : List[dict]
+        Outcome of the last fetch per repository with keys: repository, success, rows, seconds, error.
+    """
+
+    def __init__(
+        self,
+        repositories: Optional[List[str]] = None,
+        org: Optional[str] = None,
+        max_repo_workers: int = 8,
+        max_requests_in_flight: int = 16,
+        page_workers: int = 4,
+        state_dir: Optional[str] = None
+    ):
+        """
+        Initializes the fetcher for an explicit list of repositories and/or all repositories of an organization.
+
+        Parameters
+        ----------
+        repositories : Optional[List[str]]
+            Repositories in owner/name format.
+        org : Optional[str]
+            Organization whose repositories are added to the list.
+        max_repo_workers : int
+            Number of repositories fetched at once.
+        max_requests_in_flight : int
+            Global cap on concurrent GitHub requests across all repositories.
+        page_workers : int
+            Number of listing pages fetched concurrently per repository.
+        state_dir : Optional[str]
+            Directory for per-repository incremental sync state, repositories are fully fetched if not given.
+        """
+        if not repositories and not org:
+            raise ValueError("Either repositories or an organization must be given.")
+        self.github_token = os.getenv('GITHUB_TOKEN')
+        self.headers = {
+            'Authorization': f'token {self.github_token}'
+        }
+        self.max_repo_workers = max_repo_workers
+        self.page_workers = page_workers
+        self.state_dir = state_dir
+        self.request_slots = threading.Semaphore(max_requests_in_flight)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_requests_in_flight)
+        self.session.mount('https://', adapter)
+        self.repositories = list(repositories or [])
+        if org:
+            self.repositories.extend(repo for repo in self._list_org_repositories(org) if repo not in self.repositories)
+        self.report: List[dict] = []
+
+    def _list_org_repositories(self, org: str) -> List[str]:
+        """
+        Lists all repositories of an organization in owner/name format.
+        """
+        logging.info(f"Listing repositories of the {org} organization.")
+        repositories = []
+        url = f'{GitHubFetcher.API_URL}/orgs/{org}/repos'
+        params = {'per_page': GitHubFetcher.PER_PAGE}
+        while url:
+            response = limited_get(self.session, url, headers=self.headers, params=params)
+            response.raise_for_status()
+            repositories.extend(repo['full_name'] for repo in response.json())
+            url = response.links.get('next', {}).get('url')
+            params = None
+        return repositories
+
+    def _create_fetcher(self, repository: str) -> GitHubFetcher:
+        owner, name = repository.split('/', 1)
+        fetcher = GitHubFetcher(
+            repo_owner=owner,
+            repo_name=name,
+            session=self.session,
+            page_workers=self.page_workers,
+            repository=repository,
+            request_slots=self.request_slots
+        )
+        # the single repository GITHUB_STATE_PATH must not be shared between repositories
+        fetcher.state_path = os.path.join(self.state_dir, f"{owner}__{name}.json") if self.state_dir else None
+        return fetcher
+
+    def _fetch_repository(self, repository: str) -> Optional[pd.DataFrame]:
+        """
+        Fetches one repository and records its timing and outcome, errors are logged and not raised.
         """
-        commit_dates = self.fetch_data()
-        df = self.create_dataframe(commit_dates)
+        start = time.perf_counter()
+        try:
+            fetcher = self._create_fetcher(repository)
+            df = fetcher.fetch_incremental() if fetcher.state_path else fetcher.fetch_all_commits()
+        except Exception as e:
+            seconds = time.perf_counter() - start
+            logging.error(f"Fetching commits of {repository} failed after {seconds:.2f}s: {e}")
+            self.report.append({'repository': repository, 'success': False, 'rows': 0, 'seconds': seconds, 'error': str(e)})
+            return None
+        seconds = time.perf_counter() - start
+        logging.info(f"Fetched {len(df)} commit days of {repository} in {seconds:.2f}s.")
+        self.report.append({'repository': repository, 'success': True, 'rows': len(df), 'seconds': seconds, 'error': None})
         return df
 
+    def iter_repository_frames(self) -> Iterator[pd.DataFrame]:
+        """
+        Yields the daily commit counts of every repository as soon as that repository is fetched.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Iterator[pd.DataFrame]
+            One DataFrame per successfully fetched repository with columns: date, count, repository.
+        """
+        self.report = []
+        with ThreadPoolExecutor(max_workers=self.max_repo_workers) as executor:
+            futures = [executor.submit(self._fetch_repository, repository) for repository in self.repositories]
+            for future in as_completed(futures):
+                df = future.result()
+                if df is not None:
+                    yield df
+
+    def fetch_all_commits(self) -> pd.DataFrame:
+        """
+        Fetches daily commit counts of all repositories concurrently.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with columns: date, count, repository, where repository is in owner/name format.
+        """
+        self.report = []
+        with ThreadPoolExecutor(max_workers=self.max_repo_workers) as executor:
+            frames = list(executor.map(self._fetch_repository, self.repositories))
+        self.report.sort(key=lambda repo_report: self.repositories.index(repo_report['repository']))
+        frames = [df for df in frames if df is not None]
+        if not frames:
+            return compact_commit_counts(pd.DataFrame(columns=['date', 'count', 'repository']))
+        # repositories have different categories, concat falls back to object columns
+        return compact_commit_counts(pd.concat(frames, ignore_index=True))
+
+
 if __name__ == '__main__':
     analyzer = GitHubFetcher('grapergrape', 'Databox-nba')
     commit_dates = analyzer.fetch_data()
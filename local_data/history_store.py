@@ -0,0 +1,269 @@
+import sqlite3
+import logging
+import threading
+from typing import List, Optional
+
+import pandas as pd
+
+from schema_helper import BOX_SCORE_COLUMNS, compact_game_stats, compact_commit_counts, iso_dates
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+GAME_STATS_METRICS = ['points', 'rebounds', 'assists', 'minutes', 'fg_pct', 'ts_pct']
+# columns added after the first release of the store, added to existing files when they are opened
+GAME_STATS_ADDED_COLUMNS = {'game_id': 'TEXT', **{column: 'REAL' for column in BOX_SCORE_COLUMNS}}
+GAME_STATS_BASE_COLUMNS = ['player_id', 'player_name', 'date', 'season', 'opposing_team', *GAME_STATS_METRICS]
+GAME_STATS_COLUMNS = [*GAME_STATS_BASE_COLUMNS, *GAME_STATS_ADDED_COLUMNS]
+
+
+class HistoryStore:
+    """
+    Local SQLite copy of every game log and daily commit count fetched so far.
+
+    Runs append what they fetch, rows are keyed by player and date or by repository, author and date, so fetching
+    the same games or days again replaces them instead of duplicating them. Game IDs and box score columns are
+    kept when the same games are appended again without them. The keys and the extra date and season
+    indexes let the loaders read only the requested slice, e.g. one player's season or one repository's last month.
+
+    Attributes
+    ----------
+    path : str
+        Location of the SQLite file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens the store and creates its tables and indexes if needed.
+
+        Parameters
+        ----------
+        path : str
+            Location of the SQLite file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS game_stats (
+                    player_id INTEGER NOT NULL,
+                    player_name TEXT,
+                    date TEXT NOT NULL,
+                    season TEXT NOT NULL,
+                    opposing_team TEXT,
+                    points REAL,
+                    rebounds REAL,
+                    assists REAL,
+                    minutes REAL,
+                    fg_pct REAL,
+                    ts_pct REAL,
+                    PRIMARY KEY (player_id, date)
+                );
+                CREATE INDEX IF NOT EXISTS game_stats_date ON game_stats (date);
+                CREATE INDEX IF NOT EXISTS game_stats_season ON game_stats (season, player_id);
+                CREATE TABLE IF NOT EXISTS commit_counts (
+                    repository TEXT NOT NULL,
+                    author TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (repository, author, date)
+                );
+                CREATE INDEX IF NOT EXISTS commit_counts_date ON commit_counts (date);
+                """
+            )
+            existing = {row[1] for row in self._connection.execute("PRAGMA table_info(game_stats)")}
+            for column, sql_type in GAME_STATS_ADDED_COLUMNS.items():
+                if column not in existing:
+                    self._connection.execute(f"ALTER TABLE game_stats ADD COLUMN {column} {sql_type}")
+
+    def append_game_stats(self, df: pd.DataFrame, player_id: Optional[int] = None) -> int:
+        """
+        Stores game logs, games already stored for the same player and date are replaced.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Frame returned by StatsFetcher.fetch_all_game_stats, iter_game_stats or fetch_league_game_stats,
+            with or without game_id and the box score columns.
+        player_id : Optional[int]
+            Player of all rows, required when the frame has no player_id column.
+
+        Returns
+        -------
+        int
+            Number of stored rows.
+        """
+        if 'player_id' not in df.columns:
+            if player_id is None:
+                raise ValueError("A player ID is required for frames without a player_id column.")
+            df = df.assign(player_id=player_id)
+        player_names = df['player_name'].astype(object) if 'player_name' in df.columns else [None] * len(df)
+        game_ids = df['game_id'].astype(object) if 'game_id' in df.columns else [None] * len(df)
+        rows = zip(
+            df['player_id'].astype('int64').tolist(),
+            [None if pd.isna(name) else name for name in player_names],
+            iso_dates(df['date']).tolist(),
+            df['season'].astype(str).tolist(),
+            df['opposing_team'].astype(str).tolist(),
+            # float32 columns widen to values like 0.47800001502, round them back like DataboxFeed does
+            *(df[column].astype(float).round(6).tolist() for column in GAME_STATS_METRICS),
+            [None if pd.isna(game_id) else str(game_id) for game_id in game_ids],
+            *(
+                [None if pd.isna(value) else value for value in df[column].astype(float).round(6).tolist()]
+                if column in df.columns else [None] * len(df)
+                for column in BOX_SCORE_COLUMNS
+            )
+        )
+        # a game appended again without game ID or box score keeps the ones stored earlier
+        updates = [f"{column} = excluded.{column}" for column in GAME_STATS_BASE_COLUMNS if column not in ('player_id', 'date')]
+        updates += [f"{column} = COALESCE(excluded.{column}, game_stats.{column})" for column in GAME_STATS_ADDED_COLUMNS]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT INTO game_stats ({', '.join(GAME_STATS_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(GAME_STATS_COLUMNS))}) "
+                f"ON CONFLICT (player_id, date) DO UPDATE SET {', '.join(updates)}",
+                rows
+            )
+        logging.info(f"History store: stored {len(df)} game logs.")
+        return len(df)
+
+    def append_commit_counts(self, df: pd.DataFrame) -> int:
+        """
+        Stores daily commit counts, days already stored for the same repository and author are replaced.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Frame with columns: date, count, repository and optionally author.
+
+        Returns
+        -------
+        int
+            Number of stored rows.
+        """
+        authors = df['author'].astype(str).tolist() if 'author' in df.columns else [''] * len(df)
+        rows = zip(df['repository'].astype(str).tolist(), authors, iso_dates(df['date']).tolist(), df['count'].astype('int64').tolist())
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO commit_counts (repository, author, date, count) VALUES (?, ?, ?, ?)",
+                rows
+            )
+        logging.info(f"History store: stored {len(df)} daily commit counts.")
+        return len(df)
+
+    def _query(self, sql: str, filters: List[tuple]) -> pd.DataFrame:
+        """
+        Runs a select with the given (condition, parameters) filters combined by AND.
+        """
+        conditions = [condition for condition, _ in filters]
+        params = [param for _, values in filters for param in values]
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            return pd.read_sql_query(sql, self._connection, params=params)
+
+    def _date_filters(self, start: Optional[str], end: Optional[str]) -> List[tuple]:
+        filters = []
+        if start is not None:
+            filters.append(("date >= ?", [start]))
+        if end is not None:
+            filters.append(("date <= ?", [end]))
+        return filters
+
+    def _in_filter(self, column: str, values: Optional[list]) -> List[tuple]:
+        if values is None:
+            return []
+        return [(f"{column} IN ({', '.join('?' * len(values))})", list(values))]
+
+    def load_game_stats(
+        self,
+        player_ids: Optional[List[int]] = None,
+        seasons: Optional[List[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Loads the stored game logs matching all given filters, ordered by player and date.
+
+        Parameters
+        ----------
+        player_ids : Optional[List[int]]
+            Players to load, all players if not given.
+        seasons : Optional[List[str]]
+            Seasons to load in the format 2023-24, all seasons if not given.
+        start : Optional[str]
+            First date to load (YYYY-MM-DD), inclusive.
+        end : Optional[str]
+            Last date to load (YYYY-MM-DD), inclusive.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with columns: player_id, player_name, date, season, opposing_team, points, rebounds, assists,
+            minutes, fg_pct, ts_pct, game_id and the box score columns (missing for games stored without them),
+            in the compact dtypes of schema_helper.GAME_STATS_SCHEMA.
+        """
+        filters = (
+            self._in_filter('player_id', player_ids)
+            + self._in_filter('season', seasons)
+            + self._date_filters(start, end)
+        )
+        df = self._query(
+            f"SELECT {', '.join(GAME_STATS_COLUMNS)} FROM game_stats",
+            filters
+        )
+        return compact_game_stats(df.sort_values(['player_id', 'date'], ignore_index=True))
+
+    def load_commit_counts(
+        self,
+        repositories: Optional[List[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        by_author: bool = False
+    ) -> pd.DataFrame:
+        """
+        Loads the stored daily commit counts matching all given filters, ordered by repository and date.
+
+        Parameters
+        ----------
+        repositories : Optional[List[str]]
+            Repositories to load, all repositories if not given.
+        start : Optional[str]
+            First date to load (YYYY-MM-DD), inclusive.
+        end : Optional[str]
+            Last date to load (YYYY-MM-DD), inclusive.
+        by_author : bool
+            Whether counts per author are loaded, otherwise counts are summed per repository and day.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with columns: date, count, repository (date, author, count, repository when by_author is set),
+            in the compact dtypes of schema_helper.COMMIT_COUNTS_SCHEMA.
+        """
+        filters = self._in_filter('repository', repositories) + self._date_filters(start, end)
+        if by_author:
+            filters.append(("author != ''", []))
+            df = self._query("SELECT date, author, count, repository FROM commit_counts", filters)
+            df = df.sort_values(['repository', 'date', 'author'], ignore_index=True)
+        else:
+            df = self._daily_totals(filters)
+        return compact_commit_counts(df)
+
+    def _daily_totals(self, filters: List[tuple]) -> pd.DataFrame:
+        """
+        Sums stored counts per repository and day. Counts per author and counts without author of the same day
+        come from differently configured runs, the higher total of the two is the more complete one.
+        """
+        df = self._query("SELECT date, author, count, repository FROM commit_counts", filters)
+        per_author = df[df['author'] != ''].groupby(['repository', 'date'], as_index=False)['count'].sum()
+        totals = df[df['author'] == ''][['repository', 'date', 'count']]
+        df = pd.concat([totals, per_author], ignore_index=True).groupby(['repository', 'date'], as_index=False)['count'].max()
+        return df[['date', 'count', 'repository']].sort_values(['repository', 'date'], ignore_index=True)
+
+    def close(self) -> None:
+        """
+        Closes the SQLite connection.
+        """
+        self._connection.close()
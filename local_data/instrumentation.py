@@ -0,0 +1,258 @@
+import os
+import json
+import time
+import bisect
+import itertools
+import cProfile
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+"""
+Run instrumentation shared by the fetchers, the Databox connector and main.
+Modules record into the module-level `instrumentation` instance, main writes the run report at the end.
+"""
+
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+METRIC_PREFIX = 'databox_nba'
+
+
+class Instrumentation:
+    """
+    Thread-safe collector of per-stage wall time, HTTP request statistics, retries and processed rows.
+
+    Attributes
+    ----------
+    profile_dir : Optional[str]
+        Directory for per-stage cProfile dumps, profiling is off if not set.
+    enabled : bool
+        Whether a run report is written. Measurements that cost extra work on the hot path, such as serializing
+        a request body only to record its size, are only taken when it is.
+    """
+
+    def __init__(self, profile_dir: Optional[str] = None, enabled: Optional[bool] = None):
+        """
+        Initializes an empty collector.
+
+        Parameters
+        ----------
+        profile_dir : Optional[str]
+            Directory for per-stage cProfile dumps, defaults to the PROFILE_DIR environment variable.
+        enabled : Optional[bool]
+            Whether a run report is written. If not given, it is whenever METRICS_REPORT_PATH or METRICS_PROM_PATH
+            is set at the time of the measurement.
+        """
+        self.profile_dir = profile_dir or os.getenv('PROFILE_DIR')
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._profile_lock = threading.Lock()
+        self._profile_sequence = itertools.count(1)
+        self.reset()
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is not None:
+            return self._enabled
+        return bool(os.getenv('METRICS_REPORT_PATH') or os.getenv('METRICS_PROM_PATH'))
+
+    @enabled.setter
+    def enabled(self, enabled: Optional[bool]) -> None:
+        self._enabled = enabled
+
+    def reset(self) -> None:
+        """
+        Drops everything recorded so far, e.g. between daemon cycles.
+        """
+        with self._lock:
+            self.started = time.time()
+            self.stages: Dict[str, dict] = {}
+            self.requests: Dict[str, dict] = {}
+            self.retries: Dict[str, int] = {}
+            self.rows: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Context manager measuring the wall time of a stage. Stages with the same name are summed up.
+        With a profile directory the stage is profiled with cProfile, unless another stage is already profiled
+        (cProfile cannot nest, so stages running inside a profiled stage only show up in its dump).
+        Every dump is written to its own {name}.{pid}.{sequence}.prof file, so repeated stages and daemon cycles
+        do not overwrite earlier dumps.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage, e.g. nba.fetch.
+        """
+        profiler = None
+        if self.profile_dir and self._profile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                os.makedirs(self.profile_dir, exist_ok=True)
+                dump_name = f"{name}.{os.getpid()}.{next(self._profile_sequence):04d}.prof"
+                profiler.dump_stats(os.path.join(self.profile_dir, dump_name))
+                self._profile_lock.release()
+            with self._lock:
+                stage = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0})
+                stage['calls'] += 1
+                stage['seconds'] += seconds
+
+    def record_request(
+        self,
+        service: str,
+        seconds: float,
+        response_bytes: int = 0,
+        error: bool = False,
+        request_bytes: int = 0
+    ) -> None:
+        """
+        Records one HTTP request.
+
+        Parameters
+        ----------
+        service : str
+            Remote service, e.g. github, nba or databox.
+        seconds : float
+            Latency of the request.
+        response_bytes : int
+            Bytes received in the response body.
+        error : bool
+            Whether the request failed.
+        request_bytes : int
+            Bytes sent in the request body.
+        """
+        with self._lock:
+            stats = self.requests.setdefault(service, {
+                'count': 0, 'errors': 0, 'request_bytes': 0, 'response_bytes': 0, 'seconds': 0.0,
+                'buckets': [0] * (len(LATENCY_BUCKETS) + 1)
+            })
+            stats['count'] += 1
+            stats['errors'] += int(error)
+            stats['request_bytes'] += request_bytes
+            stats['response_bytes'] += response_bytes
+            stats['seconds'] += seconds
+            stats['buckets'][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    @contextmanager
+    def request(self, service: str) -> Iterator[dict]:
+        """
+        Context manager timing one HTTP request. The caller may set the 'request_bytes', 'response_bytes' and 'error'
+        keys of the yielded dict, requests raising an exception are always counted as errors.
+
+        Parameters
+        ----------
+        service : str
+            Remote service, e.g. github, nba or databox.
+        """
+        details = {'request_bytes': 0, 'response_bytes': 0, 'error': False}
+        start = time.perf_counter()
+        try:
+            yield details
+        except Exception:
+            details['error'] = True
+            raise
+        finally:
+            self.record_request(
+                service, time.perf_counter() - start, details['response_bytes'], details['error'], details['request_bytes']
+            )
+
+    def record_retry(self, service: str) -> None:
+        """
+        Records one retried request.
+        """
+        with self._lock:
+            self.retries[service] = self.retries.get(service, 0) + 1
+
+    def record_rows(self, stage: str, rows: int) -> None:
+        """
+        Records rows processed by a stage.
+        """
+        with self._lock:
+            self.rows[stage] = self.rows.get(stage, 0) + rows
+
+    def report(self) -> dict:
+        """
+        Returns everything recorded as a JSON-serializable dict.
+        """
+        with self._lock:
+            requests = {}
+            for service, stats in self.requests.items():
+                histogram = dict(zip([str(bound) for bound in LATENCY_BUCKETS] + ['+Inf'], stats['buckets']))
+                requests[service] = {
+                    'count': stats['count'],
+                    'errors': stats['errors'],
+                    'request_bytes': stats['request_bytes'],
+                    'response_bytes': stats['response_bytes'],
+                    'seconds': round(stats['seconds'], 6),
+                    'latency_histogram': histogram
+                }
+            return {
+                'started': self.started,
+                'duration_seconds': round(time.time() - self.started, 6),
+                'stages': {name: {'calls': s['calls'], 'seconds': round(s['seconds'], 6)} for name, s in self.stages.items()},
+                'requests': requests,
+                'retries': dict(self.retries),
+                'rows': dict(self.rows)
+            }
+
+    def write_json(self, path: str) -> None:
+        """
+        Writes the run report as JSON.
+        """
+        with open(path, 'w') as report_file:
+            json.dump(self.report(), report_file, indent=2)
+        logging.info(f"Wrote run report to {path}.")
+
+    def prometheus_text(self) -> str:
+        """
+        Returns the run report in the Prometheus text exposition format (for the node exporter textfile collector).
+        """
+        report = self.report()
+        lines = [
+            f'# TYPE {METRIC_PREFIX}_stage_seconds gauge',
+            *[f'{METRIC_PREFIX}_stage_seconds{{stage="{name}"}} {stage["seconds"]}' for name, stage in report['stages'].items()],
+            f'# TYPE {METRIC_PREFIX}_http_requests_total counter',
+            *[f'{METRIC_PREFIX}_http_requests_total{{service="{service}"}} {stats["count"]}' for service, stats in report['requests'].items()],
+            f'# TYPE {METRIC_PREFIX}_http_request_errors_total counter',
+            *[f'{METRIC_PREFIX}_http_request_errors_total{{service="{service}"}} {stats["errors"]}' for service, stats in report['requests'].items()],
+            f'# TYPE {METRIC_PREFIX}_http_request_bytes_total counter',
+            *[f'{METRIC_PREFIX}_http_request_bytes_total{{service="{service}"}} {stats["request_bytes"]}' for service, stats in report['requests'].items()],
+            f'# TYPE {METRIC_PREFIX}_http_response_bytes_total counter',
+            *[f'{METRIC_PREFIX}_http_response_bytes_total{{service="{service}"}} {stats["response_bytes"]}' for service, stats in report['requests'].items()],
+            f'# TYPE {METRIC_PREFIX}_http_request_duration_seconds histogram',
+        ]
+        for service, stats in report['requests'].items():
+            cumulative = 0
+            for bound, count in stats['latency_histogram'].items():
+                cumulative += count
+                lines.append(f'{METRIC_PREFIX}_http_request_duration_seconds_bucket{{service="{service}",le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_PREFIX}_http_request_duration_seconds_sum{{service="{service}"}} {stats["seconds"]}')
+            lines.append(f'{METRIC_PREFIX}_http_request_duration_seconds_count{{service="{service}"}} {stats["count"]}')
+        lines.append(f'# TYPE {METRIC_PREFIX}_retries_total counter')
+        lines.extend(f'{METRIC_PREFIX}_retries_total{{service="{service}"}} {count}' for service, count in report['retries'].items())
+        lines.append(f'# TYPE {METRIC_PREFIX}_rows_total counter')
+        lines.extend(f'{METRIC_PREFIX}_rows_total{{stage="{stage}"}} {count}' for stage, count in report['rows'].items())
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Atomically writes the Prometheus text file.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as metrics_file:
+            metrics_file.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+        logging.info(f"Wrote Prometheus metrics to {path}.")
+
+
+instrumentation = Instrumentation()
@@ -1,28 +1,295 @@
+import os
 import logging
+import argparse
+import threading
+from datetime import date
+from typing import Iterator, List, Optional, Union
+
+import pandas as pd
 
 from databox_connector import DataboxFeed
 from nba_helper import StatsFetcher
-from github_helper import GitHubFetcher
+from sharded_ingestion import ShardedGameStatsFetcher
+from github_helper import GitHubFetcher, MultiRepoFetcher
+from pipeline import StreamingPipeline
+from scheduler import Scheduler
+from instrumentation import instrumentation
+from history_store import HistoryStore
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 """
-Main script that does nothing but combines all scripts. 
+Main script that does nothing but combines all scripts.
 Workflow:
 ---------
 
 Initializes the StatsFetcher and GitHubFetcher classes, fetches the data, and sends it to Databox.
+With --streaming the data is pushed chunk by chunk (per season, per page) while the rest is still being fetched.
+With --daemon the process keeps running and exports every source on its own interval, reusing warm clients.
+With HISTORY_DB_PATH set every fetched frame is also appended to the local history store, --from-history pushes
+the stored history without fetching anything (e.g. to backfill a new dashboard, together with --full-resync).
+--sources limits a run to some of the sources, heavy client libraries are only imported by the sources using them.
+NBA_SHARD_PROCESSES > 0 fetches and transforms the seasons in that many worker processes instead of threads.
+NBA_PLAYER_IDS exports several players from one LeagueGameLog request per season, each under its own metric keys.
+METRICS_REPORT_PATH and METRICS_PROM_PATH export the run's stage timings and request statistics, PROFILE_DIR adds cProfile dumps.
 """
 
+SOURCES = ('nba', 'github')
+
+
+def create_commit_fetcher() -> Union[GitHubFetcher, MultiRepoFetcher]:
+    """
+    Creates the multi-repository fetcher when GITHUB_REPOSITORIES or GITHUB_ORG is set, the single repository one otherwise.
+    """
+    if os.getenv('GITHUB_REPOSITORIES') or os.getenv('GITHUB_ORG'):
+        repositories = [repo.strip() for repo in os.getenv('GITHUB_REPOSITORIES', '').split(',') if repo.strip()]
+        return MultiRepoFetcher(
+            repositories=repositories,
+            org=os.getenv('GITHUB_ORG'),
+            page_workers=int(os.getenv('GITHUB_PAGE_WORKERS', '4')),
+            state_dir=os.getenv('GITHUB_STATE_DIR')
+        )
+    return GitHubFetcher(page_workers=int(os.getenv('GITHUB_PAGE_WORKERS', '4')))
+
+
+def create_history_store() -> Optional[HistoryStore]:
+    """
+    Opens the history store when HISTORY_DB_PATH is set.
+    """
+    if os.getenv('HISTORY_DB_PATH'):
+        return HistoryStore(os.getenv('HISTORY_DB_PATH'))
+    return None
+
+
+def store_game_stats(history_store: Optional[HistoryStore], stats_fetcher: StatsFetcher, df: pd.DataFrame) -> pd.DataFrame:
+    if history_store is not None:
+        history_store.append_game_stats(df, player_id=stats_fetcher.player_id)
+    return df
+
+
+def store_commit_counts(history_store: Optional[HistoryStore], df: pd.DataFrame) -> pd.DataFrame:
+    if history_store is not None:
+        history_store.append_commit_counts(df)
+    return df
+
+
+def nba_player_ids() -> Optional[List[int]]:
+    """
+    Parses the comma separated NBA_PLAYER_IDS, None when the variable is not set (single player mode).
+    """
+    player_ids = [int(player_id) for player_id in os.getenv('NBA_PLAYER_IDS', '').split(',') if player_id.strip()]
+    return player_ids or None
+
+
+def fetch_game_stats(stats_fetcher: StatsFetcher) -> pd.DataFrame:
+    player_ids = nba_player_ids()
+    processes = int(os.getenv('NBA_SHARD_PROCESSES', '0'))
+    if processes > 0:
+        # the pool shares the fetcher's request rate instead of every process sending at it
+        rate = stats_fetcher.rate_limiter.rate if stats_fetcher.rate_limiter is not None else 1.0
+        sharded_fetcher = ShardedGameStatsFetcher(
+            player_ids or [stats_fetcher.player_id], stats_fetcher.seasons, processes=processes, rate=rate
+        )
+        return sharded_fetcher.fetch_all_game_stats()
+    if player_ids is not None:
+        # one LeagueGameLog request per season, however many players are exported
+        return stats_fetcher.fetch_league_game_stats(player_ids)
+    return stats_fetcher.fetch_all_game_stats()
+
+
+def iter_game_stats(stats_fetcher: StatsFetcher) -> Iterator[pd.DataFrame]:
+    if nba_player_ids() is not None:
+        # the league game log of a season holds every player, there are no per-player chunks to stream
+        return iter([fetch_game_stats(stats_fetcher)])
+    return stats_fetcher.iter_game_stats()
+
+
+def fetch_commits(commit_fetcher: Union[GitHubFetcher, MultiRepoFetcher]) -> pd.DataFrame:
+    if isinstance(commit_fetcher, GitHubFetcher) and commit_fetcher.state_path:
+        return commit_fetcher.fetch_incremental()
+    return commit_fetcher.fetch_all_commits()
+
+
+def iter_commit_chunks(commit_fetcher: Union[GitHubFetcher, MultiRepoFetcher]) -> Iterator[pd.DataFrame]:
+    if isinstance(commit_fetcher, MultiRepoFetcher):
+        return commit_fetcher.iter_repository_frames()
+    if commit_fetcher.state_path:
+        # an incremental sync is a single cheap request, there is nothing to stream
+        return iter([commit_fetcher.fetch_incremental()])
+    return commit_fetcher.iter_daily_count_chunks()
+
+
+def parse_sources(value: str) -> List[str]:
+    """
+    Parses the comma separated --sources value.
+    """
+    sources = [source.strip() for source in value.split(',') if source.strip()]
+    unknown = set(sources) - set(SOURCES)
+    if not sources or unknown:
+        raise argparse.ArgumentTypeError(f"Sources must be a comma separated subset of {', '.join(SOURCES)}.")
+    return sources
+
+
+def run_batch(
+    stats_fetcher: Optional[StatsFetcher],
+    commit_fetcher: Optional[Union[GitHubFetcher, MultiRepoFetcher]],
+    databox_feed: DataboxFeed,
+    history_store: Optional[HistoryStore] = None
+) -> None:
+    if stats_fetcher is not None:
+        with instrumentation.stage('nba.fetch'):
+            luka_game_stats_df = store_game_stats(history_store, stats_fetcher, fetch_game_stats(stats_fetcher))
+        logging.info("Fetched all game stats for Luka Dončić.")
+        with instrumentation.stage('databox.push_nba'):
+            databox_feed.send_data_nba(luka_game_stats_df)
+    if commit_fetcher is not None:
+        with instrumentation.stage('github.fetch'):
+            my_commits_df = store_commit_counts(history_store, fetch_commits(commit_fetcher))
+        with instrumentation.stage('databox.push_github'):
+            databox_feed.send_data_github(my_commits_df)
+
+
+def run_streaming(
+    stats_fetcher: Optional[StatsFetcher],
+    commit_fetcher: Optional[Union[GitHubFetcher, MultiRepoFetcher]],
+    databox_feed: DataboxFeed,
+    history_store: Optional[HistoryStore] = None
+) -> None:
+    pipeline = StreamingPipeline(queue_size=int(os.getenv('PIPELINE_QUEUE_SIZE', '4')))
+    if stats_fetcher is not None:
+        pipeline.add_source(
+            'nba',
+            lambda: iter_game_stats(stats_fetcher),
+            lambda df: databox_feed.send_data_nba(store_game_stats(history_store, stats_fetcher, df))
+        )
+    if commit_fetcher is not None:
+        pipeline.add_source(
+            'github',
+            lambda: iter_commit_chunks(commit_fetcher),
+            lambda df: databox_feed.send_data_github(store_commit_counts(history_store, df))
+        )
+    with instrumentation.stage('pipeline'):
+        summary = pipeline.run()
+    for name, source_summary in summary.items():
+        logging.info(f"Source {name}: {source_summary}")
+
+
+def run_backfill(
+    history_store: HistoryStore,
+    databox_feed: DataboxFeed,
+    player_ids: Optional[List[int]],
+    commits: bool = True
+) -> None:
+    """
+    Pushes the stored game logs of the players (if given) and all stored commit counts (if requested) without fetching.
+    """
+    if player_ids:
+        with instrumentation.stage('history.load'):
+            game_stats = history_store.load_game_stats(player_ids=player_ids)
+        logging.info(f"Loaded {len(game_stats)} game logs from the history store.")
+        with instrumentation.stage('databox.push_nba'):
+            databox_feed.send_data_nba(game_stats)
+    if commits:
+        with instrumentation.stage('history.load'):
+            commit_counts = history_store.load_commit_counts()
+        logging.info(f"Loaded {len(commit_counts)} daily commit counts from the history store.")
+        with instrumentation.stage('databox.push_github'):
+            databox_feed.send_data_github(commit_counts)
+
+
+def is_nba_season_active(today: date = None) -> bool:
+    """
+    Returns False in July, August and September, when no NBA games are played.
+    This is a calendar check of the off-season months, not of the game schedule: during the season the job
+    also runs on days without games, with NBA_CACHE_DIR set those cycles only refetch the current season.
+    """
+    today = today or date.today()
+    return today.month not in (7, 8, 9)
+
+
+def write_run_report() -> None:
+    """
+    Writes the collected instrumentation as JSON and/or as a Prometheus text file, if the paths are configured.
+    """
+    if os.getenv('METRICS_REPORT_PATH'):
+        instrumentation.write_json(os.getenv('METRICS_REPORT_PATH'))
+    if os.getenv('METRICS_PROM_PATH'):
+        instrumentation.write_prometheus(os.getenv('METRICS_PROM_PATH'))
+
+
+def run_daemon(
+    stats_fetcher: Optional[StatsFetcher],
+    commit_fetcher: Optional[Union[GitHubFetcher, MultiRepoFetcher]],
+    databox_feed: DataboxFeed,
+    history_store: Optional[HistoryStore] = None
+) -> None:
+    scheduler = Scheduler()
+    replay_lock = threading.Lock()
+
+    def replay_spool() -> None:
+        # jobs run on their own threads, the lock keeps two replays from delivering the same spooled chunk
+        with replay_lock:
+            databox_feed.replay_spool()
+
+    def push_nba() -> None:
+        # deliver what failed in earlier cycles before pushing newer values for the same dates
+        replay_spool()
+        databox_feed.send_data_nba(store_game_stats(history_store, stats_fetcher, fetch_game_stats(stats_fetcher)))
+
+    def push_github() -> None:
+        replay_spool()
+        databox_feed.send_data_github(store_commit_counts(history_store, fetch_commits(commit_fetcher)))
+
+    if stats_fetcher is not None:
+        scheduler.add_job('nba', float(os.getenv('NBA_INTERVAL', '3600')), push_nba, should_run=is_nba_season_active)
+    if commit_fetcher is not None:
+        scheduler.add_job('github', float(os.getenv('GITHUB_INTERVAL', '300')), push_github)
+    # also drains the spool while no source job runs, e.g. in the NBA off-season
+    scheduler.add_job('spool', float(os.getenv('SPOOL_INTERVAL', '300')), replay_spool)
+    # counters are cumulative over the lifetime of the daemon, like Prometheus counters
+    scheduler.add_job('metrics', float(os.getenv('METRICS_INTERVAL', '60')), write_run_report)
+    scheduler.install_signal_handlers()
+    scheduler.run_forever()
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export NBA and GitHub stats to Databox.")
+    parser.add_argument('--streaming', action='store_true', help="push chunks while fetching is still in progress")
+    parser.add_argument('--daemon', action='store_true', help="keep running and export every source on its own interval")
+    parser.add_argument('--full-resync', action='store_true', help="push every datapoint, even if the push ledger shows it unchanged")
+    parser.add_argument('--from-history', action='store_true', help="push the local history store (HISTORY_DB_PATH) without fetching")
+    parser.add_argument(
+        '--sources', type=parse_sources, default=list(SOURCES),
+        help="comma separated sources to export (default: nba,github), nba_api is only loaded for nba"
+    )
+    args = parser.parse_args()
+
     logging.info("Started data export to Databox.")
-    stats_fetcher = StatsFetcher()
-    luka_game_stats_df = stats_fetcher.fetch_all_game_stats()
-    commti_fetcher = GitHubFetcher()
-    my_commits_df = commti_fetcher.fetch_all_commits()
-
-    logging.info("Fetched all game stats for Luka Dončić.")
-    databox_feed = DataboxFeed()
-    databox_feed.send_data_nba(luka_game_stats_df)
-    databox_feed.send_data_github(my_commits_df)
+    history_store = create_history_store()
+    if args.from_history and history_store is None:
+        parser.error("--from-history requires HISTORY_DB_PATH to be set.")
+    databox_feed = DataboxFeed(
+        max_workers=int(os.getenv('DATABOX_MAX_WORKERS', '1')),
+        force_full_resync=args.full_resync,
+        nba_push_mode=os.getenv('NBA_PUSH_MODE', 'raw'),
+        rollup_window=int(os.getenv('ROLLUP_WINDOW', '10')),
+        transport=os.getenv('DATABOX_TRANSPORT', 'sdk'),
+        per_player_keys=nba_player_ids() is not None
+    )
+    # deliver what failed in earlier runs before pushing newer values for the same dates
+    with instrumentation.stage('databox.replay_spool'):
+        databox_feed.replay_spool()
+    stats_fetcher = StatsFetcher(max_workers=int(os.getenv('NBA_MAX_WORKERS', '1'))) if 'nba' in args.sources else None
+    if args.from_history:
+        player_ids = (nba_player_ids() or [stats_fetcher.player_id]) if stats_fetcher else None
+        run_backfill(history_store, databox_feed, player_ids, 'github' in args.sources)
+    else:
+        commti_fetcher = create_commit_fetcher() if 'github' in args.sources else None
+        if args.daemon:
+            run_daemon(stats_fetcher, commti_fetcher, databox_feed, history_store)
+        elif args.streaming:
+            run_streaming(stats_fetcher, commti_fetcher, databox_feed, history_store)
+        else:
+            run_batch(stats_fetcher, commti_fetcher, databox_feed, history_store)
+    write_run_report()
     logging.info("Data export to Databox completed.")
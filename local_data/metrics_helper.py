@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+from typing import Collection, Optional, Union
+
+"""
+Vectorized basketball metrics computed over whole columns.
+Every function accepts pandas Series or NumPy arrays and returns a Series aligned with the first argument
+when it is a Series, otherwise a NumPy array. Zero denominators never raise or produce inf, they yield 0.0.
+"""
+
+ArrayLike = Union[pd.Series, np.ndarray]
+
+DERIVED_METRICS = ('FG%', 'eFG%', 'TS%', 'PPS', 'AST/TOV', 'USG/MIN', 'team', 'opposing_team', 'is_home')
+MATCHUP_PATTERN = r'^(?:(?P<team>\S+)\s+(?P<venue>vs\.|@)\s+)?(?P<opponent>\S+)\s*$'
+
+
+def _like(values: np.ndarray, template: ArrayLike) -> ArrayLike:
+    if isinstance(template, pd.Series):
+        return pd.Series(values, index=template.index)
+    return values
+
+
+def safe_divide(numerator: ArrayLike, denominator: ArrayLike, fill: float = 0.0) -> ArrayLike:
+    """
+    Divides element-wise, using `fill` wherever the denominator is zero.
+
+    Parameters
+    ----------
+    numerator : ArrayLike
+        Dividend values.
+    denominator : ArrayLike
+        Divisor values.
+    fill : float
+        Result used for zero denominators.
+
+    Returns
+    -------
+    ArrayLike
+        Quotients as floats.
+    """
+    num = np.asarray(numerator, dtype=float)
+    den = np.asarray(denominator, dtype=float)
+    out = np.full(np.broadcast(num, den).shape, fill, dtype=float)
+    np.divide(num, den, out=out, where=den != 0)
+    return _like(out, numerator)
+
+
+def field_goal_pct(fgm: ArrayLike, fga: ArrayLike) -> ArrayLike:
+    """
+    Field goal percentage: FGM / FGA.
+    """
+    return safe_divide(fgm, fga)
+
+
+def effective_fg_pct(fgm: ArrayLike, fg3m: ArrayLike, fga: ArrayLike) -> ArrayLike:
+    """
+    Effective field goal percentage, weighting made threes by 1.5: (FGM + 0.5 * FG3M) / FGA.
+    """
+    made = np.asarray(fgm, dtype=float) + 0.5 * np.asarray(fg3m, dtype=float)
+    return _like(safe_divide(made, fga), fgm)
+
+
+def true_shooting_pct(pts: ArrayLike, fga: ArrayLike, fta: ArrayLike) -> ArrayLike:
+    """
+    True shooting percentage: PTS / (2 * (FGA + 0.44 * FTA)).
+    """
+    attempts = 2 * (np.asarray(fga, dtype=float) + 0.44 * np.asarray(fta, dtype=float))
+    return safe_divide(pts, attempts)
+
+
+def possessions_used(fga: ArrayLike, fta: ArrayLike, tov: ArrayLike) -> ArrayLike:
+    """
+    Possessions finished by the player: FGA + 0.44 * FTA + TOV.
+    """
+    values = np.asarray(fga, dtype=float) + 0.44 * np.asarray(fta, dtype=float) + np.asarray(tov, dtype=float)
+    return _like(values, fga)
+
+
+def usage_per_minute(fga: ArrayLike, fta: ArrayLike, tov: ArrayLike, minutes: ArrayLike) -> ArrayLike:
+    """
+    Usage-style ratio that needs no team totals: possessions used per minute played.
+    """
+    return safe_divide(possessions_used(fga, fta, tov), minutes)
+
+
+def assist_to_turnover(ast: ArrayLike, tov: ArrayLike) -> ArrayLike:
+    """
+    Assist to turnover ratio: AST / TOV.
+    """
+    return safe_divide(ast, tov)
+
+
+def points_per_shot(pts: ArrayLike, fga: ArrayLike) -> ArrayLike:
+    """
+    Points per field goal attempt: PTS / FGA.
+    """
+    return safe_divide(pts, fga)
+
+
+def parse_matchup(matchup: pd.Series) -> pd.DataFrame:
+    """
+    Splits NBA API matchup strings such as "DAL vs. LAC" (home game) or "DAL @ LAC" (away game).
+
+    Parameters
+    ----------
+    matchup : pd.Series
+        MATCHUP column of a game log.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: team, opponent, is_home. Matchups without a venue marker keep their
+        last token as the opponent and get a missing team and is_home.
+    """
+    # a season has only a few hundred distinct matchups, so only the unique values are parsed
+    codes, uniques = pd.factorize(matchup.astype(str))
+    parts = pd.Series(uniques).str.extract(MATCHUP_PATTERN)
+    parts['is_home'] = parts['venue'].map({'vs.': True, '@': False}).astype('boolean')
+    return parts[['team', 'opponent', 'is_home']].take(codes).set_axis(matchup.index)
+
+
+def add_derived_metrics(game_logs: pd.DataFrame, metrics: Optional[Collection[str]] = None) -> pd.DataFrame:
+    """
+    Adds derived metrics to a raw NBA API game log in one vectorized pass.
+    Metrics whose source columns are missing are skipped.
+
+    Parameters
+    ----------
+    game_logs : pd.DataFrame
+        Raw game log with the NBA API box score columns (PTS, FGM, FGA, FG3M, FTA, TOV, AST, MIN, MATCHUP).
+    metrics : Optional[Collection[str]]
+        Names of the added columns to compute, all of them if not given.
+
+    Returns
+    -------
+    pd.DataFrame
+        Copy of the game log with the added columns: FG%, eFG%, TS%, PPS, AST/TOV, USG/MIN, team, opposing_team, is_home,
+        or only those of them listed in metrics.
+    """
+    game_logs = game_logs.copy()
+    columns = set(game_logs.columns)
+    wanted = set(DERIVED_METRICS if metrics is None else metrics)
+    if 'FG%' in wanted and {'FGM', 'FGA'} <= columns:
+        game_logs['FG%'] = field_goal_pct(game_logs['FGM'], game_logs['FGA'])
+    if 'eFG%' in wanted and {'FGM', 'FG3M', 'FGA'} <= columns:
+        game_logs['eFG%'] = effective_fg_pct(game_logs['FGM'], game_logs['FG3M'], game_logs['FGA'])
+    if 'TS%' in wanted and {'PTS', 'FGA', 'FTA'} <= columns:
+        game_logs['TS%'] = true_shooting_pct(game_logs['PTS'], game_logs['FGA'], game_logs['FTA'])
+    if 'PPS' in wanted and {'PTS', 'FGA'} <= columns:
+        game_logs['PPS'] = points_per_shot(game_logs['PTS'], game_logs['FGA'])
+    if 'AST/TOV' in wanted and {'AST', 'TOV'} <= columns:
+        game_logs['AST/TOV'] = assist_to_turnover(game_logs['AST'], game_logs['TOV'])
+    if 'USG/MIN' in wanted and {'FGA', 'FTA', 'TOV', 'MIN'} <= columns:
+        game_logs['USG/MIN'] = usage_per_minute(game_logs['FGA'], game_logs['FTA'], game_logs['TOV'], game_logs['MIN'])
+    matchup_columns = [column for column in ('team', 'opposing_team', 'is_home') if column in wanted]
+    if matchup_columns and 'MATCHUP' in columns:
+        matchup = parse_matchup(game_logs['MATCHUP']).rename(columns={'opponent': 'opposing_team'})
+        for column in matchup_columns:
+            game_logs[column] = matchup[column]
+    return game_logs
@@ -1,11 +1,84 @@
+import os
+import importlib
 import pandas as pd
-from nba_api.stats.endpoints import playergamelog
-from nba_api.stats.static import players
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+from cache_helper import GameLogCache, BoxScoreCache
+from metrics_helper import add_derived_metrics
+from rate_limiter import TokenBucket, rate_limits
+from instrumentation import instrumentation
+from schema_helper import BOX_SCORE_COLUMNS, compact_game_stats
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# nba_api is imported inside the functions using it, its endpoints and static player tables are the slowest
+# imports of runs that do not fetch NBA stats at all
+NBA_API_MODULES = (
+    'nba_api.stats.endpoints.playergamelog',
+    'nba_api.stats.endpoints.leaguegamelog',
+    'nba_api.stats.static.players',
+    'nba_api.stats.library.http',
+    'nba_api.stats.endpoints.boxscoreadvancedv2',
+    'nba_api.stats.endpoints.boxscoretraditionalv2'
+)
+BOX_SCORE_ADVANCED_COLUMNS = {
+    'OFF_RATING': 'off_rating',
+    'DEF_RATING': 'def_rating',
+    'NET_RATING': 'net_rating',
+    'USG_PCT': 'usg_pct',
+    'PACE': 'pace',
+    'PIE': 'pie'
+}
+# derived metrics kept by the game log transform
+EXPORTED_DERIVED_METRICS = ('FG%', 'TS%', 'opposing_team')
+QUARTERS = 4
+# NBA API time ranges are given in tenths of a second, a quarter lasts 12 minutes
+QUARTER_TENTHS = 7200
+
+
+def _load_nba_api() -> None:
+    """
+    Imports all nba_api modules the fetchers use, so worker threads never run the first, slow import concurrently.
+    """
+    for module in NBA_API_MODULES:
+        importlib.import_module(module)
+
+
+def _response_status(endpoint) -> Optional[int]:
+    """
+    Returns the HTTP status of an NBA API endpoint's response, None if it is not available.
+    """
+    status = getattr(getattr(endpoint, 'nba_response', None), '_status_code', None)
+    return status if isinstance(status, int) else None
+
+
+def _response_size(endpoint) -> int:
+    """
+    Returns the size of the raw response body of an NBA API endpoint, 0 if it is not available.
+    """
+    try:
+        return len(endpoint.nba_response.get_response())
+    except (AttributeError, TypeError):
+        return 0
+
+
+def _request_endpoint(create: Callable[[], object]):
+    """
+    Creates (and thereby requests) an NBA API endpoint through the adaptive rate limiter of the stats host,
+    recording the request in the run instrumentation.
+    """
+    from nba_api.stats.library.http import NBAStatsHTTP
+
+    with rate_limits.for_url(NBAStatsHTTP.base_url).request() as feedback, \
+            instrumentation.request('nba') as details:
+        endpoint = create()
+        feedback['status'] = _response_status(endpoint)
+        details['response_bytes'] = _response_size(endpoint)
+    return endpoint
+
+
 class StatsFetcher:
     """
     A class to fetch and calculate game-by-game statistics for Luka Dončić.
@@ -17,14 +90,68 @@ class StatsFetcher:
     -------
     fetch_all_game_stats() -> pd.DataFrame:
         Fetches and returns a DataFrame with game-by-game stats for Luka Dončić.
+    iter_game_stats() -> Iterator[pd.DataFrame]:
+        Yields the game stats season by season as soon as each season is fetched.
+    fetch_league_game_stats(player_ids: Optional[List[int]] = None) -> pd.DataFrame:
+        Fetches game-by-game stats of every player in the league with one request per season.
+    split_by_player(df: pd.DataFrame) -> Dict[int, pd.DataFrame]:
+        Splits a league-wide frame into one frame per player.
     """
 
-    def __init__(self):
+    LEAGUE_CACHE_KEY = 'league'
+
+    def __init__(
+        self,
+        cache: Optional[GameLogCache] = None,
+        max_workers: int = 1,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_retries: int = 2,
+        request_timeout: int = 30,
+        box_score_fetcher: Optional['BoxScoreFetcher'] = None
+    ):
         """
         Initializes the StatsFetcher class by identifying Luka Dončić and setting the seasons range.
+
+        Parameters
+        ----------
+        cache : Optional[GameLogCache]
+            Cache for raw game logs. If not given, a cache is created when NBA_CACHE_DIR is set
+            (NBA_CACHE_TTL sets the TTL of the current season in seconds), otherwise nothing is cached.
+        max_workers : int
+            Number of seasons fetched at once. The default of 1 fetches sequentially.
+        rate_limiter : Optional[TokenBucket]
+            Limiter shared by all NBA API requests. When fetching in parallel without one,
+            a bucket allowing one request per second is used. Independently of it, requests go through the
+            adaptive limiter of the stats host, which lowers the concurrency when requests time out or are throttled.
+        max_retries : int
+            Number of times a failed season is fetched again before it is skipped.
+        request_timeout : int
+            Timeout in seconds of a single NBA API request.
+        box_score_fetcher : Optional[BoxScoreFetcher]
+            Joins per-game box score details into the fetched game stats. If not given, one sharing rate_limiter
+            is created when NBA_BOX_SCORES is set to 1 (NBA_BOX_SCORE_WORKERS sets its number of workers),
+            otherwise game stats are not enriched.
         """
+        if max_workers < 1:
+            raise ValueError("Max workers must be a positive integer.")
+        _load_nba_api()
         self.player_id = self._get_player_id('Luka Doncic')
         self.seasons = ['2018-19', '2019-20', '2020-21', '2021-22', '2022-23', '2023-24', '2024-25']
+        if cache is None and os.getenv('NBA_CACHE_DIR'):
+            cache = GameLogCache(os.getenv('NBA_CACHE_DIR'), float(os.getenv('NBA_CACHE_TTL', '3600')))
+        self.cache = cache
+        self.max_workers = max_workers
+        if rate_limiter is None and max_workers > 1:
+            rate_limiter = TokenBucket(rate=1.0)
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.request_timeout = request_timeout
+        if box_score_fetcher is None and os.getenv('NBA_BOX_SCORES') == '1':
+            # box score requests go to the same host, so they share the game log requests' limit
+            box_score_fetcher = BoxScoreFetcher(
+                max_workers=int(os.getenv('NBA_BOX_SCORE_WORKERS', '4')), rate_limiter=self.rate_limiter
+            )
+        self.box_score_fetcher = box_score_fetcher
 
     def _get_player_id(self, player_name: str) -> int:
         """
@@ -40,66 +167,299 @@ class StatsFetcher:
         int
             The player's ID.
         """
+        from nba_api.stats.static import players
+
         player = players.find_players_by_full_name(player_name)[0]
         return player['id']
 
-    def _calculate_ts(self, pts: int, fga: int, fta: int) -> float:
+    def fetch_all_game_stats(self) -> pd.DataFrame:
         """
-        Calculates the True Shooting Percentage (TS%) for given points, field goal attempts, and free throw attempts.
+        Fetches Luka Dončić's game stats for each game from 2018-19 to 2023-24.
 
         Parameters
         ----------
-        pts : int
-            The total points scored.
-        fga : int
-            The total field goal attempts.
-        fta : int   
-            The total free throw attempts.
+        None
 
         Returns
         -------
-        float
-            The True Shooting Percentage (TS%).
+        pd.DataFrame
+            DataFrame with columns: game_id, date, points, rebounds, assists, minutes, fg_pct, ts_pct, opposing_team,
+            season and the box score columns when enriched, in the compact dtypes of schema_helper.GAME_STATS_SCHEMA.
         """
-        return pts / (2 * (fga + 0.44 * fta)) if fga + 0.44 * fta > 0 else 0.0
+        season_logs = self._fetch_seasons(self._fetch_season_game_log, self.seasons)
+        all_game_stats: List[pd.DataFrame] = [
+            self._transform_game_log(game_logs, season) for season, game_logs in season_logs.items()
+        ]
+        if not all_game_stats:
+            raise RuntimeError("No game stats could be fetched for any season.")
 
-    def fetch_all_game_stats(self) -> pd.DataFrame:
+        combined_game_stats = pd.concat(all_game_stats, ignore_index=True)
+        combined_game_stats = self.parse_game_dates(combined_game_stats)
+        combined_game_stats = self.lower_precision_floats(combined_game_stats)
+        return self._enrich(compact_game_stats(combined_game_stats), self.player_id)
+
+    def iter_game_stats(self) -> Iterator[pd.DataFrame]:
         """
-        Fetches Luka Dončić's game stats for each game from 2018-19 to 2023-24.
+        Yields Luka Dončić's game stats one season at a time, so they can be pushed while later seasons are fetched.
+        Seasons are fetched in batches of max_workers seasons, failed seasons are retried and skipped like in
+        fetch_all_game_stats.
 
         Parameters
         ----------
         None
 
+        Returns
+        -------
+        Iterator[pd.DataFrame]
+            One DataFrame per season with columns: game_id, date, points, rebounds, assists, minutes, fg_pct, ts_pct,
+            opposing_team, season and the box score columns when enriched.
+        """
+        for start in range(0, len(self.seasons), self.max_workers):
+            batch = self.seasons[start:start + self.max_workers]
+            for season, game_logs in self._fetch_seasons(self._fetch_season_game_log, batch).items():
+                game_stats = self._transform_game_log(game_logs, season).reset_index(drop=True)
+                game_stats = self.parse_game_dates(game_stats)
+                yield self._enrich(compact_game_stats(self.lower_precision_floats(game_stats)), self.player_id)
+
+    def fetch_season_game_stats(self, season: str, player_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Fetches and transforms the game stats of one player and season, without retries.
+
+        Parameters
+        ----------
+        season : str
+            Season in NBA API format, e.g. 2023-24.
+        player_id : Optional[int]
+            Player whose game stats are fetched, defaults to Luka Dončić.
+
         Returns
         -------
         pd.DataFrame
-            DataFrame with columns: date, points, rebounds, assists, minutes, fg_pct, ts_pct, opposing_team, season.
+            DataFrame with columns: game_id, date, points, rebounds, assists, minutes, fg_pct, ts_pct, opposing_team,
+            season and the box score columns when enriched, in the compact dtypes of schema_helper.GAME_STATS_SCHEMA.
         """
-        all_game_stats: List[pd.DataFrame] = []
+        game_stats = self._transform_game_log(self._fetch_season_game_log(season, player_id), season).reset_index(drop=True)
+        game_stats = self.parse_game_dates(game_stats)
+        return self._enrich(compact_game_stats(self.lower_precision_floats(game_stats)), player_id or self.player_id)
 
-        for season in self.seasons:
-            logging.info(f"Fetching game stats for Luka Dončić for season {season}")
-            game_logs = playergamelog.PlayerGameLog(player_id=self.player_id, season=season).get_data_frames()[0]
-            game_logs['FG%'] = game_logs['FGM'] / game_logs['FGA']
-            game_logs['TS%'] = game_logs.apply(lambda row: self._calculate_ts(row['PTS'], row['FGA'], row['FTA']), axis=1)
-            game_logs['opposing_team'] = game_logs['MATCHUP'].apply(lambda x: x.split()[-1] if 'vs.' in x else x.split()[-1])
-            game_logs['season'] = season
+    def fetch_league_game_stats(self, player_ids: Optional[List[int]] = None) -> pd.DataFrame:
+        """
+        Fetches game-by-game stats of all players with one LeagueGameLog request per season,
+        so the number of requests depends on the number of seasons and not on the number of players.
+        FG%, TS% and the opposing team are derived for all players of a season at once.
 
-            game_logs = game_logs[['GAME_DATE', 'PTS', 'REB', 'AST', 'MIN', 'FG%', 'TS%', 'opposing_team', 'season']]
-            game_logs.columns = ['date', 'points', 'rebounds', 'assists', 'minutes', 'fg_pct', 'ts_pct', 'opposing_team', 'season']
+        Parameters
+        ----------
+        player_ids : Optional[List[int]]
+            Players to keep, all players are kept if not given.
 
-            all_game_stats.append(game_logs)
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with columns: player_id, player_name, game_id, date, points, rebounds, assists, minutes, fg_pct,
+            ts_pct, opposing_team, season and the box score columns when enriched, in the compact dtypes of
+            schema_helper.GAME_STATS_SCHEMA.
+        """
+        season_logs = self._fetch_seasons(self._fetch_league_season_game_log, self.seasons)
+        all_game_stats: List[pd.DataFrame] = [
+            self._transform_game_log(game_logs, season, id_columns={'PLAYER_ID': 'player_id', 'PLAYER_NAME': 'player_name'})
+            for season, game_logs in season_logs.items()
+        ]
+        if not all_game_stats:
+            raise RuntimeError("No league game stats could be fetched for any season.")
 
         combined_game_stats = pd.concat(all_game_stats, ignore_index=True)
-        combined_game_stats = self.standardize_date_to_iso(combined_game_stats)
+        if player_ids is not None:
+            combined_game_stats = combined_game_stats[combined_game_stats['player_id'].isin(player_ids)].reset_index(drop=True)
+        combined_game_stats = self.parse_game_dates(combined_game_stats)
         combined_game_stats = self.lower_precision_floats(combined_game_stats)
-        return combined_game_stats
+        return self._enrich(compact_game_stats(combined_game_stats))
+
+    def _enrich(self, df: pd.DataFrame, player_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Joins box score details into game stats when a box score fetcher is set and the frame has game IDs.
+        """
+        if self.box_score_fetcher is None or 'game_id' not in df.columns:
+            return df
+        return self.box_score_fetcher.enrich(df, player_id)
+
+    def split_by_player(self, df: pd.DataFrame) -> Dict[int, pd.DataFrame]:
+        """
+        Splits a league-wide game stats frame into one frame per player.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            DataFrame returned by fetch_league_game_stats.
+
+        Returns
+        -------
+        Dict[int, pd.DataFrame]
+            Game stats keyed by player ID, each frame without the player columns.
+        """
+        return {
+            player_id: player_df.drop(columns=['player_id', 'player_name']).reset_index(drop=True)
+            for player_id, player_df in df.groupby('player_id', sort=False)
+        }
+
+    def _fetch_seasons(self, fetch: Callable[[str], pd.DataFrame], seasons: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Fetches several seasons, in parallel when max_workers > 1.
+        Seasons that fail are retried on their own in later rounds, a season that still fails after
+        max_retries retries is logged and skipped so it does not cancel the other seasons.
+
+        Parameters
+        ----------
+        fetch : Callable[[str], pd.DataFrame]
+            Function fetching the raw game log of one season.
+        seasons : List[str]
+            Seasons in NBA API format, e.g. 2023-24.
 
-    def standardize_date_to_iso(self, df: pd.DataFrame) -> pd.DataFrame:
+        Returns
+        -------
+        Dict[str, pd.DataFrame]
+            Raw game logs of the successfully fetched seasons, in the order of the seasons argument.
+        """
+        results: Dict[str, pd.DataFrame] = {}
+        pending = list(seasons)
+        for attempt in range(self.max_retries + 1):
+            if not pending:
+                break
+            if attempt > 0:
+                logging.warning(f"Retrying seasons {pending} (retry {attempt}/{self.max_retries}).")
+
+            failed = []
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                futures = {season: executor.submit(fetch, season) for season in pending}
+                for season, future in futures.items():
+                    try:
+                        results[season] = future.result()
+                    except Exception as e:
+                        logging.error(f"Fetching season {season} failed: {e}")
+                        failed.append(season)
+            pending = failed
+
+        for season in pending:
+            logging.error(f"Skipping season {season} after {self.max_retries} retries.")
+        return {season: results[season] for season in seasons if season in results}
+
+    def _fetch_season_game_log(self, season: str, player_id: Optional[int] = None) -> pd.DataFrame:
         """
-        Standardizes the date format in the DataFrame to ISO format (YYYY-MM-DD).
+        Returns the raw PlayerGameLog frame for a season, from the cache when possible.
+
+        Parameters
+        ----------
+        season : str
+            Season in NBA API format, e.g. 2023-24.
+        player_id : Optional[int]
+            Player whose game log is fetched, defaults to Luka Dončić.
+
+        Returns
+        -------
+        pd.DataFrame
+            Raw game log as returned by the NBA API.
+        """
+        if player_id is None:
+            player_id = self.player_id
+        if self.cache is not None:
+            game_logs = self.cache.get(player_id, season)
+            if game_logs is not None:
+                return game_logs
+
+        if player_id == self.player_id:
+            logging.info(f"Fetching game stats for Luka Dončić for season {season}")
+        else:
+            logging.info(f"Fetching game stats for player {player_id} for season {season}")
+        from nba_api.stats.endpoints import playergamelog
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        endpoint = _request_endpoint(
+            lambda: playergamelog.PlayerGameLog(player_id=player_id, season=season, timeout=self.request_timeout)
+        )
+        game_logs = endpoint.get_data_frames()[0]
+        if self.cache is not None:
+            self.cache.put(player_id, season, game_logs)
+        return game_logs
+
+    def _fetch_league_season_game_log(self, season: str) -> pd.DataFrame:
+        """
+        Returns the raw LeagueGameLog frame with one row per player and game for a season, from the cache when possible.
+
+        Parameters
+        ----------
+        season : str
+            Season in NBA API format, e.g. 2023-24.
+
+        Returns
+        -------
+        pd.DataFrame
+            Raw league game log as returned by the NBA API.
+        """
+        if self.cache is not None:
+            game_logs = self.cache.get(self.LEAGUE_CACHE_KEY, season)
+            if game_logs is not None:
+                return game_logs
+
+        logging.info(f"Fetching league game stats for season {season}")
+        from nba_api.stats.endpoints import leaguegamelog
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        endpoint = _request_endpoint(
+            lambda: leaguegamelog.LeagueGameLog(season=season, player_or_team_abbreviation='P', timeout=self.request_timeout)
+        )
+        game_logs = endpoint.get_data_frames()[0]
+        if self.cache is not None:
+            self.cache.put(self.LEAGUE_CACHE_KEY, season, game_logs)
+        return game_logs
+
+    def _transform_game_log(
+        self,
+        game_logs: pd.DataFrame,
+        season: str,
+        id_columns: Optional[Dict[str, str]] = None
+    ) -> pd.DataFrame:
+        """
+        Derives FG%, TS% and the opposing team from a raw game log and selects the exported columns.
+
+        Parameters
+        ----------
+        game_logs : pd.DataFrame
+            Raw game log as returned by the NBA API.
+        season : str
+            Season in NBA API format, e.g. 2023-24.
+        id_columns : Optional[Dict[str, str]]
+            Raw identifier columns kept in front of the exported columns, mapped to their new names.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with columns: date, points, rebounds, assists, minutes, fg_pct, ts_pct, opposing_team, season,
+            preceded by the id_columns and game_id, if the raw game log has a game ID column.
+        """
+        id_columns = dict(id_columns or {})
+        # PlayerGameLog names it Game_ID, LeagueGameLog GAME_ID, the box score enrichment joins on it
+        for game_id_column in ('Game_ID', 'GAME_ID'):
+            if game_id_column in game_logs.columns:
+                id_columns[game_id_column] = 'game_id'
+                break
+        with instrumentation.stage('nba.transform'):
+            # only the derived metrics that are exported, the others would be dropped by the selection below
+            game_logs = add_derived_metrics(game_logs, EXPORTED_DERIVED_METRICS)
+            game_logs['season'] = season
+
+            game_logs = game_logs[list(id_columns) + ['GAME_DATE', 'PTS', 'REB', 'AST', 'MIN', 'FG%', 'TS%', 'opposing_team', 'season']]
+            game_logs.columns = list(id_columns.values()) + ['date', 'points', 'rebounds', 'assists', 'minutes', 'fg_pct', 'ts_pct', 'opposing_team', 'season']
+        instrumentation.record_rows('nba.transform', len(game_logs))
+        return game_logs
+
+    def parse_game_dates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Parses the date column into datetime64 dates. They stay datetime64 in memory and are only formatted
+        as ISO strings (YYYY-MM-DD) when pushed, see schema_helper.iso_dates.
         Used because API returns non-standard date format: OCT 31, 2024 etc.
+        The known format is parsed in one vectorized pass, other formats fall back to per-value inference.
 
         Parameters
         ----------
@@ -109,9 +469,12 @@ class StatsFetcher:
         Returns
         -------
         pd.DataFrame
-            DataFrame with date column in ISO format.
+            DataFrame with a datetime64 date column.
         """
-        df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
+        try:
+            df['date'] = pd.to_datetime(df['date'], format='%b %d, %Y')
+        except ValueError:
+            df['date'] = pd.to_datetime(df['date'], format='mixed')
         return df
 
     def lower_precision_floats(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -132,3 +495,174 @@ class StatsFetcher:
         float_cols = df.select_dtypes(include=['float']).columns
         df[float_cols] = df[float_cols].round(3)
         return df
+
+
+class BoxScoreFetcher:
+    """
+    Fetches per-game box score details for the games of a game log and joins them into it.
+
+    Every game takes one BoxScoreAdvancedV2 request and one BoxScoreTraditionalV2 request per quarter, so
+    games are fetched concurrently by a bounded number of workers. Box scores of finished games never change,
+    so every fetched game is kept in the cache and only fetched once.
+
+    Attributes
+    ----------
+    cache : Optional[BoxScoreCache]
+        Cache of fetched box scores, keyed by game ID.
+    max_workers : int
+        Number of games fetched at once.
+    rate_limiter : Optional[TokenBucket]
+        Limiter shared by all box score requests.
+    request_timeout : int
+        Timeout in seconds of a single NBA API request.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[BoxScoreCache] = None,
+        max_workers: int = 4,
+        rate_limiter: Optional[TokenBucket] = None,
+        request_timeout: int = 30
+    ):
+        """
+        Parameters
+        ----------
+        cache : Optional[BoxScoreCache]
+            Cache of fetched box scores. If not given, a cache is created in NBA_CACHE_DIR/box_scores
+            when NBA_CACHE_DIR is set, otherwise nothing is cached.
+        max_workers : int
+            Number of games fetched at once.
+        rate_limiter : Optional[TokenBucket]
+            Limiter shared by all box score requests. When fetching in parallel without one,
+            a bucket allowing one request per second is used.
+        request_timeout : int
+            Timeout in seconds of a single NBA API request.
+        """
+        if max_workers < 1:
+            raise ValueError("Max workers must be a positive integer.")
+        _load_nba_api()
+        if cache is None and os.getenv('NBA_CACHE_DIR'):
+            cache = BoxScoreCache(os.path.join(os.getenv('NBA_CACHE_DIR'), 'box_scores'))
+        self.cache = cache
+        self.max_workers = max_workers
+        if rate_limiter is None and max_workers > 1:
+            rate_limiter = TokenBucket(rate=1.0)
+        self.rate_limiter = rate_limiter
+        self.request_timeout = request_timeout
+
+    def _request_player_stats(self, create: Callable[[], object]) -> pd.DataFrame:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return _request_endpoint(create).player_stats.get_data_frame()
+
+    def fetch_game(self, game_id: str) -> pd.DataFrame:
+        """
+        Returns the box score details of all players of a game, from the cache when possible.
+
+        Parameters
+        ----------
+        game_id : str
+            NBA game ID, e.g. 0022300001.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with columns: game_id, player_id and the schema_helper.BOX_SCORE_COLUMNS.
+        """
+        if self.cache is not None:
+            box_score = self.cache.get(game_id)
+            if box_score is not None:
+                return box_score
+
+        from nba_api.stats.endpoints import boxscoreadvancedv2, boxscoretraditionalv2
+
+        logging.info(f"Fetching box score of game {game_id}")
+        advanced = self._request_player_stats(
+            lambda: boxscoreadvancedv2.BoxScoreAdvancedV2(game_id=game_id, timeout=self.request_timeout)
+        )
+        box_score = advanced[['PLAYER_ID', *BOX_SCORE_ADVANCED_COLUMNS]].rename(columns=BOX_SCORE_ADVANCED_COLUMNS)
+        for quarter in range(1, QUARTERS + 1):
+            traditional = self._request_player_stats(
+                lambda: boxscoretraditionalv2.BoxScoreTraditionalV2(
+                    game_id=game_id,
+                    start_period='1',
+                    end_period='10',
+                    range_type='2',
+                    start_range=str((quarter - 1) * QUARTER_TENTHS),
+                    end_range=str(quarter * QUARTER_TENTHS),
+                    timeout=self.request_timeout
+                )
+            )
+            plus_minus = traditional[['PLAYER_ID', 'PLUS_MINUS']].rename(columns={'PLUS_MINUS': f'plus_minus_q{quarter}'})
+            box_score = box_score.merge(plus_minus, on='PLAYER_ID', how='left')
+        box_score = box_score.rename(columns={'PLAYER_ID': 'player_id'})
+        box_score.insert(0, 'game_id', game_id)
+        box_score = box_score.astype({'player_id': 'int32', **{column: 'float32' for column in BOX_SCORE_COLUMNS}})
+
+        if self.cache is not None:
+            self.cache.put(game_id, box_score)
+        return box_score
+
+    def fetch_games(self, game_ids: List[str]) -> pd.DataFrame:
+        """
+        Fetches the box scores of several games, max_workers at a time.
+        A game that fails is logged and skipped, it is fetched again by the next run since it is not cached.
+
+        Parameters
+        ----------
+        game_ids : List[str]
+            NBA game IDs, duplicates are fetched once.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with columns: game_id, player_id and the schema_helper.BOX_SCORE_COLUMNS.
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        box_scores = []
+        if game_ids:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(game_ids))) as executor:
+                futures = {game_id: executor.submit(self.fetch_game, game_id) for game_id in game_ids}
+                for game_id, future in futures.items():
+                    try:
+                        box_scores.append(future.result())
+                    except Exception as e:
+                        logging.error(f"Fetching box score of game {game_id} failed: {e}")
+        instrumentation.record_rows('nba.box_scores', len(box_scores))
+        if not box_scores:
+            return pd.DataFrame({
+                'game_id': pd.Series(dtype=object),
+                'player_id': pd.Series(dtype='int32'),
+                **{column: pd.Series(dtype='float32') for column in BOX_SCORE_COLUMNS}
+            })
+        return pd.concat(box_scores, ignore_index=True)
+
+    def enrich(self, df: pd.DataFrame, player_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Joins the box score details of every game into a game-log frame, games without a box score get NaN.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Game-log frame with a game_id column, as returned by StatsFetcher.
+        player_id : Optional[int]
+            Player of all rows, required when the frame has no player_id column.
+
+        Returns
+        -------
+        pd.DataFrame
+            The game-log frame in its row order with the schema_helper.BOX_SCORE_COLUMNS appended.
+        """
+        if 'game_id' not in df.columns:
+            raise ValueError("Box scores can only be joined into frames with a game_id column.")
+        with instrumentation.stage('nba.box_scores'):
+            box_scores = self.fetch_games(df['game_id'].dropna().tolist())
+            if 'player_id' in df.columns:
+                keys = ['game_id', 'player_id']
+            elif player_id is not None:
+                keys = ['game_id']
+                box_scores = box_scores[box_scores['player_id'] == player_id].drop(columns='player_id')
+            else:
+                raise ValueError("A player ID is required for frames without a player_id column.")
+            df = df.drop(columns=[column for column in BOX_SCORE_COLUMNS if column in df.columns])
+            return df.merge(box_scores.astype({'game_id': str}), on=keys, how='left')
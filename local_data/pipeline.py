@@ -0,0 +1,116 @@
+import queue
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+_DONE = object()
+
+
+class StreamingPipeline:
+    """
+    Class that overlaps fetching and pushing.
+
+    Every source runs its chunk generator on its own producer thread and puts the chunks into one bounded queue,
+    the calling thread takes them off the queue and hands them to the sink of their source. Fetching blocks while
+    the queue is full, so at most queue_size chunks wait in memory. Chunks of one source reach its sink in the
+    order they were produced.
+
+    Attributes
+    ----------
+    queue_size : int
+        Maximum number of fetched chunks waiting to be pushed.
+    """
+
+    def __init__(self, queue_size: int = 4):
+        """
+        Initializes an empty pipeline.
+
+        Parameters
+        ----------
+        queue_size : int
+            Maximum number of fetched chunks waiting to be pushed.
+        """
+        if queue_size < 1:
+            raise ValueError("Queue size must be a positive integer.")
+        self.queue_size = queue_size
+        self._sources: Dict[str, tuple] = {}
+
+    def add_source(
+        self,
+        name: str,
+        chunks: Callable[[], Iterable[pd.DataFrame]],
+        sink: Callable[[pd.DataFrame], List[dict]]
+    ) -> None:
+        """
+        Registers a source.
+
+        Parameters
+        ----------
+        name : str
+            Name of the source used in logs and in the run summary.
+        chunks : Callable[[], Iterable[pd.DataFrame]]
+            Function returning the chunk iterator, it is called on the producer thread.
+        sink : Callable[[pd.DataFrame], List[dict]]
+            Function pushing one chunk and returning its per-chunk push report, e.g. DataboxFeed.send_data_nba.
+        """
+        self._sources[name] = (chunks, sink)
+
+    def _produce(self, name: str, chunks: Callable[[], Iterable[pd.DataFrame]], chunk_queue: queue.Queue) -> None:
+        try:
+            for chunk in chunks():
+                chunk_queue.put((name, chunk))
+        except Exception as e:
+            logging.error(f"Source {name} failed: {e}")
+            chunk_queue.put((name, e))
+        finally:
+            chunk_queue.put((name, _DONE))
+
+    def run(self) -> Dict[str, dict]:
+        """
+        Runs all sources until every chunk is pushed.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Dict[str, dict]
+            Summary per source with keys: chunks, rows, requests, failed_requests, error.
+        """
+        chunk_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        summary = {
+            name: {'chunks': 0, 'rows': 0, 'requests': 0, 'failed_requests': 0, 'error': None}
+            for name in self._sources
+        }
+        producers = [
+            threading.Thread(target=self._produce, args=(name, chunks, chunk_queue), name=f"producer-{name}", daemon=True)
+            for name, (chunks, _) in self._sources.items()
+        ]
+        for producer in producers:
+            producer.start()
+
+        running = len(producers)
+        while running:
+            name, item = chunk_queue.get()
+            if item is _DONE:
+                running -= 1
+                logging.info(f"Source {name} finished after {summary[name]['chunks']} chunks.")
+                continue
+            if isinstance(item, Exception):
+                summary[name]['error'] = str(item)
+                continue
+
+            report = self._sources[name][1](item)
+            summary[name]['chunks'] += 1
+            summary[name]['rows'] += len(item)
+            summary[name]['requests'] += len(report)
+            summary[name]['failed_requests'] += sum(1 for chunk_report in report if not chunk_report['success'])
+
+        for producer in producers:
+            producer.join()
+        return summary
@@ -0,0 +1,114 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import List
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class PushLedger:
+    """
+    Local SQLite record of the datapoints that were successfully pushed to Databox.
+
+    Every datapoint is keyed by metric, date and dimensions and stores a hash of its value, so a datapoint
+    is only pushed again when it is new or its value changed.
+
+    Attributes
+    ----------
+    path : str
+        Location of the SQLite file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens the ledger and creates its table if needed.
+
+        Parameters
+        ----------
+        path : str
+            Location of the SQLite file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pushed_datapoints (
+                    metric TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    dimensions TEXT NOT NULL,
+                    value_hash TEXT NOT NULL,
+                    pushed_at REAL NOT NULL,
+                    PRIMARY KEY (metric, date, dimensions)
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS batch_keys (metric TEXT NOT NULL, date TEXT NOT NULL, dimensions TEXT NOT NULL)"
+            )
+
+    def _key(self, record: dict) -> tuple:
+        dimensions = json.dumps(sorted((a['key'], a['value']) for a in record.get('attributes', [])))
+        return record['key'], str(record['date']), dimensions
+
+    def _hash(self, record: dict) -> str:
+        return hashlib.sha1(json.dumps(record['value']).encode()).hexdigest()
+
+    def filter_changed(self, push_data: List[dict]) -> List[dict]:
+        """
+        Returns the datapoints that are new or whose value differs from the last successful push.
+
+        Parameters
+        ----------
+        push_data : List[dict]
+            Datapoints in Databox push format.
+
+        Returns
+        -------
+        List[dict]
+            The datapoints that need to be pushed, in their original order.
+        """
+        keys = [self._key(record) for record in push_data]
+        # only the batch's keys are looked up, joined through a temporary table instead of reading the whole ledger
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM batch_keys")
+            self._connection.executemany("INSERT INTO batch_keys (metric, date, dimensions) VALUES (?, ?, ?)", keys)
+            pushed = {
+                (metric, date, dimensions): value_hash
+                for metric, date, dimensions, value_hash in self._connection.execute(
+                    "SELECT p.metric, p.date, p.dimensions, p.value_hash FROM batch_keys b "
+                    "JOIN pushed_datapoints p ON p.metric = b.metric AND p.date = b.date AND p.dimensions = b.dimensions"
+                )
+            }
+            self._connection.execute("DELETE FROM batch_keys")
+        changed = [record for record, key in zip(push_data, keys) if pushed.get(key) != self._hash(record)]
+        logging.info(f"Push ledger: {len(changed)} of {len(push_data)} datapoints are new or changed.")
+        return changed
+
+    def record(self, push_data: List[dict]) -> None:
+        """
+        Marks datapoints as successfully pushed.
+
+        Parameters
+        ----------
+        push_data : List[dict]
+            Datapoints in Databox push format that Databox accepted.
+        """
+        now = time.time()
+        rows = [self._key(record) + (self._hash(record), now) for record in push_data]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO pushed_datapoints (metric, date, dimensions, value_hash, pushed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def close(self) -> None:
+        """
+        Closes the SQLite connection.
+        """
+        self._connection.close()
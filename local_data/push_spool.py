@@ -0,0 +1,167 @@
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import List, Tuple
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class PushSpool:
+    """
+    Durable SQLite spool of Databox push chunks that could not be delivered.
+
+    Failed chunks are appended in the order they failed and are replayed in the same order,
+    so an older value never overwrites a newer one that was spooled later. A chunk that keeps failing
+    is parked in a dead-letter table, so it does not hold back every later chunk forever.
+
+    Attributes
+    ----------
+    path : str
+        Location of the SQLite file.
+    max_attempts : int
+        Number of failed delivery attempts after which a chunk is parked.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 5):
+        """
+        Opens the spool and creates its tables if needed.
+
+        Parameters
+        ----------
+        path : str
+            Location of the SQLite file.
+        max_attempts : int
+            Number of failed delivery attempts, the original push included, after which a chunk is parked.
+        """
+        if max_attempts < 1:
+            raise ValueError("Max attempts must be a positive integer.")
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS spooled_chunks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 1,
+                    last_error TEXT,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS parked_chunks (
+                    id INTEGER PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    parked_at REAL NOT NULL
+                )
+                """
+            )
+
+    def add(self, chunk: List[dict], error: str) -> None:
+        """
+        Appends a chunk that failed to push.
+
+        Parameters
+        ----------
+        chunk : List[dict]
+            Datapoints in Databox push format.
+        error : str
+            Error of the failed push.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO spooled_chunks (payload, last_error, created_at) VALUES (?, ?, ?)",
+                (json.dumps(chunk), error, time.time())
+            )
+        logging.warning(f"Spooled {len(chunk)} datapoints for a later retry.")
+
+    def pending(self) -> List[Tuple[int, List[dict], int]]:
+        """
+        Returns all spooled chunks, oldest first.
+
+        Returns
+        -------
+        List[Tuple[int, List[dict], int]]
+            Tuples of spool ID, chunk and number of failed attempts.
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT id, payload, attempts FROM spooled_chunks ORDER BY id").fetchall()
+        return [(spool_id, json.loads(payload), attempts) for spool_id, payload, attempts in rows]
+
+    def remove(self, spool_id: int) -> None:
+        """
+        Removes a chunk that was delivered.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM spooled_chunks WHERE id = ?", (spool_id,))
+
+    def mark_failed(self, spool_id: int, error: str, permanent: bool = False) -> bool:
+        """
+        Records another failed delivery attempt of a spooled chunk. The chunk is moved to the parked_chunks
+        table once it failed max_attempts times, or right away if the error is permanent.
+
+        Parameters
+        ----------
+        spool_id : int
+            Spool ID of the chunk.
+        error : str
+            Error of the failed attempt.
+        permanent : bool
+            Whether the chunk would be rejected again, e.g. with a 400 response.
+
+        Returns
+        -------
+        bool
+            Whether the chunk was parked.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE spooled_chunks SET attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (error, spool_id)
+            )
+            row = self._connection.execute("SELECT attempts FROM spooled_chunks WHERE id = ?", (spool_id,)).fetchone()
+            if row is None or (not permanent and row[0] < self.max_attempts):
+                return False
+            self._connection.execute(
+                "INSERT INTO parked_chunks (id, payload, attempts, last_error, created_at, parked_at) "
+                "SELECT id, payload, attempts, last_error, created_at, ? FROM spooled_chunks WHERE id = ?",
+                (time.time(), spool_id)
+            )
+            self._connection.execute("DELETE FROM spooled_chunks WHERE id = ?", (spool_id,))
+        logging.error(f"Parked spooled chunk {spool_id} after {row[0]} failed attempts, it is no longer replayed "
+                      f"(see the parked_chunks table of {self.path}): {error}")
+        return True
+
+    def parked(self) -> List[Tuple[int, List[dict], int, str]]:
+        """
+        Returns all parked chunks, oldest first.
+
+        Returns
+        -------
+        List[Tuple[int, List[dict], int, str]]
+            Tuples of spool ID, chunk, number of failed attempts and last error.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, payload, attempts, last_error FROM parked_chunks ORDER BY id"
+            ).fetchall()
+        return [(spool_id, json.loads(payload), attempts, error) for spool_id, payload, attempts, error in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM spooled_chunks").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Closes the SQLite connection.
+        """
+        self._connection.close()
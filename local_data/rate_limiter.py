@@ -0,0 +1,332 @@
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Mapping, Optional
+from urllib.parse import urlsplit
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+"""
+Rate limiting primitives shared by the fetchers and the Databox connector.
+TokenBucket is a fixed client-side rate, AdaptiveRateLimiter follows the quota signals of one upstream host.
+The module-level `rate_limits` registry hands every client the limiter of the host it talks to.
+"""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are refilled continuously at `rate` tokens per second up to `capacity`, every request takes one token
+    and blocks until a token is available.
+
+    Attributes
+    ----------
+    rate : float
+        Number of tokens added per second.
+    capacity : float
+        Maximum number of tokens, i.e. the largest allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initializes a full bucket.
+
+        Parameters
+        ----------
+        rate : float
+            Number of tokens added per second.
+        capacity : float
+            Maximum number of tokens, i.e. the largest allowed burst.
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+        if capacity < 1:
+            raise ValueError("Capacity must be at least one token.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """
+        Takes one token, waiting until one is available.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised instead of waiting when a host's quota is exhausted for longer than the limiter's max_wait.
+    """
+
+
+def _header_number(headers: Optional[Mapping], name: str) -> Optional[float]:
+    """
+    Returns a numeric header value, None if the header is missing or not a number.
+    """
+    if headers is None:
+        return None
+    value = headers.get(name)
+    if isinstance(value, bool) or not isinstance(value, (str, bytes, int, float)):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def parse_retry_after(headers: Optional[Mapping], now: Optional[float] = None) -> Optional[float]:
+    """
+    Returns the number of seconds requested by a Retry-After header given in seconds or as an HTTP date.
+
+    Parameters
+    ----------
+    headers : Optional[Mapping]
+        Response headers.
+    now : Optional[float]
+        Current Unix time, defaults to time.time().
+
+    Returns
+    -------
+    Optional[float]
+        Seconds to wait, None if the header is missing or invalid.
+    """
+    seconds = _header_number(headers, 'Retry-After')
+    if seconds is not None:
+        return max(0.0, seconds)
+    value = headers.get('Retry-After') if headers is not None else None
+    if not isinstance(value, str):
+        return None
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe limiter of the requests to one host, adapting to the quota signals of its responses.
+
+    Every request takes a slot before it is sent and reports its response when it is done:
+    - Retry-After (429/503) and an exhausted X-RateLimit-Remaining hold all requests back until the given time
+      or X-RateLimit-Reset.
+    - Once fewer than `pace_below` requests remain, requests are spread evenly over the time left until the
+      reset and never more requests are in flight than remain.
+    - Throttling (429, 5xx) and connection errors halve the allowed concurrency, every successful response
+      raises it again by about one request per round trip, up to max_concurrency.
+
+    Attributes
+    ----------
+    host : str
+        Host whose requests are limited.
+    max_concurrency : int
+        Upper bound of requests in flight.
+    concurrency : float
+        Currently allowed requests in flight, between 1 and max_concurrency.
+    min_interval : float
+        Minimum seconds between the starts of two requests.
+    pace_below : int
+        Number of remaining requests below which requests are paced to last until the reset.
+    max_wait : float
+        Longest wait in seconds for an exhausted quota, longer waits raise RateLimitExceeded.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        max_concurrency: int = 16,
+        min_interval: float = 0.0,
+        pace_below: int = 100,
+        max_wait: float = 300.0
+    ):
+        """
+        Initializes a limiter allowing max_concurrency requests in flight.
+
+        Parameters
+        ----------
+        host : str
+            Host whose requests are limited, used in log messages.
+        max_concurrency : int
+            Upper bound of requests in flight.
+        min_interval : float
+            Minimum seconds between the starts of two requests.
+        pace_below : int
+            Number of remaining requests below which requests are paced to last until the reset.
+        max_wait : float
+            Longest wait in seconds for an exhausted quota, longer waits raise RateLimitExceeded.
+        """
+        if max_concurrency < 1:
+            raise ValueError("Max concurrency must be a positive integer.")
+        if min_interval < 0 or max_wait < 0:
+            raise ValueError("Intervals and waits must not be negative.")
+        self.host = host
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+        self.min_interval = min_interval
+        self.pace_below = pace_below
+        self.max_wait = max_wait
+        self._in_flight = 0
+        self._next_start = 0.0
+        self._blocked_until = 0.0
+        self._remaining: Optional[float] = None
+        self._reset_at = 0.0
+        self._condition = threading.Condition()
+
+    def _interval(self, now: float) -> float:
+        if self._remaining is None or self._remaining >= self.pace_below or now >= self._reset_at:
+            return self.min_interval
+        return max(self.min_interval, (self._reset_at - now) / max(self._remaining, 1))
+
+    def _allowed_in_flight(self, now: float) -> int:
+        allowed = int(self.concurrency)
+        if self._remaining is not None and now < self._reset_at:
+            allowed = min(allowed, max(1, int(self._remaining)))
+        return allowed
+
+    def wait_time(self) -> float:
+        """
+        Returns the seconds until the next request may start, ignoring the requests in flight.
+        """
+        with self._condition:
+            now = time.monotonic()
+            return max(0.0, self._blocked_until - now, self._next_start - now)
+
+    def acquire(self) -> None:
+        """
+        Takes a request slot, waiting for the quota, the request spacing and a free slot.
+
+        Raises
+        ------
+        RateLimitExceeded
+            If the host's quota is exhausted for longer than max_wait.
+        """
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                blocked = self._blocked_until - now
+                if blocked > self.max_wait:
+                    raise RateLimitExceeded(f"Rate limit of {self.host} is exhausted for another {blocked:.0f}s.")
+                wait = max(blocked, self._next_start - now)
+                if wait <= 0 and self._in_flight < self._allowed_in_flight(now):
+                    self._in_flight += 1
+                    self._next_start = now + self._interval(now)
+                    if self._remaining is not None:
+                        self._remaining -= 1
+                    return
+                self._condition.wait(timeout=wait if wait > 0 else None)
+
+    def release(self, status: Optional[int] = None, headers: Optional[Mapping] = None, error: bool = False) -> None:
+        """
+        Frees a request slot and adapts the limits to the response.
+
+        Parameters
+        ----------
+        status : Optional[int]
+            HTTP status of the response, None if not known.
+        headers : Optional[Mapping]
+            Response headers.
+        error : bool
+            Whether the request failed without a response, e.g. on a timeout or a reset connection.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._adapt(status if isinstance(status, int) else None, headers, error)
+            self._condition.notify_all()
+
+    def _adapt(self, status: Optional[int], headers: Optional[Mapping], error: bool) -> None:
+        now = time.monotonic()
+        wall_now = time.time()
+        remaining = _header_number(headers, 'X-RateLimit-Remaining')
+        reset = _header_number(headers, 'X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            self._remaining = remaining
+            self._reset_at = now + max(0.0, reset - wall_now)
+            if remaining <= 0:
+                self._blocked_until = max(self._blocked_until, self._reset_at)
+        retry_after = parse_retry_after(headers, wall_now)
+        if retry_after is not None:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+        throttled = error or (status is not None and (status == 429 or status >= 500)) or retry_after is not None
+        if throttled:
+            self.concurrency = max(1.0, self.concurrency / 2)
+            logging.warning(f"{self.host} is throttling, allowing {int(self.concurrency)} requests in flight.")
+        elif status is None or status < 400:
+            self.concurrency = min(float(self.max_concurrency), self.concurrency + 1 / self.concurrency)
+
+    @contextmanager
+    def request(self) -> Iterator[dict]:
+        """
+        Holds a request slot for the duration of a request.
+
+        Yields a dict in which the caller sets the response's 'status' and 'headers'. An exception leaving the
+        block releases the slot as a failed request, unless a status was set before.
+        """
+        self.acquire()
+        feedback = {'status': None, 'headers': None}
+        try:
+            yield feedback
+        except BaseException:
+            self.release(feedback['status'], feedback['headers'], error=feedback['status'] is None)
+            raise
+        self.release(feedback['status'], feedback['headers'])
+
+
+class RateLimiterRegistry:
+    """
+    Thread-safe registry of the AdaptiveRateLimiter of every host, shared by all clients talking to the same host.
+
+    Attributes
+    ----------
+    max_wait : float
+        max_wait of newly created limiters, defaults to the RATE_LIMIT_MAX_WAIT environment variable or 300 seconds.
+    """
+
+    def __init__(self, max_wait: Optional[float] = None):
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv('RATE_LIMIT_MAX_WAIT', '300'))
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def for_host(self, host: str, **kwargs) -> AdaptiveRateLimiter:
+        """
+        Returns the limiter of a host, creating it with the given AdaptiveRateLimiter arguments on first use.
+        """
+        with self._lock:
+            if host not in self._limiters:
+                kwargs.setdefault('max_wait', self.max_wait)
+                self._limiters[host] = AdaptiveRateLimiter(host, **kwargs)
+            return self._limiters[host]
+
+    def for_url(self, url: str, **kwargs) -> AdaptiveRateLimiter:
+        """
+        Returns the limiter of the host of a URL.
+        """
+        return self.for_host(urlsplit(url).netloc, **kwargs)
+
+    def reset(self) -> None:
+        """
+        Forgets all limiters, e.g. between benchmark runs against different servers.
+        """
+        with self._lock:
+            self._limiters.clear()
+
+
+rate_limits = RateLimiterRegistry()
@@ -0,0 +1,132 @@
+from typing import List, Optional
+
+import pandas as pd
+
+from schema_helper import iso_dates
+
+"""
+Vectorized pre-aggregation of game-log frames into the rollups pushed by DataboxFeed instead of (or next to)
+the raw per-game values. Every rollup is computed per season, so a frame holding a single season (as streamed
+by StatsFetcher.iter_game_stats) yields the same rollups for that season as the full multi-season frame.
+"""
+
+ROLLUP_METRICS = ['points', 'rebounds', 'assists', 'minutes', 'fg_pct', 'ts_pct']
+# percentages are averaged per season, summing them is meaningless
+COUNTING_METRICS = ['points', 'rebounds', 'assists', 'minutes']
+
+
+def _sorted_by_date(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(['season', 'date'], kind='stable', ignore_index=True)
+
+
+def _widen(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """
+    Converts compact float32/int16 rollup columns to floats rounded to Databox's 6 decimal places and formats dates.
+    """
+    df[columns] = df[columns].astype(float).round(6)
+    df['date'] = iso_dates(df['date'])
+    return df
+
+
+def rolling_averages(
+    df: pd.DataFrame,
+    window: int = 10,
+    stride: Optional[int] = None,
+    metrics: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Computes rolling averages over the last `window` games of the same season.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Game-log frame with columns: date, season and the metric columns.
+    window : int
+        Number of games averaged, the first games of a season average over the games played so far.
+    stride : Optional[int]
+        Only every stride-th game of a season and the season's latest game are kept, defaults to window.
+        1 keeps every game.
+    metrics : Optional[List[str]]
+        Averaged columns, defaults to ROLLUP_METRICS.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: date, season, <metric>_avg<window> for every metric.
+    """
+    if window < 1:
+        raise ValueError("Window must be a positive integer.")
+    stride = stride or window
+    metrics = metrics or ROLLUP_METRICS
+    df = _sorted_by_date(df)
+    by_season = df.groupby('season', observed=True, sort=False)
+    averages = by_season[metrics].transform(lambda values: values.astype(float).rolling(window, min_periods=1).mean())
+    position = by_season.cumcount()
+    games = by_season['date'].transform('size')
+    keep = ((position + 1) % stride == 0) | (position == games - 1)
+
+    columns = [f"{metric}_avg{window}" for metric in metrics]
+    averages = averages[keep].set_axis(columns, axis=1)
+    rollup = pd.concat([df.loc[keep, ['date', 'season']], averages], axis=1).reset_index(drop=True)
+    return _widen(rollup, columns)
+
+
+def season_totals(df: pd.DataFrame, metrics: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Computes season totals of the counting metrics and season averages of the percentages,
+    dated at the latest game of the season.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Game-log frame with columns: date, season and the metric columns.
+    metrics : Optional[List[str]]
+        Aggregated columns, defaults to ROLLUP_METRICS.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: date, season, games, <metric>_season_total for counting metrics and
+        <metric>_season_avg for the others.
+    """
+    metrics = metrics or ROLLUP_METRICS
+    aggregations = {
+        (f"{metric}_season_total" if metric in COUNTING_METRICS else f"{metric}_season_avg"):
+            (metric, 'sum' if metric in COUNTING_METRICS else 'mean')
+        for metric in metrics
+    }
+    rollup = (
+        df.groupby('season', observed=True)
+        .agg(date=('date', 'max'), games=('date', 'size'), **aggregations)
+        .reset_index()
+    )
+    rollup['season'] = rollup['season'].astype(str)
+    return _widen(rollup[['date', 'season', 'games', *aggregations]], ['games', *aggregations])
+
+
+def opponent_splits(df: pd.DataFrame, metrics: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Computes per-game averages against every opponent in every season, dated at the latest game against the opponent.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Game-log frame with columns: date, season, opposing_team and the metric columns.
+    metrics : Optional[List[str]]
+        Averaged columns, defaults to ROLLUP_METRICS.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: date, opposing_team, season, games_vs_opponent, <metric>_vs_opponent_avg.
+    """
+    metrics = metrics or ROLLUP_METRICS
+    aggregations = {f"{metric}_vs_opponent_avg": (metric, 'mean') for metric in metrics}
+    rollup = (
+        df.groupby(['season', 'opposing_team'], observed=True)
+        .agg(date=('date', 'max'), games_vs_opponent=('date', 'size'), **aggregations)
+        .reset_index()
+    )
+    rollup[['season', 'opposing_team']] = rollup[['season', 'opposing_team']].astype(str)
+    columns = ['games_vs_opponent', *aggregations]
+    return _widen(rollup[['date', 'opposing_team', 'season', *columns]], columns)
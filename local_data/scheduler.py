@@ -0,0 +1,122 @@
+import time
+import signal
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class Scheduler:
+    """
+    Minimal interval scheduler for the long-running daemon mode.
+
+    Every job runs on its own thread every `interval` seconds. A cycle is skipped when the previous cycle of the
+    same job has not finished yet, and an optional predicate can skip cycles (e.g. outside the NBA season).
+    Stopping waits for running cycles to finish.
+
+    Attributes
+    ----------
+    tick : float
+        Seconds between checks for due jobs.
+    """
+
+    def __init__(self, tick: float = 1.0):
+        """
+        Initializes a scheduler without jobs.
+
+        Parameters
+        ----------
+        tick : float
+            Seconds between checks for due jobs.
+        """
+        self.tick = tick
+        self._jobs: Dict[str, dict] = {}
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def add_job(self, name: str, interval: float, func: Callable[[], None], should_run: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Registers a job, its first cycle runs right after the scheduler starts.
+
+        Parameters
+        ----------
+        name : str
+            Name of the job used in logs.
+        interval : float
+            Seconds between the starts of two cycles.
+        func : Callable[[], None]
+            Function running one cycle.
+        should_run : Optional[Callable[[], bool]]
+            Predicate checked before every cycle, the cycle is skipped when it returns False.
+        """
+        if interval <= 0:
+            raise ValueError("Interval must be positive.")
+        self._jobs[name] = {
+            'interval': interval,
+            'func': func,
+            'should_run': should_run,
+            'next_run': 0.0,
+            'lock': threading.Lock()
+        }
+
+    def _run_cycle(self, name: str, job: dict) -> None:
+        start = time.monotonic()
+        try:
+            job['func']()
+            logging.info(f"Job {name} finished in {time.monotonic() - start:.2f}s.")
+        except Exception as e:
+            logging.error(f"Job {name} failed after {time.monotonic() - start:.2f}s: {e}")
+        finally:
+            job['lock'].release()
+
+    def run_pending(self) -> None:
+        """
+        Starts every job that is due.
+        """
+        now = time.monotonic()
+        for name, job in self._jobs.items():
+            if now < job['next_run']:
+                continue
+            job['next_run'] = now + job['interval']
+            if job['should_run'] is not None and not job['should_run']():
+                logging.info(f"Skipping job {name}, its predicate is not met.")
+                continue
+            if not job['lock'].acquire(blocking=False):
+                logging.warning(f"Skipping job {name}, the previous cycle is still running.")
+                continue
+            thread = threading.Thread(target=self._run_cycle, args=(name, job), name=f"job-{name}")
+            self._threads.append(thread)
+            thread.start()
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+
+    def run_forever(self) -> None:
+        """
+        Runs due jobs until stop is called, then waits for running cycles to finish.
+        """
+        logging.info(f"Scheduler started with jobs: {', '.join(self._jobs)}.")
+        while not self._stop_event.is_set():
+            self.run_pending()
+            self._stop_event.wait(self.tick)
+
+        logging.info("Scheduler stopping, waiting for running jobs.")
+        for thread in self._threads:
+            thread.join()
+        logging.info("Scheduler stopped.")
+
+    def stop(self) -> None:
+        """
+        Asks run_forever to return after the running cycles finished.
+        """
+        self._stop_event.set()
+
+    def install_signal_handlers(self) -> None:
+        """
+        Stops the scheduler gracefully on SIGTERM and SIGINT.
+        """
+        def handle_signal(signum, frame):
+            logging.info(f"Received signal {signum}.")
+            self.stop()
+
+        signal.signal(signal.SIGTERM, handle_signal)
+        signal.signal(signal.SIGINT, handle_signal)
@@ -0,0 +1,183 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+"""
+Compact column schemas of the game-log and commit frames.
+Repeated strings become categoricals, counts narrow integers, percentages float32 and dates datetime64.
+DataboxFeed turns compact frames back into plain floats and ISO date strings right before building the payload.
+Compact frames cross process boundaries as column buffers: one NumPy array per column, categoricals as codes
+plus their categories, so no per-value Python objects are pickled.
+"""
+
+# per-game box score columns joined into game logs by nba_helper.BoxScoreFetcher
+BOX_SCORE_COLUMNS = [
+    'off_rating', 'def_rating', 'net_rating', 'usg_pct', 'pace', 'pie',
+    'plus_minus_q1', 'plus_minus_q2', 'plus_minus_q3', 'plus_minus_q4'
+]
+
+GAME_STATS_SCHEMA = {
+    'player_id': 'int32',
+    'player_name': 'category',
+    'team': 'category',
+    'points': 'int16',
+    'rebounds': 'int16',
+    'assists': 'int16',
+    'minutes': 'float32',
+    'fg_pct': 'float32',
+    'ts_pct': 'float32',
+    'opposing_team': 'category',
+    'season': 'category',
+    **{column: 'float32' for column in BOX_SCORE_COLUMNS}
+}
+
+COMMIT_COUNTS_SCHEMA = {
+    'author': 'category',
+    'count': 'int32',
+    'repository': 'category'
+}
+
+
+def compact_frame(df: pd.DataFrame, schema: Dict[str, str], date_column: str = 'date') -> pd.DataFrame:
+    """
+    Casts the columns of a frame to a compact schema, columns missing from the frame are ignored.
+    Integer columns holding missing values are stored as float32 instead.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Frame to compact, it is not modified.
+    schema : Dict[str, str]
+        Target dtype per column.
+    date_column : str
+        Column parsed into datetime64 dates.
+
+    Returns
+    -------
+    pd.DataFrame
+        Frame with the compact dtypes.
+    """
+    dtypes = {}
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        if dtype.startswith('int') and df[column].isna().any():
+            dtype = 'float32'
+        dtypes[column] = dtype
+    df = df.astype(dtypes)
+    if date_column in df.columns and not pd.api.types.is_datetime64_any_dtype(df[date_column]):
+        df[date_column] = pd.to_datetime(df[date_column], format='%Y-%m-%d')
+    return df
+
+
+def compact_game_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Casts a game-log frame to GAME_STATS_SCHEMA with datetime64 dates.
+    """
+    return compact_frame(df, GAME_STATS_SCHEMA)
+
+
+def compact_commit_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Casts a daily commit count frame to COMMIT_COUNTS_SCHEMA with datetime64 dates.
+    """
+    return compact_frame(df, COMMIT_COUNTS_SCHEMA)
+
+
+def iso_dates(dates: pd.Series) -> pd.Series:
+    """
+    Formats datetime64 dates as YYYY-MM-DD strings, other values are returned as strings unchanged.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.dt.strftime('%Y-%m-%d')
+    return dates.astype(str)
+
+
+ColumnBuffers = Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]]
+
+
+def to_column_buffers(df: pd.DataFrame) -> ColumnBuffers:
+    """
+    Converts a compact frame into one NumPy buffer per column.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Frame with numeric, datetime64 or categorical columns.
+
+    Returns
+    -------
+    ColumnBuffers
+        Per column a (values, categories) tuple. Categorical columns hold their codes and categories,
+        all other columns their values and None.
+    """
+    buffers = {}
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            buffers[column] = (values.cat.codes.to_numpy(), values.cat.categories.to_numpy())
+        else:
+            buffers[column] = (values.to_numpy(), None)
+    return buffers
+
+
+def from_column_buffers(shards: List[ColumnBuffers]) -> pd.DataFrame:
+    """
+    Concatenates the column buffers of several frames with the same columns into one frame.
+    Categorical columns get the union of the shards' categories, other columns are concatenated as they are.
+
+    Parameters
+    ----------
+    shards : List[ColumnBuffers]
+        Buffers created by to_column_buffers, in the order of the rows of the result.
+
+    Returns
+    -------
+    pd.DataFrame
+        Frame with the columns of the first shard.
+    """
+    if not shards:
+        return pd.DataFrame()
+    columns = {}
+    for column, (_, categories) in shards[0].items():
+        if categories is not None:
+            columns[column] = pd.api.types.union_categoricals(
+                [pd.Categorical.from_codes(*shard[column]) for shard in shards]
+            )
+        else:
+            columns[column] = np.concatenate([shard[column][0] for shard in shards])
+    return pd.DataFrame(columns)
+
+
+def memory_report(df: pd.DataFrame, baseline: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Reports the memory footprint of every column, including the Python objects behind object columns.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Frame to measure.
+    baseline : Optional[pd.DataFrame]
+        Frame with the same columns to compare against, e.g. the frame before compact_frame.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per column and a total row with columns: dtype, bytes, and if a baseline is given
+        baseline_dtype, baseline_bytes and saved_pct.
+    """
+    report = pd.DataFrame({'dtype': df.dtypes.astype(str), 'bytes': df.memory_usage(index=False, deep=True)})
+    if baseline is not None:
+        report['baseline_dtype'] = baseline.dtypes.astype(str)
+        report['baseline_bytes'] = baseline.memory_usage(index=False, deep=True)
+    bytes_columns = ['bytes'] + (['baseline_bytes'] if baseline is not None else [])
+    report.loc['total'] = report.sum(numeric_only=True)
+    report.loc['total', ['dtype'] + (['baseline_dtype'] if baseline is not None else [])] = ''
+    report[bytes_columns] = report[bytes_columns].astype('int64')
+    if baseline is not None:
+        report['saved_pct'] = (100 * (1 - report['bytes'] / report['baseline_bytes'])).round(1)
+    return report
@@ -0,0 +1,183 @@
+import os
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from nba_helper import StatsFetcher
+from rate_limiter import TokenBucket
+from instrumentation import instrumentation
+from schema_helper import ColumnBuffers, to_column_buffers, from_column_buffers
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+"""
+Sharded ingestion of game stats across a process pool.
+Every (player, season) pair is a work unit that a worker process fetches and transforms on its own core.
+Workers send their compact result back as NumPy column buffers (schema_helper.to_column_buffers)
+instead of pickled frames, the parent only concatenates the buffers.
+"""
+
+# one fetcher per worker process, created on the first shard the process handles
+_worker_fetcher: Optional[StatsFetcher] = None
+# requests per second this worker process may send, its share of the pool's rate set by _init_worker
+_worker_rate: float = 1.0
+
+
+def _init_worker(rate: float) -> None:
+    """
+    Initializer of every worker process, sets the process's share of the pool's request rate.
+    """
+    global _worker_fetcher, _worker_rate
+    _worker_fetcher = None
+    _worker_rate = rate
+
+
+def _worker_stats_fetcher() -> StatsFetcher:
+    """
+    Returns the StatsFetcher of the worker process. Its token bucket allows the process's share of the pool's
+    request rate and is shared with its box score fetcher, so enabling NBA_BOX_SCORES does not add requests.
+    """
+    global _worker_fetcher
+    if _worker_fetcher is None:
+        _worker_fetcher = StatsFetcher(rate_limiter=TokenBucket(rate=_worker_rate))
+    return _worker_fetcher
+
+
+def fetch_shard(player_id: int, season: str) -> pd.DataFrame:
+    """
+    Fetches and transforms one work unit in a worker process with the process's StatsFetcher.
+    """
+    return _worker_stats_fetcher().fetch_season_game_stats(season, player_id)
+
+
+def _run_shard(
+    fetch: Callable[[int, str], pd.DataFrame],
+    player_id: int,
+    season: str
+) -> Tuple[Optional[ColumnBuffers], Optional[str]]:
+    """
+    Runs one work unit in a worker process, errors are returned instead of raised so the parent can retry the unit.
+    """
+    try:
+        df = fetch(player_id, season)
+    except Exception as e:
+        return None, str(e)
+    df.insert(0, 'player_id', pd.Series(player_id, index=df.index, dtype='int32'))
+    return to_column_buffers(df), None
+
+
+class ShardedGameStatsFetcher:
+    """
+    Fetches game stats of many players and seasons with one (player, season) work unit per task of a process pool,
+    so parsing and deriving metrics scales with the number of cores instead of running on one.
+
+    Every worker process gets a token bucket allowing rate / processes requests per second, so the whole pool
+    stays at `rate` requests per second and has at most `processes` NBA API requests in flight. Request statistics of the workers stay in the workers, the parent's instrumentation records the merged rows.
+
+    Attributes
+    ----------
+    player_ids : List[int]
+        Players to fetch.
+    seasons : List[str]
+        Seasons to fetch in NBA API format, e.g. 2023-24.
+    processes : int
+        Number of worker processes.
+    max_retries : int
+        Number of times a failed work unit is run again before it is skipped.
+    fetch : Callable[[int, str], pd.DataFrame]
+        Module-level function fetching and transforming one work unit, it must be picklable.
+    rate : float
+        NBA API requests per second of the whole pool.
+    """
+
+    def __init__(
+        self,
+        player_ids: List[int],
+        seasons: List[str],
+        processes: Optional[int] = None,
+        max_retries: int = 2,
+        fetch: Callable[[int, str], pd.DataFrame] = fetch_shard,
+        start_method: str = 'spawn',
+        rate: float = 1.0
+    ):
+        """
+        Parameters
+        ----------
+        player_ids : List[int]
+            Players to fetch.
+        seasons : List[str]
+            Seasons to fetch in NBA API format, e.g. 2023-24.
+        processes : Optional[int]
+            Number of worker processes, defaults to the number of cores.
+        max_retries : int
+            Number of times a failed work unit is run again before it is skipped.
+        fetch : Callable[[int, str], pd.DataFrame]
+            Module-level function fetching and transforming one work unit, defaults to fetch_shard.
+        start_method : str
+            multiprocessing start method of the workers. spawn does not copy the parent's threads and locks.
+        rate : float
+            NBA API requests per second of the whole pool, split evenly across the worker processes.
+        """
+        processes = processes or os.cpu_count() or 1
+        if processes < 1:
+            raise ValueError("Processes must be a positive integer.")
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+        self.player_ids = list(player_ids)
+        self.seasons = list(seasons)
+        self.processes = processes
+        self.max_retries = max_retries
+        self.fetch = fetch
+        self.start_method = start_method
+        self.rate = rate
+
+    def fetch_all_game_stats(self) -> pd.DataFrame:
+        """
+        Fetches all work units across the process pool. Units that fail are retried in later rounds,
+        a unit that still fails after max_retries retries is logged and skipped.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with columns: player_id, date, points, rebounds, assists, minutes, fg_pct, ts_pct,
+            opposing_team, season, ordered by player and season, in the compact dtypes of
+            schema_helper.GAME_STATS_SCHEMA.
+        """
+        units = [(player_id, season) for player_id in self.player_ids for season in self.seasons]
+        if not units:
+            raise ValueError("At least one player and one season are required.")
+        shards: Dict[Tuple[int, str], ColumnBuffers] = {}
+        pending = units
+        context = multiprocessing.get_context(self.start_method)
+        workers = min(self.processes, len(units))
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(self.rate / workers,)
+        ) as executor:
+            for attempt in range(self.max_retries + 1):
+                if not pending:
+                    break
+                if attempt > 0:
+                    logging.warning(f"Retrying {len(pending)} work units (retry {attempt}/{self.max_retries}).")
+                futures = {unit: executor.submit(_run_shard, self.fetch, *unit) for unit in pending}
+                failed = []
+                for unit, future in futures.items():
+                    buffers, error = future.result()
+                    if error is not None:
+                        logging.error(f"Fetching player {unit[0]} for season {unit[1]} failed: {error}")
+                        failed.append(unit)
+                    else:
+                        shards[unit] = buffers
+                pending = failed
+
+        for player_id, season in pending:
+            logging.error(f"Skipping player {player_id} for season {season} after {self.max_retries} retries.")
+        if not shards:
+            raise RuntimeError("No game stats could be fetched for any work unit.")
+
+        df = from_column_buffers([shards[unit] for unit in units if unit in shards])
+        instrumentation.record_rows('nba.shards', len(df))
+        logging.info(f"Fetched {len(shards)}/{len(units)} work units with {self.processes} processes.")
+        return df
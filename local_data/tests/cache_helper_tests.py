@@ -0,0 +1,57 @@
+import os
+import time
+import tempfile
+import unittest
+from datetime import date
+import pandas as pd
+from cache_helper import GameLogCache, BoxScoreCache, season_end_date
+
+
+class TestGameLogCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = GameLogCache(self.tmp_dir.name, current_season_ttl=60)
+        self.df = pd.DataFrame({"GAME_DATE": ["JAN 01, 2023"], "PTS": [30]})
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_season_end_date(self):
+        self.assertEqual(season_end_date("2023-24"), date(2024, 7, 1))
+
+    def test_miss_returns_none(self):
+        self.assertIsNone(self.cache.get(12345, "2023-24"))
+
+    def test_completed_season_is_permanent(self):
+        self.cache.put(12345, "2018-19", self.df)
+        path = os.path.join(self.tmp_dir.name, "12345_2018-19.pkl")
+        old = time.mktime(date(2020, 1, 1).timetuple())
+        os.utime(path, (old, old))
+        pd.testing.assert_frame_equal(self.cache.get(12345, "2018-19"), self.df)
+
+    def test_current_season_expires_after_ttl(self):
+        season = f"{date.today().year}-{str(date.today().year + 1)[2:]}"
+        self.cache.put(12345, season, self.df)
+        pd.testing.assert_frame_equal(self.cache.get(12345, season), self.df)
+
+        path = os.path.join(self.tmp_dir.name, f"12345_{season}.pkl")
+        stale = time.time() - 120
+        os.utime(path, (stale, stale))
+        self.assertIsNone(self.cache.get(12345, season))
+
+    def test_season_cached_before_it_ended_expires(self):
+        self.cache.put(12345, "2018-19", self.df)
+        path = os.path.join(self.tmp_dir.name, "12345_2018-19.pkl")
+        during_season = time.mktime(date(2019, 3, 1).timetuple())
+        os.utime(path, (during_season, during_season))
+        self.assertIsNone(self.cache.get(12345, "2018-19"))
+
+
+    def test_box_score_cache_round_trip(self):
+        cache = BoxScoreCache(self.tmp_dir.name)
+        self.assertIsNone(cache.get("0022300001"))
+        cache.put("0022300001", self.df)
+        pd.testing.assert_frame_equal(cache.get("0022300001"), self.df)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,9 +2,16 @@ import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
 import os
+import tempfile
 from databox import ApiException
 
-from databox_connector import DataboxFeed
+import gzip
+import json
+from databox_connector import DataboxFeed, JsonPushClient, PushApiError, build_push_data
+from instrumentation import instrumentation
+from push_ledger import PushLedger
+from push_spool import PushSpool
+from schema_helper import compact_game_stats
 
 class TestDataboxFeed(unittest.TestCase):
 
@@ -78,5 +85,324 @@ class TestDataboxFeed(unittest.TestCase):
         self.databox_feed.send_data_github(df)
         self.mock_api_instance.data_post.assert_called_once()
 
+    def test_send_data_nba_batches_rows_into_single_call(self):
+        self.mock_api_instance.data_post.return_value = None
+        df = pd.DataFrame({
+            'date': ['2025-02-06', '2025-02-08', '2025-02-10'],
+            'points': [25, 30, 18],
+            'rebounds': [10, 7, 9],
+            'assists': [5, 11, 8],
+            'minutes': [35, 38, 33],
+            'fg_pct': [0.5, 0.55, 0.4],
+            'ts_pct': [0.6, 0.65, 0.5],
+            'opposing_team': ['LAC', 'PHX', 'DEN'],
+            'season': ['2025', '2025', '2025']
+        })
+        report = self.databox_feed.send_data_nba(df)
+        self.mock_api_instance.data_post.assert_called_once()
+        pushed = self.mock_api_instance.data_post.call_args.kwargs['push_data']
+        self.assertEqual(len(pushed), 36)
+        self.assertEqual(report, [{'chunk': 1, 'size': 36, 'success': True, 'error': None}])
+
+    def test_push_in_chunks_reports_failed_chunk(self):
+        self.databox_feed.chunk_size = 2
+        self.mock_api_instance.data_post.side_effect = [None, ApiException("API Error"), None]
+        push_data = [{"key": "commits", "value": float(i), "date": f"2025-02-0{i}"} for i in range(1, 6)]
+        report = self.databox_feed.push_in_chunks(push_data)
+        self.assertEqual(self.mock_api_instance.data_post.call_count, 3)
+        self.assertEqual([chunk['size'] for chunk in report], [2, 2, 1])
+        self.assertEqual([chunk['success'] for chunk in report], [True, False, True])
+
+    def test_push_records_request_body_size_when_reporting(self):
+        push_data = [{"key": "commits", "value": 1.0, "date": "2025-02-06"}]
+        self.addCleanup(setattr, instrumentation, 'enabled', None)
+        for enabled, expected_bytes in ((False, 0), (True, len(json.dumps(push_data, separators=(',', ':'))))):
+            instrumentation.reset()
+            instrumentation.enabled = enabled
+            self.databox_feed.push_in_chunks(push_data)
+            self.assertEqual(instrumentation.report()['requests']['databox']['request_bytes'], expected_bytes)
+
+    def test_init_rejects_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            DataboxFeed(chunk_size=0)
+
+    def test_build_push_data_dimensional_and_non_dimensional(self):
+        df = pd.DataFrame({
+            'date': ['2025-02-06', '2025-02-08'],
+            'points': [25.0, 30.0],
+            'assists': [5.0, 11.0],
+            'opposing_team': ['LAC', 'PHX'],
+            'season': ['2024-25', '2024-25']
+        })
+        push_data = build_push_data(df, ['points', 'assists'], ['opposing_team', 'season'])
+        attributes = [{"key": "opposing_team", "value": "LAC"}, {"key": "season", "value": "2024-25"}]
+        self.assertEqual(len(push_data), 8)
+        self.assertEqual(push_data[:4], [
+            {"key": "points", "value": 25.0, "date": "2025-02-06", "attributes": attributes},
+            {"key": "assists", "value": 5.0, "date": "2025-02-06", "attributes": attributes},
+            {"key": "points", "value": 25.0, "date": "2025-02-06"},
+            {"key": "assists", "value": 5.0, "date": "2025-02-06"}
+        ])
+        self.assertEqual(push_data[4]["date"], "2025-02-08")
+
+    def test_build_push_data_key_map_dimensional_only(self):
+        df = pd.DataFrame({'date': ['2025-02-06'], 'count': [3.0], 'repository': ['repo1']})
+        push_data = build_push_data(df, ['count'], ['repository'], key_map={'count': 'commits'}, non_dimensional=False)
+        self.assertEqual(push_data, [
+            {"key": "commits", "value": 3.0, "date": "2025-02-06", "attributes": [{"key": "repository", "value": "repo1"}]}
+        ])
+
+    def test_send_data_nba_restores_compact_frames(self):
+        df = compact_game_stats(pd.DataFrame({
+            'date': ['2025-02-06'],
+            'points': [25],
+            'rebounds': [10],
+            'assists': [5],
+            'minutes': [35.5],
+            'fg_pct': [0.478],
+            'ts_pct': [0.612],
+            'opposing_team': ['LAC'],
+            'season': ['2024-25']
+        }))
+        self.databox_feed.send_data_nba(df)
+        push_data = self.mock_api_instance.data_post.call_args.kwargs['push_data']
+        self.assertEqual(push_data[4], {
+            "key": "fg_pct", "value": 0.478, "date": "2025-02-06",
+            "attributes": [{"key": "opposing_team", "value": "LAC"}, {"key": "season", "value": "2024-25"}]
+        })
+        self.assertIs(type(push_data[0]["value"]), float)
+
+    def test_send_data_nba_rollups_only(self):
+        self.databox_feed.nba_push_mode = 'rollups'
+        self.databox_feed.rollup_window = 2
+        df = pd.DataFrame({
+            'date': ['2025-02-06', '2025-02-08', '2025-02-10'],
+            'points': [20, 30, 40],
+            'rebounds': [10, 8, 6],
+            'assists': [5, 7, 9],
+            'minutes': [35, 33, 31],
+            'fg_pct': [0.5, 0.4, 0.6],
+            'ts_pct': [0.6, 0.5, 0.7],
+            'opposing_team': ['LAC', 'PHX', 'LAC'],
+            'season': ['2024-25', '2024-25', '2024-25']
+        })
+        self.databox_feed.send_data_nba(df)
+        push_data = [record for call in self.mock_api_instance.data_post.call_args_list for record in call.kwargs['push_data']]
+        keys = {record['key'] for record in push_data}
+        self.assertNotIn('points', keys)
+        self.assertIn({"key": "points_avg2", "value": 35.0, "date": "2025-02-10"}, push_data)
+        self.assertIn({"key": "points_season_total", "value": 90.0, "date": "2025-02-10",
+                       "attributes": [{"key": "season", "value": "2024-25"}]}, push_data)
+        self.assertIn({"key": "points_vs_opponent_avg", "value": 30.0, "date": "2025-02-10",
+                       "attributes": [{"key": "opposing_team", "value": "LAC"}, {"key": "season", "value": "2024-25"}]}, push_data)
+
+    def test_send_data_nba_pushes_box_score_columns(self):
+        df = compact_game_stats(pd.DataFrame({
+            'date': ['2025-02-06', '2025-02-08'],
+            'points': [30, 25], 'rebounds': [10, 8], 'assists': [8, 5], 'minutes': [35.0, 33.5],
+            'fg_pct': [0.478, 0.5], 'ts_pct': [0.612, 0.55],
+            'opposing_team': ['LAC', 'PHX'], 'season': ['2024-25', '2024-25'],
+            'pie': [0.213, None]
+        }))
+        self.databox_feed.send_data_nba(df)
+        pushed = [record for call in self.mock_api_instance.data_post.call_args_list for record in call.kwargs['push_data']]
+        pie = [record for record in pushed if record['key'] == 'pie']
+        self.assertEqual([(record['date'], record['value']) for record in pie], [('2025-02-06', 0.213)] * 2)
+
+    def test_send_data_nba_per_player_keys(self):
+        df = compact_game_stats(pd.DataFrame({
+            'date': ['2025-02-06', '2025-02-06'],
+            'points': [30, 25], 'rebounds': [10, 8], 'assists': [8, 5], 'minutes': [35.0, 33.5],
+            'fg_pct': [0.478, 0.5], 'ts_pct': [0.612, 0.55],
+            'opposing_team': ['LAC', 'PHX'], 'season': ['2024-25', '2024-25']
+        })).assign(player_id=[1629029, 201939])
+        self.databox_feed.per_player_keys = True
+        self.databox_feed.send_data_nba(df)
+        pushed = [record for call in self.mock_api_instance.data_post.call_args_list for record in call.kwargs['push_data']]
+        points = {record['key']: record['value'] for record in pushed if record['key'].startswith('points_')}
+        self.assertEqual(points, {'points_1629029': 30.0, 'points_201939': 25.0})
+        self.assertEqual(len(pushed), 2 * 2 * 6)
+
+        with self.assertRaises(ValueError):
+            self.databox_feed.send_data_nba(df.drop(columns=['player_id']))
+
+    def test_invalid_nba_push_mode(self):
+        with self.assertRaises(ValueError):
+            DataboxFeed(nba_push_mode='everything')
+
+    def test_plan_lanes_keeps_dates_together(self):
+        self.databox_feed.chunk_size = 4
+        push_data = [{"key": key, "value": 1.0, "date": date}
+                     for date in ['2025-02-06', '2025-02-07', '2025-02-08'] for key in ['points', 'assists', 'rebounds']]
+        lanes = self.databox_feed._plan_lanes(push_data)
+        self.assertEqual([[len(chunk) for chunk in lane] for lane in lanes], [[3], [3], [3]])
+
+        self.databox_feed.chunk_size = 2
+        lanes = self.databox_feed._plan_lanes(push_data[:3])
+        self.assertEqual([[len(chunk) for chunk in lane] for lane in lanes], [[2, 1]])
+
+    def test_push_in_chunks_concurrent(self):
+        self.databox_feed.chunk_size = 2
+        self.databox_feed.max_workers = 4
+        self.mock_api_instance.data_post.return_value = None
+        push_data = [{"key": "commits", "value": float(i), "date": f"2025-02-{i:02d}"} for i in range(1, 21)]
+        report = self.databox_feed.push_in_chunks(push_data)
+        self.assertEqual(self.mock_api_instance.data_post.call_count, 10)
+        self.assertEqual([chunk['chunk'] for chunk in report], list(range(1, 11)))
+        self.assertTrue(all(chunk['success'] for chunk in report))
+
+    @patch('databox_connector.time.sleep')
+    def test_push_retries_throttled_requests(self, mock_sleep):
+        self.mock_api_instance.data_post.side_effect = [
+            ApiException(status=429, reason="Too Many Requests"),
+            ApiException(status=503, reason="Service Unavailable"),
+            None
+        ]
+        report = self.databox_feed.push_in_chunks([{"key": "commits", "value": 1.0, "date": "2025-02-06"}])
+        self.assertEqual(self.mock_api_instance.data_post.call_count, 3)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [1.0, 2.0])
+        self.assertTrue(report[0]['success'])
+
+    @patch('databox_connector.time.sleep')
+    def test_push_retry_waits_for_retry_after(self, mock_sleep):
+        throttled = ApiException(status=429, reason="Too Many Requests")
+        throttled.headers = {'Retry-After': '0.05'}
+        self.mock_api_instance.data_post.side_effect = [throttled, None]
+        report = self.databox_feed.push_in_chunks([{"key": "commits", "value": 1.0, "date": "2025-02-06"}])
+        self.assertEqual(self.mock_api_instance.data_post.call_count, 2)
+        # the rate limiter waited for Retry-After instead of the backoff
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [0.0])
+        self.assertTrue(report[0]['success'])
+
+    @patch('databox_connector.time.sleep')
+    def test_push_does_not_retry_client_errors(self, mock_sleep):
+        self.mock_api_instance.data_post.side_effect = ApiException(status=400, reason="Bad Request")
+        report = self.databox_feed.push_in_chunks([{"key": "commits", "value": 1.0, "date": "2025-02-06"}])
+        self.mock_api_instance.data_post.assert_called_once()
+        mock_sleep.assert_not_called()
+        self.assertFalse(report[0]['success'])
+
+    def _json_response(self, status_code, headers=None):
+        response = MagicMock()
+        response.ok = status_code < 400
+        response.status_code = status_code
+        response.reason = "Too Many Requests" if status_code == 429 else "OK"
+        response.headers = headers or {}
+        return response
+
+    @patch('requests.Session.post')
+    def test_json_transport_pushes_gzipped_json(self, mock_post):
+        mock_post.return_value = self._json_response(200)
+        instrumentation.reset()
+        databox_feed = DataboxFeed(transport='json', chunk_size=100)
+        self.assertIsNone(databox_feed.api_client)
+
+        push_data = [{"key": "commits", "value": float(i), "date": "2025-02-06"} for i in range(50)]
+        report = databox_feed.push_in_chunks(push_data)
+
+        self.assertTrue(report[0]['success'])
+        kwargs = mock_post.call_args.kwargs
+        self.assertTrue(mock_post.call_args.args[0].endswith('/data'))
+        self.assertEqual(kwargs['headers'], {'Content-Encoding': 'gzip'})
+        self.assertEqual(json.loads(gzip.decompress(kwargs['data'])), push_data)
+        self.assertEqual(instrumentation.report()['requests']['databox']['request_bytes'], len(kwargs['data']))
+
+    @patch('requests.Session.post')
+    def test_json_client_raises_push_api_error(self, mock_post):
+        mock_post.return_value = self._json_response(429, headers={'Retry-After': '3'})
+        mock_post.return_value.text = '{"errors": ["rate limited"]}'
+        client = JsonPushClient('https://push.databox.com', 'token')
+        with self.assertRaises(PushApiError) as raised:
+            client.data_post([{"key": "commits", "value": 1.0, "date": "2025-02-06"}])
+        self.assertEqual(raised.exception.status, 429)
+        self.assertEqual(raised.exception.headers, {'Retry-After': '3'})
+        self.assertEqual(raised.exception.body, '{"errors": ["rate limited"]}')
+
+    @patch('databox_connector.time.sleep')
+    @patch('requests.Session.post')
+    def test_json_transport_retries_and_spools_like_sdk(self, mock_post, mock_sleep):
+        os.environ['DATABOX_GZIP'] = '0'
+        self.addCleanup(os.environ.pop, 'DATABOX_GZIP')
+        mock_post.side_effect = [self._json_response(429), self._json_response(200), self._json_response(400)]
+        with tempfile.TemporaryDirectory() as tmp:
+            spool = PushSpool(os.path.join(tmp, 'spool.sqlite'))
+            databox_feed = DataboxFeed(transport='json', chunk_size=1, spool=spool)
+            report = databox_feed.push_in_chunks([
+                {"key": "commits", "value": 1.0, "date": "2025-02-06"},
+                {"key": "commits", "value": 2.0, "date": "2025-02-07"}
+            ])
+            self.assertEqual([chunk['success'] for chunk in report], [True, False])
+            self.assertEqual(len(spool), 0)
+            spool.close()
+        self.assertEqual(mock_sleep.call_args_list[0].args[0], 1.0)
+        self.assertEqual(mock_post.call_args_list[0].kwargs['headers'], {})
+
+    def test_invalid_transport(self):
+        with self.assertRaises(ValueError):
+            DataboxFeed(transport='grpc')
+
+    def test_ledger_skips_unchanged_datapoints(self):
+        self.mock_api_instance.data_post.side_effect = [None, ApiException("API Error"), None, None, None]
+        push_data = [{"key": "commits", "value": 1.0, "date": "2025-02-06"},
+                     {"key": "commits", "value": 2.0, "date": "2025-02-07"}]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.databox_feed.chunk_size = 1
+            self.databox_feed.ledger = PushLedger(os.path.join(tmp_dir, 'ledger.sqlite'))
+            self.databox_feed.push_in_chunks(push_data)
+
+            report = self.databox_feed.push_in_chunks(push_data)
+            self.assertEqual(len(report), 1)
+            self.assertEqual(self.mock_api_instance.data_post.call_args.kwargs['push_data'], push_data[1:])
+
+            self.databox_feed.force_full_resync = True
+            report = self.databox_feed.push_in_chunks(push_data)
+            self.assertEqual([chunk['success'] for chunk in report], [True, True])
+            self.databox_feed.ledger.close()
+
+    def test_failed_chunks_are_spooled_and_replayed(self):
+        push_data = [{"key": "commits", "value": 1.0, "date": "2025-02-06"},
+                     {"key": "commits", "value": 2.0, "date": "2025-02-07"},
+                     {"key": "commits", "value": 3.0, "date": "2025-02-08"}]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.databox_feed.chunk_size = 1
+            self.databox_feed.spool = PushSpool(os.path.join(tmp_dir, 'spool.sqlite'))
+            self.mock_api_instance.data_post.side_effect = [
+                ApiException("API Error"), ApiException(status=400, reason="Bad Request"), ConnectionError("reset")
+            ]
+            self.databox_feed.push_in_chunks(push_data)
+            self.assertEqual(len(self.databox_feed.spool), 2)
+
+            self.mock_api_instance.data_post.side_effect = [ConnectionError("reset")]
+            self.assertEqual(self.databox_feed.replay_spool(), {"replayed": 0, "parked": 0, "remaining": 2})
+            self.mock_api_instance.data_post.assert_called_with(push_data=push_data[:1])
+
+            self.mock_api_instance.data_post.side_effect = None
+            self.mock_api_instance.data_post.return_value = None
+            self.assertEqual(self.databox_feed.replay_spool(), {"replayed": 2, "parked": 0, "remaining": 0})
+            self.mock_api_instance.data_post.assert_called_with(push_data=push_data[2:])
+            self.databox_feed.spool.close()
+
+    def test_replay_spool_without_spool(self):
+        self.assertEqual(self.databox_feed.replay_spool(), {"replayed": 0, "parked": 0, "remaining": 0})
+
+    def test_replay_parks_chunks_that_keep_failing(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.databox_feed.spool = PushSpool(os.path.join(tmp_dir, 'spool.sqlite'), max_attempts=2)
+            for value in (1.0, 2.0, 3.0):
+                self.databox_feed.spool.add([{"key": "commits", "value": value, "date": "2025-02-06"}], "timeout")
+
+            self.mock_api_instance.data_post.side_effect = [
+                ApiException(status=400, reason="Bad Request"), ConnectionError("reset")
+            ]
+            self.assertEqual(self.databox_feed.replay_spool(), {"replayed": 0, "parked": 2, "remaining": 1})
+
+            self.mock_api_instance.data_post.side_effect = None
+            self.assertEqual(self.databox_feed.replay_spool(), {"replayed": 1, "parked": 0, "remaining": 0})
+            self.mock_api_instance.data_post.assert_called_with(
+                push_data=[{"key": "commits", "value": 3.0, "date": "2025-02-06"}]
+            )
+            self.assertEqual([chunk[0]["value"] for _, chunk, _, _ in self.databox_feed.spool.parked()], [1.0, 2.0])
+            self.databox_feed.spool.close()
+
 if __name__ == '__main__':
     unittest.main()
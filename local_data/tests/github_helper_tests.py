@@ -1,12 +1,15 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
-from github_helper import GitHubFetcher
+from github_helper import GitHubFetcher, MultiRepoFetcher
+from rate_limiter import rate_limits
 
 class TestGitHubFetcher(unittest.TestCase):
     def setUp(self):
         self.github_token_patch = patch("os.getenv", return_value="fake_token")
-        self.requests_get_patch = patch("requests.get")
+        self.requests_get_patch = patch("requests.Session.get")
 
         self.MockGetEnv = self.github_token_patch.start()
         self.MockRequestsGet = self.requests_get_patch.start()
@@ -31,29 +34,175 @@ class TestGitHubFetcher(unittest.TestCase):
         self.assertEqual(len(commit_dates), 3)
         self.assertEqual(commit_dates, ['2025-02-07', '2025-02-06', '2025-02-07'])
 
+    def test_fetch_data_fetches_remaining_pages_concurrently(self):
+        base_url = 'https://api.github.com/repositories/1/commits'
+        pages = {
+            f'{base_url}?per_page=100&page={page}': self._response([self._commit(str(page), f'2025-02-0{page}T10:00:00Z', '')])
+            for page in range(2, 5)
+        }
+        first = self._response([self._commit('1', '2025-02-01T10:00:00Z', '')])
+        first.links = {'next': {'url': f'{base_url}?per_page=100&page=2'}, 'last': {'url': f'{base_url}?per_page=100&page=4'}}
+
+        def get(url, headers=None, params=None):
+            return first if url == self.github_fetcher.api_url else pages[url]
+
+        self.MockRequestsGet.side_effect = get
+        commit_dates = self.github_fetcher.fetch_data()
+        self.assertEqual(commit_dates, ['2025-02-01', '2025-02-02', '2025-02-03', '2025-02-04'])
+        self.assertEqual(self.MockRequestsGet.call_count, 4)
+        self.assertEqual(self.MockRequestsGet.call_args_list[0].kwargs['params'], {'per_page': 100})
+
+    def test_fetch_data_follows_next_links_with_single_worker(self):
+        self.github_fetcher.page_workers = 1
+        first = self._response([self._commit('1', '2025-02-01T10:00:00Z', '')])
+        first.links = {'next': {'url': 'page2'}, 'last': {'url': 'page2'}}
+        second = self._response([self._commit('2', '2025-02-02T10:00:00Z', '')])
+        self.MockRequestsGet.side_effect = [first, second]
+        self.assertEqual(self.github_fetcher.fetch_data(), ['2025-02-01', '2025-02-02'])
+
+    def test_fetch_data_follows_rate_limit_headers(self):
+        self.addCleanup(rate_limits.reset)
+        rate_limits.reset()
+        mock_response = self._response([self._commit('1', '2025-02-01T10:00:00Z', '')])
+        mock_response.status_code = 200
+        mock_response.headers = {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '9999999999'}
+        self.MockRequestsGet.return_value = mock_response
+
+        self.github_fetcher.fetch_data()
+        self.assertGreater(rate_limits.for_host('api.github.com').wait_time(), 3600)
+
     def test_create_dataframe(self):
         commit_dates = ['2025-02-07', '2025-02-06', '2025-02-07']
         df = self.github_fetcher.create_dataframe(commit_dates)
 
         expected_df = pd.DataFrame({
-            'date': ['2025-02-06', '2025-02-07'],
-            'count': [1, 2],
-            'repository': ['Databox-nba', 'Databox-nba']
+            'date': pd.to_datetime(['2025-02-06', '2025-02-07']),
+            'count': pd.Series([1, 2], dtype='int32'),
+            'repository': pd.Categorical(['Databox-nba', 'Databox-nba'])
         })
 
         pd.testing.assert_frame_equal(df.reset_index(drop=True), expected_df)
 
     def test_fetch_all_commits(self):
-        with patch.object(self.github_fetcher, 'fetch_data', return_value=['2025-02-07', '2025-02-06', '2025-02-07']):
-            df = self.github_fetcher.fetch_all_commits()
+        mock_response = MagicMock()
+        mock_response.json.return_value = [
+            {'commit': {'author': {'date': '2025-02-07T12:34:56Z'}}},
+            {'commit': {'author': {'date': '2025-02-06T11:22:33Z'}}},
+            {'commit': {'author': {'date': '2025-02-07T14:56:78Z'}}}
+        ]
+        mock_response.links = {}
+        self.MockRequestsGet.return_value = mock_response
+        df = self.github_fetcher.fetch_all_commits()
+
+        expected_df = pd.DataFrame({
+            'date': pd.to_datetime(['2025-02-06', '2025-02-07']),
+            'count': pd.Series([1, 2], dtype='int32'),
+            'repository': pd.Categorical(['Databox-nba', 'Databox-nba'])
+        })
+
+        pd.testing.assert_frame_equal(df.reset_index(drop=True), expected_df)
+
+    def _commit(self, sha, authored, committed):
+        return {'sha': sha, 'commit': {'author': {'date': authored}, 'committer': {'date': committed}}}
+
+    def _response(self, commits, status_code=200, etag=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.json.return_value = commits
+        response.headers = {'ETag': etag} if etag else {}
+        response.links = {}
+        return response
+
+    def test_fetch_incremental_requires_state_path(self):
+        self.github_fetcher.state_path = None
+        with self.assertRaises(ValueError):
+            self.github_fetcher.fetch_incremental()
+
+    def test_fetch_incremental_merges_and_uses_watermark(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.github_fetcher.state_path = os.path.join(tmp_dir, 'state.json')
+            first = [
+                self._commit('b', '2025-02-07T12:00:00Z', '2025-02-07T12:00:00Z'),
+                self._commit('a', '2025-02-06T11:00:00Z', '2025-02-06T11:00:00Z'),
+            ]
+            self.MockRequestsGet.return_value = self._response(first, etag='"v1"')
+            df = self.github_fetcher.fetch_incremental()
+            self.assertEqual(list(df['count']), [1, 1])
+            self.assertEqual(self.MockRequestsGet.call_args.kwargs['params'], {'per_page': 100})
+
+            second = [
+                self._commit('c', '2025-02-07T15:00:00Z', '2025-02-07T15:00:00Z'),
+                self._commit('b', '2025-02-07T12:00:00Z', '2025-02-07T12:00:00Z'),
+            ]
+            self.MockRequestsGet.return_value = self._response(second, etag='"v2"')
+            df = self.github_fetcher.fetch_incremental()
+            self.assertEqual(self.MockRequestsGet.call_args.kwargs['params'], {'per_page': 100, 'since': '2025-02-07T12:00:00Z'})
+            self.assertNotIn('If-None-Match', self.MockRequestsGet.call_args.kwargs['headers'])
+            self.assertEqual(list(df['date'].dt.strftime('%Y-%m-%d')), ['2025-02-06', '2025-02-07'])
+            self.assertEqual(list(df['count']), [1, 2])
+
+            self.MockRequestsGet.return_value = self._response([second[0]], etag='"v3"')
+            self.github_fetcher.fetch_incremental()
+
+            self.MockRequestsGet.return_value = self._response([], status_code=304)
+            df = self.github_fetcher.fetch_incremental()
+            self.assertEqual(self.MockRequestsGet.call_args.kwargs['headers']['If-None-Match'], '"v3"')
+            self.assertEqual(list(df['count']), [1, 2])
+
+    def test_multi_repo_fetcher_isolates_failures(self):
+        def get(url, headers=None, params=None):
+            if 'broken' in url:
+                raise ConnectionError("connection reset")
+            if '/orgs/' in url:
+                response = self._response([{'full_name': 'org/repo-b'}])
+                return response
+            return self._response([self._commit('1', '2025-02-06T10:00:00Z', '')])
+
+        self.MockRequestsGet.side_effect = get
+        fetcher = MultiRepoFetcher(repositories=['owner/repo-a', 'owner/broken'], org='org', max_repo_workers=2)
+        self.assertEqual(fetcher.repositories, ['owner/repo-a', 'owner/broken', 'org/repo-b'])
+
+        df = fetcher.fetch_all_commits()
+        self.assertEqual(sorted(df['repository']), ['org/repo-b', 'owner/repo-a'])
+        self.assertEqual([r['success'] for r in fetcher.report], [True, False, True])
+        self.assertIn('connection reset', fetcher.report[1]['error'])
+
+    def test_multi_repo_fetcher_requires_repositories(self):
+        with self.assertRaises(ValueError):
+            MultiRepoFetcher()
+
+    def test_fetch_all_commits_by_author(self):
+        commits = [
+            {'author': {'login': 'alice'}, 'commit': {'author': {'date': '2025-02-07T12:00:00Z', 'name': 'Alice'}}},
+            {'author': None, 'commit': {'author': {'date': '2025-02-07T13:00:00Z', 'name': 'Bob'}}},
+            {'author': {'login': 'alice'}, 'commit': {'author': {'date': '2025-02-07T14:00:00Z', 'name': 'Alice'}}},
+        ]
+        self.MockRequestsGet.return_value = self._response(commits)
+        df = self.github_fetcher.fetch_all_commits(by_author=True)
+        expected_df = pd.DataFrame({
+            'date': pd.to_datetime(['2025-02-07', '2025-02-07']),
+            'author': pd.Categorical(['Bob', 'alice']),
+            'count': pd.Series([1, 2], dtype='int32'),
+            'repository': pd.Categorical(['Databox-nba', 'Databox-nba'])
+        })
+        pd.testing.assert_frame_equal(df, expected_df)
 
-            expected_df = pd.DataFrame({
-                'date': ['2025-02-06', '2025-02-07'],
-                'count': [1, 2],
-                'repository': ['Databox-nba', 'Databox-nba']
-            })
+    def test_iter_daily_count_chunks_holds_back_day_spanning_pages(self):
+        first = self._response([
+            self._commit('4', '2025-02-08T10:00:00Z', ''),
+            self._commit('3', '2025-02-07T12:00:00Z', ''),
+        ])
+        first.links = {'next': {'url': 'page2'}}
+        second = self._response([
+            self._commit('2', '2025-02-07T09:00:00Z', ''),
+            self._commit('1', '2025-02-06T09:00:00Z', ''),
+        ])
+        self.github_fetcher.page_workers = 1
+        self.MockRequestsGet.side_effect = [first, second]
 
-            pd.testing.assert_frame_equal(df.reset_index(drop=True), expected_df)
+        chunks = list(self.github_fetcher.iter_daily_count_chunks())
+        self.assertEqual([list(chunk['date'].dt.strftime('%Y-%m-%d')) for chunk in chunks], [['2025-02-08'], ['2025-02-07'], ['2025-02-06']])
+        self.assertEqual(list(chunks[1]['count']), [2])
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import sqlite3
+import unittest
+import pandas as pd
+from history_store import HistoryStore
+from schema_helper import BOX_SCORE_COLUMNS, compact_game_stats, compact_commit_counts
+
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(os.path.join(self.tmp_dir.name, 'history.sqlite'))
+        self.game_stats = compact_game_stats(pd.DataFrame({
+            'date': ['2024-01-05', '2024-11-02', '2024-11-04'],
+            'points': [30, 25, 41],
+            'rebounds': [10, 8, 12],
+            'assists': [8, 5, 11],
+            'minutes': [35.0, 33.5, 38.0],
+            'fg_pct': [0.478, 0.5, 0.55],
+            'ts_pct': [0.612, 0.55, 0.7],
+            'opposing_team': ['LAC', 'PHX', 'DEN'],
+            'season': ['2023-24', '2024-25', '2024-25']
+        }))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_round_trip_keeps_values_and_schema(self):
+        self.store.append_game_stats(self.game_stats, player_id=1629029)
+        df = self.store.load_game_stats()
+        pd.testing.assert_frame_equal(df.drop(columns=['player_id', 'player_name'])[self.game_stats.columns], self.game_stats)
+        self.assertEqual(list(df['player_id']), [1629029] * 3)
+
+    def test_round_trip_keeps_game_ids_and_box_scores(self):
+        enriched = self.game_stats.assign(
+            game_id=['0022300501', '0022400101', '0022400115'],
+            **{column: [1.5, None, -3.0] for column in BOX_SCORE_COLUMNS}
+        )
+        enriched = compact_game_stats(enriched)
+        self.store.append_game_stats(enriched, player_id=1)
+        df = self.store.load_game_stats()
+        pd.testing.assert_frame_equal(df[enriched.columns], enriched)
+
+        # appending the same games without box scores keeps the stored ones
+        self.store.append_game_stats(self.game_stats.assign(points=[31, 25, 41]), player_id=1)
+        df = self.store.load_game_stats()
+        self.assertEqual(df['points'].iloc[0], 31)
+        self.assertEqual(list(df['game_id']), list(enriched['game_id']))
+        self.assertEqual(df['pie'].iloc[2], -3.0)
+
+    def test_existing_store_gets_added_columns(self):
+        path = os.path.join(self.tmp_dir.name, 'old_history.sqlite')
+        connection = sqlite3.connect(path)
+        connection.execute(
+            "CREATE TABLE game_stats (player_id INTEGER NOT NULL, player_name TEXT, date TEXT NOT NULL, season TEXT NOT NULL, "
+            "opposing_team TEXT, points REAL, rebounds REAL, assists REAL, minutes REAL, fg_pct REAL, ts_pct REAL, "
+            "PRIMARY KEY (player_id, date))"
+        )
+        connection.close()
+        store = HistoryStore(path)
+        store.append_game_stats(self.game_stats.assign(game_id='0022400101'), player_id=1)
+        self.assertEqual(list(store.load_game_stats()['game_id']), ['0022400101'] * 3)
+        store.close()
+
+    def test_append_replaces_games_fetched_again(self):
+        self.store.append_game_stats(self.game_stats, player_id=1)
+        updated = self.game_stats.iloc[[2]].assign(points=42)
+        self.store.append_game_stats(updated, player_id=1)
+        df = self.store.load_game_stats()
+        self.assertEqual(len(df), 3)
+        self.assertEqual(df['points'].iloc[-1], 42)
+
+    def test_append_requires_player_id(self):
+        with self.assertRaises(ValueError):
+            self.store.append_game_stats(self.game_stats)
+
+    def test_load_game_stats_slices(self):
+        self.store.append_game_stats(self.game_stats, player_id=1)
+        self.store.append_game_stats(self.game_stats, player_id=2)
+        self.assertEqual(len(self.store.load_game_stats(player_ids=[2])), 3)
+        self.assertEqual(len(self.store.load_game_stats(seasons=['2024-25'])), 4)
+        df = self.store.load_game_stats(player_ids=[1], start='2024-11-01', end='2024-11-03')
+        self.assertEqual(list(df['date'].dt.strftime('%Y-%m-%d')), ['2024-11-02'])
+
+    def test_commit_counts_by_repository_and_author(self):
+        self.store.append_commit_counts(compact_commit_counts(pd.DataFrame({
+            'date': ['2025-02-06', '2025-02-07', '2025-02-07'],
+            'count': [1, 2, 5],
+            'repository': ['repo-a', 'repo-a', 'repo-b']
+        })))
+        self.store.append_commit_counts(pd.DataFrame({
+            'date': ['2025-02-07', '2025-02-07'],
+            'author': ['alice', 'bob'],
+            'count': [2, 1],
+            'repository': ['repo-a', 'repo-a']
+        }))
+
+        df = self.store.load_commit_counts(repositories=['repo-a'])
+        self.assertEqual(list(df['count']), [1, 3])
+        self.assertEqual(list(df.columns), ['date', 'count', 'repository'])
+        by_author = self.store.load_commit_counts(start='2025-02-07', by_author=True)
+        self.assertEqual(list(by_author['author']), ['alice', 'bob'])
+        self.assertEqual(len(self.store.load_commit_counts(end='2025-02-06')), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
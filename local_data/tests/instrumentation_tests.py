@@ -0,0 +1,91 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+from instrumentation import Instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.instrumentation = Instrumentation()
+
+    def test_stage_sums_calls_and_time(self):
+        for _ in range(2):
+            with self.instrumentation.stage('nba.fetch'):
+                pass
+
+        stage = self.instrumentation.report()['stages']['nba.fetch']
+        self.assertEqual(stage['calls'], 2)
+        self.assertGreaterEqual(stage['seconds'], 0)
+
+    def test_request_records_bytes_and_errors(self):
+        with self.instrumentation.request('github') as details:
+            details['response_bytes'] = 120
+        with self.assertRaises(RuntimeError):
+            with self.instrumentation.request('github'):
+                raise RuntimeError("boom")
+        self.instrumentation.record_request('github', 3.0, error=True)
+
+        stats = self.instrumentation.report()['requests']['github']
+        self.assertEqual(stats['count'], 3)
+        self.assertEqual(stats['errors'], 2)
+        self.assertEqual(stats['response_bytes'], 120)
+        self.assertEqual(stats['request_bytes'], 0)
+        self.assertEqual(stats['latency_histogram']['5.0'], 1)
+        self.assertEqual(sum(stats['latency_histogram'].values()), 3)
+
+    def test_retries_rows_and_reset(self):
+        self.instrumentation.record_retry('databox')
+        self.instrumentation.record_rows('databox.datapoints', 5)
+        self.instrumentation.record_rows('databox.datapoints', 7)
+
+        report = self.instrumentation.report()
+        self.assertEqual(report['retries'], {'databox': 1})
+        self.assertEqual(report['rows'], {'databox.datapoints': 12})
+
+        self.instrumentation.reset()
+        self.assertEqual(self.instrumentation.report()['rows'], {})
+
+    def test_prometheus_histogram_is_cumulative(self):
+        self.instrumentation.record_request('nba', 0.01)
+        self.instrumentation.record_request('nba', 0.2)
+
+        text = self.instrumentation.prometheus_text()
+        self.assertIn('databox_nba_http_request_duration_seconds_bucket{service="nba",le="0.05"} 1', text)
+        self.assertIn('databox_nba_http_request_duration_seconds_bucket{service="nba",le="+Inf"} 2', text)
+        self.assertIn('databox_nba_http_requests_total{service="nba"} 2', text)
+
+    def test_prometheus_separates_request_and_response_bytes(self):
+        with self.instrumentation.request('databox') as details:
+            details['request_bytes'] = 2048
+        text = self.instrumentation.prometheus_text()
+        self.assertIn('databox_nba_http_request_bytes_total{service="databox"} 2048', text)
+        self.assertIn('databox_nba_http_response_bytes_total{service="databox"} 0', text)
+
+    def test_enabled_follows_report_paths_unless_set(self):
+        with patch.dict(os.environ, {'METRICS_REPORT_PATH': '', 'METRICS_PROM_PATH': ''}):
+            self.assertFalse(self.instrumentation.enabled)
+            os.environ['METRICS_PROM_PATH'] = '/tmp/metrics.prom'
+            self.assertTrue(self.instrumentation.enabled)
+            self.assertFalse(Instrumentation(enabled=False).enabled)
+
+    def test_writes_reports_and_profiles(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            instrumentation = Instrumentation(profile_dir=os.path.join(tmp_dir, 'profiles'))
+            with instrumentation.stage('github.fetch'):
+                sum(range(1000))
+            with instrumentation.stage('github.fetch'):
+                sum(range(1000))
+            instrumentation.write_json(os.path.join(tmp_dir, 'report.json'))
+            instrumentation.write_prometheus(os.path.join(tmp_dir, 'metrics.prom'))
+
+            with open(os.path.join(tmp_dir, 'report.json')) as report_file:
+                self.assertIn('github.fetch', json.load(report_file)['stages'])
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, 'metrics.prom')))
+            profiles = sorted(os.listdir(os.path.join(tmp_dir, 'profiles')))
+            self.assertEqual(profiles, [f'github.fetch.{os.getpid()}.0001.prof', f'github.fetch.{os.getpid()}.0002.prof'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import argparse
+import subprocess
+import unittest
+from unittest.mock import MagicMock, patch
+
+from main import parse_sources, run_batch, run_daemon, fetch_game_stats, nba_player_ids
+
+
+def loaded_modules(code: str) -> set:
+    """
+    Runs code in a fresh interpreter and returns the top-level packages it imported.
+    """
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path), 'DATABOX_API': 'test'}
+    result = subprocess.run(
+        [sys.executable, '-c', f"import sys\n{code}\nprint(' '.join(sys.modules))"],
+        env=env, capture_output=True, text=True, check=True
+    )
+    return {module.split('.')[0] for module in result.stdout.split()}
+
+
+class TestMain(unittest.TestCase):
+    def test_import_does_not_load_client_libraries(self):
+        modules = loaded_modules("import main")
+        self.assertNotIn('nba_api', modules)
+        self.assertNotIn('databox', modules)
+
+    def test_github_only_setup_does_not_load_nba_api(self):
+        modules = loaded_modules("import main\nmain.create_commit_fetcher()\nmain.DataboxFeed()")
+        self.assertNotIn('nba_api', modules)
+        self.assertIn('databox', modules)
+
+    def test_json_transport_does_not_load_databox_sdk(self):
+        modules = loaded_modules("import main\nmain.DataboxFeed(transport='json')")
+        self.assertNotIn('databox', modules)
+
+    def test_parse_sources(self):
+        self.assertEqual(parse_sources('github'), ['github'])
+        self.assertEqual(parse_sources('nba, github'), ['nba', 'github'])
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_sources('nba,twitter')
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_sources('')
+
+    def test_run_batch_skips_disabled_sources(self):
+        commit_fetcher = MagicMock(spec=['fetch_all_commits'])
+        databox_feed = MagicMock()
+        run_batch(None, commit_fetcher, databox_feed)
+
+        commit_fetcher.fetch_all_commits.assert_called_once()
+        databox_feed.send_data_github.assert_called_once()
+        databox_feed.send_data_nba.assert_not_called()
+
+    def test_nba_player_ids_select_league_fetch(self):
+        stats_fetcher = MagicMock()
+        with patch.dict(os.environ, {'NBA_PLAYER_IDS': '1629029, 201939', 'NBA_SHARD_PROCESSES': '0'}):
+            self.assertEqual(nba_player_ids(), [1629029, 201939])
+            fetch_game_stats(stats_fetcher)
+        stats_fetcher.fetch_league_game_stats.assert_called_once_with([1629029, 201939])
+        stats_fetcher.fetch_all_game_stats.assert_not_called()
+
+        with patch.dict(os.environ, {'NBA_PLAYER_IDS': '', 'NBA_SHARD_PROCESSES': '0'}):
+            self.assertIsNone(nba_player_ids())
+            fetch_game_stats(stats_fetcher)
+        stats_fetcher.fetch_all_game_stats.assert_called_once()
+
+    @patch('main.Scheduler')
+    def test_daemon_source_jobs_replay_the_spool_before_pushing(self, MockScheduler):
+        commit_fetcher = MagicMock(spec=['fetch_all_commits'])
+        databox_feed = MagicMock()
+        run_daemon(None, commit_fetcher, databox_feed)
+
+        jobs = {call.args[0]: call.args[2] for call in MockScheduler.return_value.add_job.call_args_list}
+        self.assertEqual(sorted(jobs), ['github', 'metrics', 'spool'])
+        jobs['github']()
+        self.assertEqual([name for name, _, _ in databox_feed.mock_calls], ['replay_spool', 'send_data_github'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+import pandas as pd
+from metrics_helper import (
+    safe_divide, field_goal_pct, effective_fg_pct, true_shooting_pct, usage_per_minute,
+    assist_to_turnover, parse_matchup, add_derived_metrics
+)
+
+
+class TestMetricsHelper(unittest.TestCase):
+    def test_safe_divide_zero_denominator(self):
+        result = safe_divide(pd.Series([1, 2, 3]), pd.Series([2, 0, 3]))
+        pd.testing.assert_series_equal(result, pd.Series([0.5, 0.0, 1.0]))
+
+    def test_safe_divide_arrays(self):
+        result = safe_divide(np.array([1.0, 4.0]), np.array([0.0, 2.0]), fill=-1.0)
+        np.testing.assert_array_equal(result, np.array([-1.0, 2.0]))
+
+    def test_shooting_percentages(self):
+        fgm, fg3m, fga = pd.Series([10, 0]), pd.Series([4, 0]), pd.Series([20, 0])
+        pts, fta = pd.Series([30, 2]), pd.Series([5, 2])
+        pd.testing.assert_series_equal(field_goal_pct(fgm, fga), pd.Series([0.5, 0.0]))
+        pd.testing.assert_series_equal(effective_fg_pct(fgm, fg3m, fga), pd.Series([0.6, 0.0]))
+        ts = true_shooting_pct(pts, fga, fta)
+        self.assertAlmostEqual(ts[0], 30 / (2 * (20 + 0.44 * 5)))
+        self.assertAlmostEqual(ts[1], 2 / (2 * 0.88))
+
+    def test_ratios(self):
+        pd.testing.assert_series_equal(assist_to_turnover(pd.Series([8, 3]), pd.Series([4, 0])), pd.Series([2.0, 0.0]))
+        usage = usage_per_minute(pd.Series([20]), pd.Series([5]), pd.Series([4]), pd.Series([0]))
+        self.assertEqual(usage[0], 0.0)
+
+    def test_parse_matchup(self):
+        parsed = parse_matchup(pd.Series(["DAL vs. LAC", "DAL @ PHX", "LAC"]))
+        self.assertEqual(list(parsed["opponent"]), ["LAC", "PHX", "LAC"])
+        self.assertEqual(list(parsed["team"][:2]), ["DAL", "DAL"])
+        self.assertTrue(parsed["is_home"][0])
+        self.assertFalse(parsed["is_home"][1])
+        self.assertTrue(pd.isna(parsed["is_home"][2]))
+
+    def test_add_derived_metrics_skips_missing_columns(self):
+        game_logs = pd.DataFrame({"PTS": [30], "FGM": [10], "FGA": [20], "FTA": [5], "MATCHUP": ["DAL @ LAC"]})
+        derived = add_derived_metrics(game_logs)
+        self.assertIn("TS%", derived.columns)
+        self.assertNotIn("eFG%", derived.columns)
+        self.assertNotIn("FG%", game_logs.columns)
+        self.assertEqual(derived.iloc[0]["opposing_team"], "LAC")
+
+    def test_add_derived_metrics_computes_only_requested_metrics(self):
+        game_logs = pd.DataFrame({"PTS": [30], "FGM": [10], "FG3M": [2], "FGA": [20], "FTA": [5], "AST": [8], "TOV": [2],
+                                  "MATCHUP": ["DAL vs. LAC"]})
+        derived = add_derived_metrics(game_logs, ["TS%", "opposing_team"])
+        self.assertEqual(list(derived.columns), list(game_logs.columns) + ["TS%", "opposing_team"])
+        self.assertEqual(derived.iloc[0]["opposing_team"], "LAC")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,16 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
-from nba_helper import StatsFetcher 
+from cache_helper import GameLogCache, BoxScoreCache
+from nba_helper import StatsFetcher, BoxScoreFetcher
+from rate_limiter import TokenBucket
 
 class TestStatsFetcher(unittest.TestCase):
     def setUp(self):
         self.player_id_patch = patch("nba_helper.StatsFetcher._get_player_id", return_value=12345)
-        self.player_game_log_patch = patch("nba_helper.playergamelog.PlayerGameLog")
+        self.player_game_log_patch = patch("nba_api.stats.endpoints.playergamelog.PlayerGameLog")
 
         self.MockGetPlayerId = self.player_id_patch.start()
         self.MockPlayerGameLog = self.player_game_log_patch.start()
@@ -50,10 +54,88 @@ class TestStatsFetcher(unittest.TestCase):
         self.assertAlmostEqual(df.iloc[0]["ts_pct"], 0.676, places=3)
         self.assertEqual(df.iloc[0]["opposing_team"], "LAC")
 
-    def test_standardize_date_to_iso(self):
+    def test_fetch_all_game_stats_uses_compact_dtypes(self):
+        df = self.stats_fetcher.fetch_all_game_stats()
+        self.assertEqual(df["points"].dtype, "int16")
+        self.assertEqual(df["ts_pct"].dtype, "float32")
+        self.assertIsInstance(df["opposing_team"].dtype, pd.CategoricalDtype)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["date"]))
+
+    def test_fetch_all_game_stats_uses_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.stats_fetcher.cache = GameLogCache(cache_dir)
+            first = self.stats_fetcher.fetch_all_game_stats()
+            self.assertEqual(self.MockPlayerGameLog.call_count, 7)
+            second = self.stats_fetcher.fetch_all_game_stats()
+            self.assertEqual(self.MockPlayerGameLog.call_count, 7)
+            pd.testing.assert_frame_equal(first, second)
+
+    def test_fetch_all_game_stats_parallel_retries_failed_season(self):
+        mock_game_log = self.MockPlayerGameLog.return_value
+        calls = {"2020-21": 0}
+
+        def player_game_log(player_id, season, timeout):
+            if season == "2020-21" and calls[season] == 0:
+                calls[season] += 1
+                raise TimeoutError("read timed out")
+            return mock_game_log
+
+        self.MockPlayerGameLog.side_effect = player_game_log
+        stats_fetcher = StatsFetcher(max_workers=4, rate_limiter=TokenBucket(rate=1000))
+        df = stats_fetcher.fetch_all_game_stats()
+        self.assertEqual(len(df), 7)
+        self.assertEqual(list(df["season"]), stats_fetcher.seasons)
+        self.assertEqual(self.MockPlayerGameLog.call_count, 8)
+
+    def test_fetch_all_game_stats_skips_season_failing_after_retries(self):
+        mock_game_log = self.MockPlayerGameLog.return_value
+
+        def player_game_log(player_id, season, timeout):
+            if season == "2024-25":
+                raise TimeoutError("read timed out")
+            return mock_game_log
+
+        self.MockPlayerGameLog.side_effect = player_game_log
+        stats_fetcher = StatsFetcher(max_workers=3, rate_limiter=TokenBucket(rate=1000), max_retries=1)
+        df = stats_fetcher.fetch_all_game_stats()
+        self.assertEqual(len(df), 6)
+        self.assertNotIn("2024-25", list(df["season"]))
+
+    @patch("nba_api.stats.endpoints.leaguegamelog.LeagueGameLog")
+    def test_fetch_league_game_stats(self, MockLeagueGameLog):
+        league_df = pd.DataFrame([
+            {"PLAYER_ID": 1, "PLAYER_NAME": "Player One", "GAME_DATE": "2023-01-01", "PTS": 30, "REB": 10, "AST": 8,
+             "MIN": 35, "FGM": 10, "FGA": 20, "FTA": 5, "MATCHUP": "DAL vs. LAC"},
+            {"PLAYER_ID": 2, "PLAYER_NAME": "Player Two", "GAME_DATE": "2023-01-01", "PTS": 12, "REB": 4, "AST": 2,
+             "MIN": 20, "FGM": 5, "FGA": 10, "FTA": 2, "MATCHUP": "LAC @ DAL"},
+        ])
+        MockLeagueGameLog.return_value.get_data_frames.return_value = [league_df]
+
+        df = self.stats_fetcher.fetch_league_game_stats()
+        self.assertEqual(MockLeagueGameLog.call_count, 7)
+        self.MockPlayerGameLog.assert_not_called()
+        self.assertEqual(len(df), 14)
+        self.assertEqual(list(df.columns[:2]), ["player_id", "player_name"])
+
+        by_player = self.stats_fetcher.split_by_player(df)
+        self.assertEqual(sorted(by_player), [1, 2])
+        self.assertEqual(len(by_player[2]), 7)
+        self.assertEqual(by_player[2].iloc[0]["opposing_team"], "DAL")
+        self.assertEqual(by_player[1].iloc[0]["fg_pct"], 0.5)
+
+        only_two = self.stats_fetcher.fetch_league_game_stats(player_ids=[2])
+        self.assertEqual(set(only_two["player_id"]), {2})
+
+    def test_iter_game_stats_yields_one_chunk_per_season(self):
+        chunks = list(self.stats_fetcher.iter_game_stats())
+        self.assertEqual(len(chunks), 7)
+        self.assertEqual([chunk.iloc[0]["season"] for chunk in chunks], self.stats_fetcher.seasons)
+        self.assertEqual(chunks[0].iloc[0]["date"], pd.Timestamp("2023-01-01"))
+
+    def test_parse_game_dates(self):
         df = pd.DataFrame({"date": ["JAN 01, 2023"]})
-        df = self.stats_fetcher.standardize_date_to_iso(df)
-        self.assertEqual(df.iloc[0]["date"], "2023-01-01")
+        df = self.stats_fetcher.parse_game_dates(df)
+        self.assertEqual(df.iloc[0]["date"], pd.Timestamp("2023-01-01"))
 
     def test_lower_precision_floats(self):
         df = pd.DataFrame({"value": [0.123456789]})
@@ -61,5 +143,82 @@ class TestStatsFetcher(unittest.TestCase):
         self.assertEqual(df.iloc[0]["value"], 0.123)
 
 
+
+class TestBoxScoreFetcher(unittest.TestCase):
+    def setUp(self):
+        self.advanced_patch = patch("nba_api.stats.endpoints.boxscoreadvancedv2.BoxScoreAdvancedV2")
+        self.traditional_patch = patch("nba_api.stats.endpoints.boxscoretraditionalv2.BoxScoreTraditionalV2")
+        self.MockAdvanced = self.advanced_patch.start()
+        self.MockTraditional = self.traditional_patch.start()
+        self.MockAdvanced.side_effect = lambda game_id, **kwargs: self._endpoint(pd.DataFrame({
+            "PLAYER_ID": [12345, 777], "OFF_RATING": [120.0, 100.0], "DEF_RATING": [110.0, 105.0],
+            "NET_RATING": [10.0, -5.0], "USG_PCT": [0.35, 0.2], "PACE": [99.5, 99.5], "PIE": [0.2, 0.1]
+        }))
+        self.MockTraditional.side_effect = lambda game_id, start_range, **kwargs: self._endpoint(pd.DataFrame({
+            "PLAYER_ID": [12345, 777], "PLUS_MINUS": [int(start_range) // 7200 + 1, -3]
+        }))
+
+    def tearDown(self):
+        self.advanced_patch.stop()
+        self.traditional_patch.stop()
+
+    def _endpoint(self, player_stats):
+        endpoint = MagicMock()
+        endpoint.player_stats.get_data_frame.return_value = player_stats
+        return endpoint
+
+    def test_enrich_joins_box_scores_of_the_player(self):
+        game_stats = pd.DataFrame({"game_id": ["0022300002", "0022300001"], "points": [30, 25]})
+        enriched = BoxScoreFetcher(max_workers=2, rate_limiter=TokenBucket(rate=1000, capacity=10)).enrich(game_stats, 12345)
+
+        self.assertEqual(enriched["game_id"].tolist(), ["0022300002", "0022300001"])
+        self.assertEqual(enriched["off_rating"].tolist(), [120.0, 120.0])
+        self.assertEqual(enriched.loc[0, ["plus_minus_q1", "plus_minus_q2", "plus_minus_q3", "plus_minus_q4"]].tolist(), [1, 2, 3, 4])
+        self.assertEqual(enriched["usg_pct"].dtype, "float32")
+        self.assertEqual(self.MockAdvanced.call_count, 2)
+        self.assertEqual(self.MockTraditional.call_count, 8)
+
+    def test_cached_games_are_not_fetched_again(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            fetcher = BoxScoreFetcher(cache=BoxScoreCache(tmp), max_workers=1)
+            fetcher.fetch_games(["0022300001"])
+            box_scores = fetcher.fetch_games(["0022300001", "0022300001"])
+        self.assertEqual(len(box_scores), 2)
+        self.assertEqual(self.MockAdvanced.call_count, 1)
+
+    def test_failed_games_are_left_empty(self):
+        self.MockAdvanced.side_effect = ConnectionError("read timed out")
+        game_stats = pd.DataFrame({"game_id": ["0022300001"], "points": [30]})
+        enriched = BoxScoreFetcher(max_workers=1).enrich(game_stats, 12345)
+        self.assertEqual(len(enriched), 1)
+        self.assertTrue(enriched["pie"].isna().all())
+
+    def test_enrich_requires_game_ids(self):
+        with self.assertRaises(ValueError):
+            BoxScoreFetcher(max_workers=1).enrich(pd.DataFrame({"points": [30]}), 12345)
+
+    @patch.dict(os.environ, {"NBA_BOX_SCORES": "1"})
+    def test_stats_fetcher_shares_its_rate_limiter(self):
+        stats_fetcher = StatsFetcher(max_workers=2)
+        self.assertIsNotNone(stats_fetcher.rate_limiter)
+        self.assertIs(stats_fetcher.box_score_fetcher.rate_limiter, stats_fetcher.rate_limiter)
+
+    @patch("nba_helper.StatsFetcher._get_player_id", return_value=12345)
+    @patch("nba_api.stats.endpoints.playergamelog.PlayerGameLog")
+    def test_stats_fetcher_enriches_game_stats(self, MockPlayerGameLog, MockGetPlayerId):
+        game_log = MagicMock()
+        game_log.get_data_frames.return_value = [pd.DataFrame([{
+            "Game_ID": "0022300001", "GAME_DATE": "OCT 25, 2023", "PTS": 30, "REB": 10, "AST": 8, "MIN": 35,
+            "FGM": 10, "FGA": 20, "FTA": 5, "MATCHUP": "DAL @ SAS"
+        }])]
+        MockPlayerGameLog.return_value = game_log
+        stats_fetcher = StatsFetcher(box_score_fetcher=BoxScoreFetcher(max_workers=1))
+        stats_fetcher.seasons = ["2023-24"]
+
+        df = stats_fetcher.fetch_all_game_stats()
+        self.assertEqual(df.loc[0, "game_id"], "0022300001")
+        self.assertEqual(df.loc[0, "net_rating"], 10.0)
+
+
 if __name__ == "__main__":
     unittest.main()
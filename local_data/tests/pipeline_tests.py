@@ -0,0 +1,47 @@
+import unittest
+import pandas as pd
+from pipeline import StreamingPipeline
+
+
+class TestStreamingPipeline(unittest.TestCase):
+    def test_run_pushes_chunks_in_order(self):
+        pushed = {'a': [], 'b': []}
+
+        def sink(name):
+            def push(chunk):
+                pushed[name].append(chunk['value'].tolist())
+                return [{'chunk': 1, 'size': len(chunk), 'success': name == 'a', 'error': None}]
+            return push
+
+        pipeline = StreamingPipeline(queue_size=1)
+        pipeline.add_source('a', lambda: (pd.DataFrame({'value': [i, i]}) for i in range(5)), sink('a'))
+        pipeline.add_source('b', lambda: iter([pd.DataFrame({'value': [9]})]), sink('b'))
+        summary = pipeline.run()
+
+        self.assertEqual(pushed['a'], [[i, i] for i in range(5)])
+        self.assertEqual(pushed['b'], [[9]])
+        self.assertEqual(summary['a'], {'chunks': 5, 'rows': 10, 'requests': 5, 'failed_requests': 0, 'error': None})
+        self.assertEqual(summary['b']['failed_requests'], 1)
+
+    def test_failing_source_does_not_stop_others(self):
+        def broken():
+            yield pd.DataFrame({'value': [1]})
+            raise ConnectionError("connection reset")
+
+        pushed = []
+        pipeline = StreamingPipeline()
+        pipeline.add_source('broken', broken, lambda chunk: pushed.append('broken') or [])
+        pipeline.add_source('ok', lambda: iter([pd.DataFrame({'value': [2]})]), lambda chunk: pushed.append('ok') or [])
+        summary = pipeline.run()
+
+        self.assertEqual(sorted(pushed), ['broken', 'ok'])
+        self.assertEqual(summary['broken']['error'], "connection reset")
+        self.assertIsNone(summary['ok']['error'])
+
+    def test_invalid_queue_size(self):
+        with self.assertRaises(ValueError):
+            StreamingPipeline(queue_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
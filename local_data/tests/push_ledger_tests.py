@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from push_ledger import PushLedger
+
+
+class TestPushLedger(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ledger = PushLedger(os.path.join(self.tmp_dir.name, 'ledger.sqlite'))
+        self.push_data = [
+            {"key": "points", "value": 25.0, "date": "2025-02-06",
+             "attributes": [{"key": "opposing_team", "value": "LAC"}, {"key": "season", "value": "2024-25"}]},
+            {"key": "points", "value": 25.0, "date": "2025-02-06"},
+        ]
+
+    def tearDown(self):
+        self.ledger.close()
+        self.tmp_dir.cleanup()
+
+    def test_new_datapoints_are_changed(self):
+        self.assertEqual(self.ledger.filter_changed(self.push_data), self.push_data)
+
+    def test_recorded_datapoints_are_skipped(self):
+        self.ledger.record(self.push_data)
+        self.assertEqual(self.ledger.filter_changed(self.push_data), [])
+
+    def test_changed_value_and_dimensions_are_pushed(self):
+        self.ledger.record(self.push_data)
+        changed_value = {"key": "points", "value": 27.0, "date": "2025-02-06"}
+        other_dimension = {"key": "points", "value": 25.0, "date": "2025-02-06",
+                           "attributes": [{"key": "opposing_team", "value": "PHX"}, {"key": "season", "value": "2024-25"}]}
+        self.assertEqual(self.ledger.filter_changed([changed_value, other_dimension]), [changed_value, other_dimension])
+
+    def test_batches_are_filtered_independently(self):
+        self.ledger.record(self.push_data[:1])
+        other_date = {"key": "points", "value": 25.0, "date": "2025-02-08"}
+        self.assertEqual(self.ledger.filter_changed(self.push_data), self.push_data[1:])
+        self.assertEqual(self.ledger.filter_changed([other_date, other_date]), [other_date, other_date])
+        self.assertEqual(self.ledger.filter_changed(self.push_data[:1]), [])
+
+    def test_ledger_persists_between_instances(self):
+        self.ledger.record(self.push_data)
+        reopened = PushLedger(self.ledger.path)
+        self.assertEqual(reopened.filter_changed(self.push_data), [])
+        reopened.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from push_spool import PushSpool
+
+
+class TestPushSpool(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.spool = PushSpool(os.path.join(self.tmp_dir.name, 'spool.sqlite'))
+
+    def tearDown(self):
+        self.spool.close()
+        self.tmp_dir.cleanup()
+
+    def test_chunks_are_kept_in_order(self):
+        self.spool.add([{"key": "commits", "value": 1.0, "date": "2025-02-06"}], "timeout")
+        self.spool.add([{"key": "commits", "value": 2.0, "date": "2025-02-06"}], "timeout")
+        pending = self.spool.pending()
+        self.assertEqual([chunk[0]["value"] for _, chunk, _ in pending], [1.0, 2.0])
+        self.assertEqual(len(self.spool), 2)
+
+    def test_remove_and_mark_failed(self):
+        self.spool.add([{"key": "commits", "value": 1.0, "date": "2025-02-06"}], "timeout")
+        self.spool.add([{"key": "commits", "value": 2.0, "date": "2025-02-07"}], "timeout")
+        first_id, second_id = [spool_id for spool_id, _, _ in self.spool.pending()]
+        self.spool.remove(first_id)
+        self.spool.mark_failed(second_id, "still down")
+        self.assertEqual([(spool_id, attempts) for spool_id, _, attempts in self.spool.pending()], [(second_id, 2)])
+
+    def test_chunks_are_parked_after_max_attempts(self):
+        spool = PushSpool(os.path.join(self.tmp_dir.name, 'parking.sqlite'), max_attempts=3)
+        spool.add([{"key": "commits", "value": 1.0, "date": "2025-02-06"}], "timeout")
+        spool.add([{"key": "commits", "value": 2.0, "date": "2025-02-07"}], "timeout")
+        first_id, second_id = [spool_id for spool_id, _, _ in spool.pending()]
+
+        self.assertFalse(spool.mark_failed(first_id, "still down"))
+        self.assertTrue(spool.mark_failed(first_id, "still down"))
+        self.assertTrue(spool.mark_failed(second_id, "bad request", permanent=True))
+        self.assertEqual(len(spool), 0)
+        self.assertEqual([(spool_id, attempts, error) for spool_id, _, attempts, error in spool.parked()],
+                         [(first_id, 3, "still down"), (second_id, 2, "bad request")])
+        spool.close()
+
+    def test_spool_survives_reopen(self):
+        self.spool.add([{"key": "commits", "value": 1.0, "date": "2025-02-06"}], "timeout")
+        reopened = PushSpool(self.spool.path)
+        self.assertEqual(len(reopened), 1)
+        reopened.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
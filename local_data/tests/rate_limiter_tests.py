@@ -0,0 +1,98 @@
+import time
+import threading
+import unittest
+from email.utils import formatdate
+from rate_limiter import TokenBucket, AdaptiveRateLimiter, RateLimitExceeded, RateLimiterRegistry, parse_retry_after
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, capacity=0.5)
+
+    def test_burst_up_to_capacity_is_immediate(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    def test_acquire_waits_for_refill(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(4):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after({'Retry-After': '7'}), 7.0)
+        self.assertAlmostEqual(parse_retry_after({'Retry-After': formatdate(1000.0 + 30, usegmt=True)}, now=1000.0), 30.0)
+        self.assertIsNone(parse_retry_after({'Retry-After': 'soon'}))
+        self.assertIsNone(parse_retry_after({}))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_retry_after_holds_requests_back(self):
+        limiter = AdaptiveRateLimiter('example.com')
+        with limiter.request() as feedback:
+            feedback['status'] = 429
+            feedback['headers'] = {'Retry-After': '0.1'}
+        self.assertGreater(limiter.wait_time(), 0.05)
+        start = time.monotonic()
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_exhausted_quota_beyond_max_wait_raises(self):
+        limiter = AdaptiveRateLimiter('api.github.com', max_wait=60)
+        with limiter.request() as feedback:
+            feedback['status'] = 403
+            feedback['headers'] = {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(int(time.time()) + 3600)}
+        with self.assertRaises(RateLimitExceeded):
+            limiter.acquire()
+
+    def test_low_quota_paces_requests_until_reset(self):
+        limiter = AdaptiveRateLimiter('api.github.com', pace_below=100)
+        limiter.acquire()
+        limiter.release(200, {'X-RateLimit-Remaining': '10', 'X-RateLimit-Reset': str(time.time() + 1)})
+        limiter.acquire()
+        # roughly one second spread over the nine requests left
+        self.assertGreater(limiter.wait_time(), 0.05)
+        limiter.release(200)
+
+    def test_throttling_halves_and_success_restores_concurrency(self):
+        limiter = AdaptiveRateLimiter('example.com', max_concurrency=8)
+        with self.assertRaises(ConnectionError):
+            with limiter.request():
+                raise ConnectionError("connection reset")
+        limiter.acquire()
+        limiter.release(503)
+        self.assertEqual(limiter.concurrency, 2.0)
+        for _ in range(40):
+            limiter.acquire()
+            limiter.release(200)
+        self.assertEqual(limiter.concurrency, 8.0)
+
+    def test_concurrency_limits_requests_in_flight(self):
+        limiter = AdaptiveRateLimiter('example.com', max_concurrency=1)
+        limiter.acquire()
+        acquired = threading.Event()
+        thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        limiter.release(200)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+
+    def test_registry_shares_limiters_per_host(self):
+        registry = RateLimiterRegistry(max_wait=5)
+        limiter = registry.for_url('https://api.github.com/repos/a/b/commits')
+        self.assertIs(registry.for_host('api.github.com'), limiter)
+        self.assertIsNot(registry.for_url('https://push.databox.com'), limiter)
+        self.assertEqual(limiter.max_wait, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
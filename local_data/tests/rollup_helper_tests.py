@@ -0,0 +1,53 @@
+import unittest
+import pandas as pd
+from rollup_helper import rolling_averages, season_totals, opponent_splits
+from schema_helper import compact_game_stats
+
+
+class TestRollupHelper(unittest.TestCase):
+    def setUp(self):
+        self.df = compact_game_stats(pd.DataFrame({
+            'date': ['2024-01-03', '2024-01-01', '2024-01-05', '2024-01-07', '2024-11-01', '2024-11-03'],
+            'points': [20, 10, 30, 40, 15, 25],
+            'rebounds': [5, 5, 5, 5, 10, 10],
+            'assists': [1, 2, 3, 4, 5, 6],
+            'minutes': [30.0, 30.0, 30.0, 30.0, 35.0, 35.0],
+            'fg_pct': [0.4, 0.5, 0.6, 0.7, 0.45, 0.55],
+            'ts_pct': [0.5, 0.5, 0.5, 0.5, 0.6, 0.6],
+            'opposing_team': ['LAC', 'PHX', 'LAC', 'PHX', 'LAC', 'LAC'],
+            'season': ['2023-24', '2023-24', '2023-24', '2023-24', '2024-25', '2024-25']
+        }))
+
+    def test_rolling_averages_reset_per_season_and_keep_stride(self):
+        rollup = rolling_averages(self.df, window=2, stride=1)
+        self.assertEqual(list(rollup['date']), ['2024-01-01', '2024-01-03', '2024-01-05', '2024-01-07', '2024-11-01', '2024-11-03'])
+        self.assertEqual(list(rollup['points_avg2']), [10.0, 15.0, 25.0, 35.0, 15.0, 20.0])
+        self.assertEqual(list(rollup['fg_pct_avg2'])[:2], [0.5, 0.45])
+
+    def test_rolling_averages_default_stride_keeps_latest_game(self):
+        rollup = rolling_averages(self.df, window=3)
+        self.assertEqual(list(rollup['date']), ['2024-01-05', '2024-01-07', '2024-11-03'])
+        self.assertEqual(list(rollup['points_avg3']), [20.0, 30.0, 20.0])
+
+    def test_rolling_averages_rejects_invalid_window(self):
+        with self.assertRaises(ValueError):
+            rolling_averages(self.df, window=0)
+
+    def test_season_totals(self):
+        rollup = season_totals(self.df)
+        self.assertEqual(list(rollup['season']), ['2023-24', '2024-25'])
+        self.assertEqual(list(rollup['date']), ['2024-01-07', '2024-11-03'])
+        self.assertEqual(list(rollup['points_season_total']), [100.0, 40.0])
+        self.assertEqual(list(rollup['fg_pct_season_avg']), [0.55, 0.5])
+        self.assertEqual(list(rollup['games']), [4.0, 2.0])
+
+    def test_opponent_splits(self):
+        rollup = opponent_splits(self.df)
+        self.assertEqual(list(zip(rollup['season'], rollup['opposing_team'])),
+                         [('2023-24', 'LAC'), ('2023-24', 'PHX'), ('2024-25', 'LAC')])
+        self.assertEqual(list(rollup['points_vs_opponent_avg']), [25.0, 25.0, 20.0])
+        self.assertEqual(list(rollup['date']), ['2024-01-05', '2024-01-07', '2024-11-03'])
+
+
+if __name__ == "__main__":
+    unittest.main()
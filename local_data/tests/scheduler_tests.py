@@ -0,0 +1,64 @@
+import time
+import threading
+import unittest
+from scheduler import Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+    def test_add_job_rejects_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            Scheduler().add_job('job', 0, lambda: None)
+
+    def test_run_pending_skips_overlapping_cycle(self):
+        release = threading.Event()
+        runs = []
+
+        def slow_job():
+            runs.append(1)
+            release.wait(5)
+
+        scheduler = Scheduler()
+        scheduler.add_job('slow', 0.01, slow_job)
+        scheduler.run_pending()
+        time.sleep(0.05)
+        scheduler.run_pending()
+        release.set()
+        for thread in scheduler._threads:
+            thread.join()
+        self.assertEqual(len(runs), 1)
+
+    def test_predicate_skips_cycle(self):
+        runs = []
+        scheduler = Scheduler()
+        scheduler.add_job('off_season', 60, lambda: runs.append(1), should_run=lambda: False)
+        scheduler.run_pending()
+        self.assertEqual(runs, [])
+
+    def test_run_forever_stops_and_waits_for_jobs(self):
+        runs = []
+        scheduler = Scheduler(tick=0.01)
+
+        def job():
+            runs.append(1)
+            scheduler.stop()
+            time.sleep(0.05)
+            runs.append(2)
+
+        scheduler.add_job('job', 60, job)
+        thread = threading.Thread(target=scheduler.run_forever)
+        thread.start()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(runs, [1, 2])
+
+    def test_failing_job_does_not_stop_scheduler(self):
+        scheduler = Scheduler()
+        scheduler.add_job('broken', 60, lambda: 1 / 0)
+        scheduler.run_pending()
+        for thread in scheduler._threads:
+            thread.join()
+        self.assertFalse(scheduler._jobs['broken']['lock'].locked())
+
+
+if __name__ == "__main__":
+    unittest.main()
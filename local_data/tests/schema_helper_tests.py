@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+import pandas as pd
+from schema_helper import (
+    compact_game_stats, compact_commit_counts, iso_dates, memory_report, to_column_buffers, from_column_buffers
+)
+
+
+class TestSchemaHelper(unittest.TestCase):
+    def setUp(self):
+        self.game_stats = pd.DataFrame({
+            'date': ['2025-02-06', '2025-02-08'],
+            'points': [30.0, 25.0],
+            'rebounds': [10, 8],
+            'assists': [8, 5],
+            'minutes': [35.0, 33.5],
+            'fg_pct': [0.478, 0.5],
+            'ts_pct': [0.612, 0.55],
+            'opposing_team': ['LAC', 'PHX'],
+            'season': ['2024-25', '2024-25']
+        })
+
+    def test_compact_game_stats(self):
+        df = compact_game_stats(self.game_stats)
+        self.assertEqual(df['points'].dtype, np.int16)
+        self.assertEqual(df['fg_pct'].dtype, np.float32)
+        self.assertIsInstance(df['season'].dtype, pd.CategoricalDtype)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['date']))
+        self.assertEqual(self.game_stats['points'].dtype, np.float64)
+
+    def test_integer_column_with_missing_values_becomes_float32(self):
+        self.game_stats.loc[1, 'rebounds'] = None
+        df = compact_game_stats(self.game_stats)
+        self.assertEqual(df['rebounds'].dtype, np.float32)
+        self.assertTrue(np.isnan(df['rebounds'].iloc[1]))
+
+    def test_compact_commit_counts_and_iso_dates(self):
+        df = compact_commit_counts(pd.DataFrame({'date': ['2025-02-06'], 'count': [3], 'repository': ['repo1']}))
+        self.assertEqual(df['count'].dtype, np.int32)
+        self.assertEqual(list(iso_dates(df['date'])), ['2025-02-06'])
+        self.assertEqual(list(iso_dates(pd.Series(['2025-02-06']))), ['2025-02-06'])
+
+    def test_column_buffers_round_trip(self):
+        first = compact_game_stats(self.game_stats)
+        second = compact_game_stats(self.game_stats.assign(opposing_team=['BOS', 'LAC'], season='2023-24'))
+        buffers = to_column_buffers(first)
+        self.assertIsInstance(buffers['opposing_team'][0], np.ndarray)
+        self.assertIsNone(buffers['points'][1])
+
+        df = from_column_buffers([buffers, to_column_buffers(second)])
+        self.assertEqual(df['opposing_team'].tolist(), ['LAC', 'PHX', 'BOS', 'LAC'])
+        self.assertEqual(df['season'].tolist(), ['2024-25', '2024-25', '2023-24', '2023-24'])
+        self.assertIsInstance(df['season'].dtype, pd.CategoricalDtype)
+        self.assertEqual(df['points'].dtype, np.int16)
+        self.assertEqual(iso_dates(df['date']).tolist(), ['2025-02-06', '2025-02-08'] * 2)
+
+    def test_memory_report(self):
+        baseline = pd.concat([self.game_stats] * 100, ignore_index=True)
+        report = memory_report(compact_game_stats(baseline), baseline)
+        self.assertEqual(report.loc['points', 'dtype'], 'int16')
+        self.assertEqual(report.loc['points', 'baseline_bytes'], 8 * 200)
+        self.assertEqual(report.loc['total', 'bytes'], report['bytes'].drop('total').sum())
+        self.assertGreater(report.loc['total', 'saved_pct'], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
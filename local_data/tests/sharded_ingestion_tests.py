@@ -0,0 +1,124 @@
+import os
+import time
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+import sharded_ingestion
+from sharded_ingestion import ShardedGameStatsFetcher
+from schema_helper import compact_game_stats
+
+FAILING_PLAYER = 99
+
+
+def fake_shard(player_id: int, season: str) -> pd.DataFrame:
+    if player_id == FAILING_PLAYER:
+        raise ConnectionError("read timed out")
+    return compact_game_stats(pd.DataFrame({
+        'date': [f"{season[:4]}-11-01", f"{season[:4]}-11-03"],
+        'points': [player_id, player_id + 1],
+        'rebounds': [10, 8],
+        'assists': [8, 5],
+        'minutes': [35.0, 33.5],
+        'fg_pct': [0.478, 0.5],
+        'ts_pct': [0.612, 0.55],
+        'opposing_team': ['LAC', season[:4]],
+        'season': [season, season]
+    }))
+
+
+def rate_shard(player_id: int, season: str) -> pd.DataFrame:
+    df = fake_shard(player_id, season)
+    df['points'] = round(sharded_ingestion._worker_rate * 100)
+    return df
+
+
+REQUEST_LOG_DIR_VAR = 'SHARD_REQUEST_LOG_DIR'
+REQUESTS_PER_UNIT = 3
+
+
+def throttled_shard(player_id: int, season: str) -> pd.DataFrame:
+    """
+    Takes a token for a game log and a box score request per iteration, the way the worker's fetchers do,
+    and logs the time of every request.
+    """
+    fetcher = sharded_ingestion._worker_stats_fetcher()
+    log_path = os.path.join(os.environ[REQUEST_LOG_DIR_VAR], f"{os.getpid()}.log")
+    with open(log_path, 'a') as log:
+        for _ in range(REQUESTS_PER_UNIT):
+            fetcher.rate_limiter.acquire()
+            log.write(f"{time.time()}\n")
+            fetcher.box_score_fetcher.rate_limiter.acquire()
+            log.write(f"{time.time()}\n")
+    return fake_shard(player_id, season)
+
+
+class TestShardedGameStatsFetcher(unittest.TestCase):
+    def test_merges_shards_in_unit_order(self):
+        fetcher = ShardedGameStatsFetcher([1, 2], ['2023-24', '2024-25'], processes=2, fetch=fake_shard)
+        df = fetcher.fetch_all_game_stats()
+
+        self.assertEqual(df['player_id'].tolist(), [1, 1, 1, 1, 2, 2, 2, 2])
+        self.assertEqual(df['points'].tolist(), [1, 2, 1, 2, 2, 3, 2, 3])
+        self.assertEqual(df['season'].tolist(), ['2023-24'] * 2 + ['2024-25'] * 2 + ['2023-24'] * 2 + ['2024-25'] * 2)
+        self.assertEqual(sorted(df['opposing_team'].cat.categories), ['2023', '2024', 'LAC'])
+        self.assertEqual(df['player_id'].dtype, np.int32)
+        self.assertEqual(df['points'].dtype, np.int16)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['date']))
+
+    def test_failing_units_are_skipped(self):
+        fetcher = ShardedGameStatsFetcher([1, FAILING_PLAYER], ['2024-25'], processes=2, max_retries=1, fetch=fake_shard)
+        df = fetcher.fetch_all_game_stats()
+        self.assertEqual(df['player_id'].unique().tolist(), [1])
+
+    def test_pool_shares_the_request_rate(self):
+        fetcher = ShardedGameStatsFetcher([1, 2], ['2024-25'], processes=2, fetch=rate_shard, rate=0.5)
+        df = fetcher.fetch_all_game_stats()
+        self.assertEqual(df['points'].unique().tolist(), [25])
+
+    @patch.dict(os.environ, {'NBA_BOX_SCORES': '1'})
+    def test_pool_stays_at_its_request_rate_with_box_scores(self):
+        rate, processes = 10.0, 2
+        with tempfile.TemporaryDirectory() as log_dir, patch.dict(os.environ, {REQUEST_LOG_DIR_VAR: log_dir}):
+            fetcher = ShardedGameStatsFetcher([1, 2], ['2024-25'], processes=processes, fetch=throttled_shard, rate=rate)
+            fetcher.fetch_all_game_stats()
+            worker_times = [
+                sorted(float(line) for line in open(os.path.join(log_dir, name))) for name in os.listdir(log_dir)
+            ]
+
+        times = sorted(t for worker in worker_times for t in worker)
+        self.assertEqual(len(times), 2 * 2 * REQUESTS_PER_UNIT)
+        # game log and box score requests of a worker are paced by one bucket of the worker's share of the rate
+        for worker in worker_times:
+            gaps = [later - earlier for earlier, later in zip(worker, worker[1:])]
+            self.assertGreaterEqual(min(gaps), processes / rate * 0.9)
+        # every worker starts with one token, all later requests are paced
+        paced_rate = (len(times) - len(worker_times)) / (times[-1] - times[0])
+        self.assertLessEqual(paced_rate, rate * 1.1)
+
+    @patch('sharded_ingestion.StatsFetcher')
+    def test_worker_fetcher_is_rate_limited(self, MockStatsFetcher):
+        sharded_ingestion._init_worker(0.25)
+        try:
+            sharded_ingestion.fetch_shard(1, '2024-25')
+            sharded_ingestion.fetch_shard(2, '2024-25')
+        finally:
+            sharded_ingestion._init_worker(1.0)
+
+        MockStatsFetcher.assert_called_once()
+        rate_limiter = MockStatsFetcher.call_args.kwargs['rate_limiter']
+        self.assertEqual(rate_limiter.rate, 0.25)
+        self.assertEqual(MockStatsFetcher.return_value.fetch_season_game_stats.call_count, 2)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ShardedGameStatsFetcher([1], ['2024-25'], processes=-1)
+        with self.assertRaises(ValueError):
+            ShardedGameStatsFetcher([1], ['2024-25'], processes=1, rate=0)
+        with self.assertRaises(ValueError):
+            ShardedGameStatsFetcher([], ['2024-25'], processes=1, fetch=fake_shard).fetch_all_game_stats()
+
+
+if __name__ == '__main__':
+    unittest.main()
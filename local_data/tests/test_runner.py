@@ -1,9 +1,22 @@
 import unittest
-from nba_helper_tests import TestStatsFetcher
+from nba_helper_tests import TestStatsFetcher, TestBoxScoreFetcher
 from databox_tests import TestDataboxFeed
 from github_helper_tests import TestGitHubFetcher
+from cache_helper_tests import TestGameLogCache
+from rate_limiter_tests import TestTokenBucket, TestAdaptiveRateLimiter
+from metrics_helper_tests import TestMetricsHelper
+from pipeline_tests import TestStreamingPipeline
+from push_ledger_tests import TestPushLedger
+from scheduler_tests import TestScheduler
+from push_spool_tests import TestPushSpool
+from instrumentation_tests import TestInstrumentation
+from schema_helper_tests import TestSchemaHelper
+from history_store_tests import TestHistoryStore
+from rollup_helper_tests import TestRollupHelper
+from main_tests import TestMain
+from sharded_ingestion_tests import TestShardedGameStatsFetcher
 
 
 if __name__ == '__main__':
-    # runs StatsFetcher, DataboxFeed tests, GitHubFetcher tests
+    # runs StatsFetcher, BoxScoreFetcher, DataboxFeed tests, GitHubFetcher tests, GameLogCache tests, TokenBucket tests, adaptive rate limiter tests, metrics tests, pipeline tests, push ledger tests, scheduler tests, push spool tests, instrumentation tests, schema tests, history store tests, rollup tests, entry point tests, sharded ingestion tests
     unittest.main()
\ No newline at end of file